@@ -0,0 +1,98 @@
+"""Bytes on the wire and CPU cost of each content-coding for the large responses.
+
+Seeds a throwaway SQLite database, fetches each endpoint once uncompressed,
+then compresses that body with every available encoder at a few levels.
+The streaming export is measured the way the middleware sends it: chunk by
+chunk with a flush after each one.
+
+Run:
+python -m backend.benchmarks.bench_compression --users 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+LEVELS = {b"gzip": (1, 6, 9), b"br": (1, 4, 6), b"zstd": (1, 3, 9)}
+
+
+def _seed(engine, models, users: int, apps: int, grants_per_user: int):
+    from sqlalchemy import insert, select
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"id": i, "business_user_id": f"IPAMC{i:06d}", "name": f"User {i}", "email": f"user{i}@example.com"}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(models.Application), [
+            {"id": a, "name": f"App {a}", "description": f"Application number {a}"} for a in range(1, apps + 1)
+        ])
+        conn.execute(insert(models.AppManagerMap), [{"app_id": a, "user_id": a} for a in range(1, apps + 1)])
+        conn.execute(insert(models.Access), [
+            {"user_id": u, "application_id": (u * 7 + k) % apps + 1, "active": True}
+            for u in range(1, users + 1) for k in range(grants_per_user)
+        ])
+        cycle_id = conn.execute(insert(models.ReviewCycle).values(quarter="2025-Q1")).inserted_primary_key[0]
+        access = conn.execute(select(models.Access.id, models.Access.application_id)).all()
+        conn.execute(insert(models.ReviewItem), [
+            {"cycle_id": cycle_id, "access_id": access_id, "app_manager_id": app_id,
+             "pending_stage": "app_manager", "application_manager_comment": "Still needed for the quarter close"}
+            for access_id, app_id in access
+        ])
+    return cycle_id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--grants-per-user", type=int, default=3)
+    parser.add_argument("--chunk", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="acm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+
+    from fastapi.testclient import TestClient
+    from backend.db import migrations, models
+    from backend.db.database import engine
+    from backend.main import app
+    from backend.middleware.compression import available_encoders
+
+    migrations.reset(engine)
+    cycle_id = _seed(engine, models, args.users, args.apps, args.grants_per_user)
+
+    routes = [
+        ("/users/", {}),
+        ("/access/", {}),
+        ("/review/items", {"cycle_id": cycle_id}),
+        ("/dashboard/app-manager/users", {}),
+        ("/review/items/export", {"cycle_id": cycle_id}),
+    ]
+    with TestClient(app) as client:
+        bodies = {
+            path: client.get(path, params=params, headers={"Accept-Encoding": "identity"}).content
+            for path, params in routes
+        }
+
+    encoders = list(available_encoders())
+    for path, body in bodies.items():
+        streamed = path.endswith("/export")
+        chunks = [body[i:i + args.chunk] for i in range(0, len(body), args.chunk)]
+        print(f"--- {path}  identity {len(body) / 1e6:.2f} MB{'  (streamed)' if streamed else ''} ---")
+        for name in encoders:
+            for level in LEVELS[name]:
+                encoder = available_encoders(gzip_level=level, brotli_quality=level, zstd_level=level)[name]
+                t0 = time.process_time()
+                if streamed:
+                    chunk_fn, finish = encoder.stream()
+                    size = sum(len(chunk_fn(c)) for c in chunks) + len(finish())
+                else:
+                    size = len(encoder.compress(body))
+                cpu = time.process_time() - t0
+                print(f"{name.decode():>5} {level:>2}: {size / 1e3:9.1f} kB  ratio {len(body) / size:5.1f}x  {cpu * 1000:7.1f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
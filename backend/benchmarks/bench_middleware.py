@@ -0,0 +1,93 @@
+"""Middleware overhead: the old two-BaseHTTPMiddleware stack vs InstrumentationMiddleware.
+
+Both stacks wrap the same trivial endpoint and are driven in-process
+through ASGI. Logging is disabled by default so only the middleware cost
+is measured; pass --with-logging to include it.
+
+Run:
+python -m backend.benchmarks.bench_middleware --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from backend.logger import logger
+from backend.middleware.instrumentation import InstrumentationMiddleware
+
+
+def legacy_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        logger.info(f"Request: {request.method} {request.url}")
+        response = await call_next(request)
+        logger.info(f"Response: {response.status_code} (took {time.time() - start_time:.4f}s)")
+        return response
+
+    @app.middleware("http")
+    async def audit_middleware(request: Request, call_next):
+        sensitive_paths = ["/revoke", "/delete"]
+        is_sensitive = any(path in request.url.path for path in sensitive_paths)
+        if is_sensitive:
+            logger.warning(f"AUDIT WARN: Sensitive action initiated on {request.url.path}")
+        response = await call_next(request)
+        if is_sensitive and response.status_code < 400:
+            logger.warning(f"AUDIT SUCCESS: Sensitive action completed on {request.url.path}")
+        return response
+
+    _routes(app)
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(InstrumentationMiddleware)
+    _routes(app)
+    return app
+
+
+def _routes(app: FastAPI):
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+
+async def _drive(app, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with sem:
+                resp = await client.get("/ping")
+                assert resp.status_code == 200
+
+        await asyncio.gather(*(one() for _ in range(200)))  # warm-up
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--with-logging", action="store_true")
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logging.disable(logging.WARNING)
+
+    for name, factory in (("BaseHTTPMiddleware x2", legacy_app), ("pure ASGI", asgi_app)):
+        seconds = asyncio.run(_drive(factory(), args.requests, args.concurrency))
+        print(f"{name:>22}: {args.requests / seconds:8.0f} req/s  ({seconds * 1e6 / args.requests:.0f} us/req)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Revocation pipeline benchmark on a throwaway SQLite database.
+
+Run:
+python -m backend.benchmarks.bench_revocations --items 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="acm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+
+    from sqlalchemy import insert
+    from backend.db.database import engine, SessionLocal
+    from backend.db import migrations, models
+    from backend.services.revocation_service import RevocationService
+
+    migrations.upgrade(engine)
+    n = args.items
+    with engine.begin() as conn:
+        conn.execute(insert(models.Application), [{"id": 1, "name": "Bench App"}])
+        conn.execute(insert(models.User), [
+            {"id": i, "business_user_id": f"IPAMC{i}", "name": f"User {i}", "email": f"u{i}@example.com"}
+            for i in range(1, n + 1)
+        ])
+        conn.execute(insert(models.Access), [
+            {"id": i, "user_id": i, "application_id": 1, "active": True} for i in range(1, n + 1)
+        ])
+        conn.execute(insert(models.ReviewCycle), [{"id": 1, "quarter": "2025-Q1"}])
+        conn.execute(insert(models.ReviewItem), [
+            {"cycle_id": 1, "access_id": i, "pending_stage": "completed", "final_status": "Revoked by App Manager"}
+            for i in range(1, n + 1)
+        ])
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        result = RevocationService.execute_cycle(db, 1, batch_size=args.batch_size)
+        t1 = time.perf_counter()
+        print(f"first run: {result} in {t1 - t0:.2f}s")
+        result = RevocationService.execute_cycle(db, 1, batch_size=args.batch_size)
+        print(f"re-run: {result} in {time.perf_counter() - t1:.3f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
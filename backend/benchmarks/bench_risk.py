@@ -0,0 +1,54 @@
+"""Risk-scoring benchmark on a throwaway SQLite database filled by datagen.
+
+Run:
+python -m backend.benchmarks.bench_risk --users 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--grants-per-user", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="acm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+
+    from sqlalchemy import func, insert, literal, select
+    from backend import datagen
+    from backend.db import models
+    from backend.db.database import SessionLocal, engine
+    from backend.services.risk_service import RiskService
+
+    profile = datagen.Profile(users=args.users, apps=max(args.users // 100, 10), roles=max(args.users // 500, 10),
+                              grants_per_user=args.grants_per_user, cycles=1)
+    datagen.load(engine, profile, log=lambda msg: None)
+    with engine.begin() as conn:
+        cycle_id = conn.execute(insert(models.ReviewCycle).values(quarter="bench", status="in_progress")
+                                .returning(models.ReviewCycle.id)).scalar()
+        conn.execute(insert(models.ReviewItem).from_select(
+            ["cycle_id", "access_id", "pending_stage"],
+            select(literal(cycle_id), models.Access.id, literal("app_manager")).where(models.Access.active == True),
+        ))
+        items = conn.execute(select(func.count()).where(models.ReviewItem.cycle_id == cycle_id)).scalar()
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        features = RiskService.features(db, cycle_id)
+        t1 = time.perf_counter()
+        RiskService.score(features)
+        t2 = time.perf_counter()
+        result = RiskService.score_cycle(db, cycle_id)
+        print(f"{items:,} items: features {t1 - t0:.2f}s, score {t2 - t1:.3f}s, "
+              f"score_cycle (with write-back) {result['seconds']:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
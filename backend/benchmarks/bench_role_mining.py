@@ -0,0 +1,41 @@
+"""Role mining benchmark on the datagen synthetic access matrix (no database).
+
+Run:
+python -m backend.benchmarks.bench_role_mining --users 1000000 --processes 8
+"""
+import argparse
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--apps", type=int, default=None, help="default: users / 200")
+    parser.add_argument("--grants-per-user", type=int, default=8)
+    parser.add_argument("--processes", type=int, action="append", help="repeatable; default 1 and the CPU count")
+    args = parser.parse_args()
+
+    import numpy as np
+    from backend import datagen
+    from backend.services.role_mining_service import mine_roles
+
+    profile = datagen.Profile(users=args.users, apps=args.apps or max(args.users // 200, 20),
+                              grants_per_user=args.grants_per_user)
+    t0 = time.perf_counter()
+    grants = [(g["user_id"], g["application_id"]) for g in datagen.gen_access(profile) if g["active"]]
+    user_ids, app_ids = (np.array(column, dtype=np.int64) for column in zip(*grants))
+    del grants
+    print(f"generated {len(user_ids):,} grants for {args.users:,} users in {time.perf_counter() - t0:.1f}s")
+
+    for processes in args.processes or sorted({1, os.cpu_count() or 1}):
+        t0 = time.perf_counter()
+        result = mine_roles(user_ids, app_ids, processes=processes, limit=5)
+        print(f"processes={processes}: {time.perf_counter() - t0:.2f}s total, stages {result['seconds']}")
+        print(f"  {result['profiles']:,} profiles, {result['candidate_pairs']:,} candidates, "
+              f"{result['verified_pairs']:,} verified, {result['clusters']:,} roles covering "
+              f"{result['coverage']:.1%} of grants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Serialization cost of large list responses on a throwaway SQLite database.
+
+Compares the response_model path (ORM rows -> pydantic models ->
+jsonable_encoder -> json) with the TypeAdapter and projection paths used by
+the list endpoints.
+
+Run:
+python -m backend.benchmarks.bench_serialization --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = len(fn())
+        best = min(best, time.perf_counter() - t0)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="acm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import insert
+    from backend.db.database import engine, SessionLocal
+    from backend.db import migrations, models, schemas
+    from backend.utils.responses import models_response, rows_response, schema_columns
+
+    for n in args.rows:
+        migrations.reset(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(models.Access), [
+                {"id": i, "user_id": i, "application_id": i % 50 + 1, "active": True} for i in range(1, n + 1)
+            ])
+
+        db = SessionLocal()
+        columns = schema_columns(models.Access, schemas.Access)
+
+        def legacy():
+            db.expunge_all()
+            objs = db.query(models.Access).all()
+            return json.dumps(jsonable_encoder([schemas.Access.model_validate(o) for o in objs])).encode()
+
+        def type_adapter():
+            db.expunge_all()
+            return models_response(schemas.Access, db.query(models.Access).all()).body
+
+        def projection():
+            return rows_response(db.query(*columns).all()).body
+
+        print(f"--- {n:,} rows ---")
+        for name, fn in (("response_model", legacy), ("type_adapter", type_adapter), ("projection", projection)):
+            seconds, size = _timed(fn, args.repeat)
+            print(f"{name:>15}: {seconds * 1000:8.1f} ms  {size / 1e6:6.2f} MB")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
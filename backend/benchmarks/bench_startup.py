@@ -0,0 +1,42 @@
+"""Worker startup time: how long ``import backend.main`` takes in a fresh interpreter.
+
+Fails (exit 1) when the median exceeds the budget, so it can gate CI.
+
+Run:
+python -m backend.benchmarks.bench_startup --runs 10 --budget-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SNIPPET = "import time; t = time.perf_counter(); import backend.main; print(time.perf_counter() - t)"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    # An unreachable database proves startup does not depend on it.
+    env = dict(os.environ, DATABASE_URL="sqlite:////nonexistent-dir/acm.db", PYTHONPATH=ROOT)
+    cwd = tempfile.mkdtemp(prefix="acm-startup-")
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", SNIPPET], cwd=cwd, env=env,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]) * 1000)
+
+    median = statistics.median(samples)
+    print(f"import backend.main: median {median:.0f} ms, min {min(samples):.0f} ms, "
+          f"max {max(samples):.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
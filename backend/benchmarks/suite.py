@@ -0,0 +1,319 @@
+"""End-to-end benchmark suite: every hot endpoint, in-process over ASGI.
+
+Each scale is generated with ``backend.datagen`` into a throwaway SQLite
+database, then every scenario is driven through httpx's ASGI transport.
+Per scenario it records latency percentiles, SQL statements per request
+(counted on the engine) and peak traced memory per request (a separate,
+shorter pass under tracemalloc so tracing does not skew latencies).
+
+Results can be saved as a baseline and compared on later runs. Query
+counts are deterministic and compared exactly; latency and memory use
+``--tolerance``. Latency baselines are machine-specific: re-save them
+with ``--save-baseline`` on the machine that runs the comparison.
+
+Run:
+python -m backend.benchmarks.suite --scales small medium
+python -m backend.benchmarks.suite --scales small --compare backend/benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BULK_SIZE = 50
+LOGIN_USER = "IPAMC0000001"
+LOGIN_PASSWORD = "bench-password"
+
+
+# datagen.Profile arguments per scale. Plain dicts: importing anything from
+# ``backend`` freezes the settings, which must wait for the environment below.
+SCALES = {
+    "small": dict(users=1_000, apps=50, roles=10, cycles=1),
+    "medium": dict(users=10_000, apps=200, roles=50, cycles=1),
+    "large": dict(users=50_000, apps=500, roles=100, cycles=1),
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    # async (client, ctx, i) -> None; raises on an unexpected response
+    run: Callable
+    iterations: int
+    memory_iterations: int = 3
+
+
+async def _ok(resp, status=200):
+    if resp.status_code != status:
+        raise RuntimeError(f"{resp.request.method} {resp.request.url.path}: {resp.status_code} {resp.text[:200]}")
+    return resp
+
+
+async def cycle_start(client, ctx, i):
+    resp = await _ok(await client.post("/review/start-cycle", params={"quarter": f"bench-{i}"}))
+    ctx["cycle_id"] = resp.json()["cycle_id"]
+
+
+def _inbox(stage: str):
+    async def run(client, ctx, i):
+        await _ok(await client.get(f"/review/{stage}/items",
+                                   params={"cycle_id": ctx["cycle_id"], "user_id": ctx["approvers"][stage]}))
+    return run
+
+
+async def review_items(client, ctx, i):
+    await _ok(await client.get("/review/items", params={"cycle_id": ctx["cycle_id"]}))
+
+
+async def _act(client, ctx):
+    if not ctx["pending"]:
+        raise RuntimeError("Busiest app manager has no pending items left; lower --iterations")
+    item_id = ctx["pending"].pop()
+    await _ok(await client.post("/review/app-manager/action", json={
+        "review_item_id": item_id, "actor_user_id": ctx["approvers"]["app-manager"], "action": "Retain",
+    }))
+
+
+async def stage_action(client, ctx, i):
+    await _act(client, ctx)
+
+
+async def bulk_stage_action(client, ctx, i):
+    # The UI's bulk approve is one action request per selected row.
+    for _ in range(BULK_SIZE):
+        await _act(client, ctx)
+
+
+async def dashboard(client, ctx, i):
+    await _ok(await client.get("/dashboard/app-manager/users"))
+
+
+async def onboarding(client, ctx, i):
+    n = ctx["next_user"] = ctx["next_user"] + 1
+    await _ok(await client.post("/dashboard/app-manager/users", json={
+        "name": f"Bench User {n}", "email": f"bench{n}@example.com", "business_user_id": f"IPAMC{n}",
+        "application": "App 00001", "role": "Role 0001", "status": "Active",
+    }))
+
+
+async def login(client, ctx, i):
+    await _ok(await client.post("/token", data={"username": LOGIN_USER, "password": LOGIN_PASSWORD}))
+
+
+async def users_list(client, ctx, i):
+    await _ok(await client.get("/users/"))
+
+
+async def access_for_app(client, ctx, i):
+    await _ok(await client.get("/access/", params={"application_id": 1}))
+
+
+async def org_access(client, ctx, i):
+    # User 1 heads the generated hierarchy: the largest possible subtree.
+    await _ok(await client.get("/org/1/access"))
+
+
+def scenarios(iterations: int) -> list[Scenario]:
+    # Order matters: cycle_start leaves the cycle the inbox and action
+    # scenarios work on.
+    return [
+        Scenario("cycle_start", cycle_start, iterations=2, memory_iterations=1),
+        Scenario("inbox_app_manager", _inbox("app-manager"), iterations),
+        Scenario("inbox_app_owner", _inbox("app-owner"), iterations),
+        Scenario("inbox_business_owner", _inbox("business-owner"), iterations),
+        Scenario("review_items", review_items, max(5, iterations // 5)),
+        Scenario("stage_action", stage_action, iterations),
+        Scenario("bulk_stage_action", bulk_stage_action, max(3, iterations // 10), memory_iterations=1),
+        Scenario("dashboard", dashboard, max(5, iterations // 5)),
+        Scenario("onboarding", onboarding, iterations),
+        Scenario("login", login, max(5, iterations // 5)),
+        Scenario("users_list", users_list, max(5, iterations // 5)),
+        Scenario("access_for_app", access_for_app, iterations),
+        Scenario("org_access", org_access, max(5, iterations // 5)),
+    ]
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _prepare(engine, ctx):
+    """Approvers with the largest inboxes in the current cycle, and their pending items."""
+    from sqlalchemy import func, select, update
+    from backend.db import models
+    from backend.routers.auth import get_password_hash
+
+    item = models.ReviewItem
+    with engine.begin() as conn:
+        for stage, column in (("app-manager", item.app_manager_id), ("app-owner", item.app_owner_id),
+                              ("business-owner", item.business_owner_id)):
+            row = conn.execute(
+                select(column, func.count()).where(item.cycle_id == ctx["cycle_id"], column.is_not(None))
+                .group_by(column).order_by(func.count().desc()).limit(1)
+            ).first()
+            ctx["approvers"][stage] = row[0] if row else 0
+        ctx["pending"] = [r for (r,) in conn.execute(
+            select(item.id).where(
+                item.cycle_id == ctx["cycle_id"],
+                item.pending_stage == "app_manager",
+                item.app_manager_id == ctx["approvers"]["app-manager"],
+            ).order_by(item.id.desc())
+        )]
+        conn.execute(update(models.User).where(models.User.business_user_id == LOGIN_USER)
+                     .values(hashed_password=get_password_hash(LOGIN_PASSWORD)))
+        ctx["next_user"] = 10_000_000
+
+
+async def _run_scale(app, engine, scenario_list, warmup: int) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    results = {}
+    ctx = {"approvers": {}, "cycle_id": 1}
+    _prepare(engine, ctx)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(warmup):
+                await dashboard(client, ctx, 0)
+            for scenario in scenario_list:
+                latencies, queries = [], []
+                for i in range(scenario.iterations):
+                    before = statements[0]
+                    t0 = time.perf_counter()
+                    await scenario.run(client, ctx, i)
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    queries.append(statements[0] - before)
+
+                peaks = []
+                tracemalloc.start()
+                try:
+                    for i in range(scenario.memory_iterations):
+                        tracemalloc.reset_peak()
+                        base = tracemalloc.get_traced_memory()[0]
+                        await scenario.run(client, ctx, scenario.iterations + i)
+                        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+                finally:
+                    tracemalloc.stop()
+
+                results[scenario.name] = {
+                    "n": len(latencies),
+                    "p50_ms": round(_percentile(latencies, 0.50), 3),
+                    "p95_ms": round(_percentile(latencies, 0.95), 3),
+                    "p99_ms": round(_percentile(latencies, 0.99), 3),
+                    "queries": round(statistics.mean(queries), 2),
+                    "peak_kb": round(max(peaks) / 1024, 1),
+                }
+                if scenario.name == "cycle_start":
+                    _prepare(engine, ctx)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float = 2.0) -> list[str]:
+    """Regressions of ``results`` against ``baseline`` as readable lines."""
+    problems = []
+    for scale, scenarios_ in results.items():
+        for name, current in scenarios_.items():
+            base = baseline.get(scale, {}).get(name)
+            if base is None:
+                continue
+            if current["queries"] > base["queries"]:
+                problems.append(f"{scale}/{name}: queries {base['queries']} -> {current['queries']}")
+            for metric in ("p50_ms", "p95_ms"):
+                if current[metric] > base[metric] * (1 + tolerance) and current[metric] - base[metric] > floor_ms:
+                    problems.append(f"{scale}/{name}: {metric} {base[metric]} -> {current[metric]}")
+            if current["peak_kb"] > base["peak_kb"] * (1 + tolerance) and current["peak_kb"] - base["peak_kb"] > 64:
+                problems.append(f"{scale}/{name}: peak_kb {base['peak_kb']} -> {current['peak_kb']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES), default=["small"])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this file")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed latency/memory growth")
+    parser.add_argument("--json", metavar="PATH", help="also write results here")
+    parser.add_argument("--with-logging", action="store_true")
+    args = parser.parse_args()
+
+    # Every setting the suite depends on goes into the environment before the
+    # first ``backend`` import below.
+    tmp_dir = tempfile.mkdtemp(prefix="acm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    # One client drives every scenario; measure the endpoints, not the rate
+    # limiter, even if the shell configures one.
+    os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+
+    from backend import datagen
+    from backend.db.database import engine
+    from backend.main import app
+    from backend.services.access_graph import access_graph
+    from backend.utils.http_cache import collection_versions
+
+    # datagen.load resets the schema: never let it near a configured database.
+    if not os.path.abspath(engine.url.database or "").startswith(tmp_dir + os.sep):
+        sys.exit(f"Refusing to benchmark against {engine.url}: settings were loaded before the suite set them")
+    if not args.with_logging:
+        logging.disable(logging.WARNING)
+
+    results = {}
+    for scale in args.scales:
+        t0 = time.perf_counter()
+        datagen.load(engine, datagen.Profile(**SCALES[scale]), reset=True, log=lambda msg: None)
+        access_graph.invalidate()
+        collection_versions.clear()
+        print(f"=== {scale}: generated in {time.perf_counter() - t0:.1f}s ===")
+        results[scale] = asyncio.run(_run_scale(app, engine, scenarios(args.iterations), args.warmup))
+        print(f"{'scenario':>22} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KB':>9}")
+        for name, r in results[scale].items():
+            print(f"{name:>22} {r['n']:>4} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+                  f"{r['queries']:>8.1f} {r['peak_kb']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.save_baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.save_baseline}")
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
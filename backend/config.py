@@ -6,6 +6,56 @@ load_dotenv()
 class Settings:
     PROJECT_NAME: str = "Access Review POC v2"
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./access_review_v2.db")
+    # Optional read replica for GET routes; unset means everything uses DATABASE_URL.
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")
+    # After a write, that client's reads stay on the primary for this long
+    # so it sees its own changes despite replica lag.
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    # Token signing for /token and for keying the per-user rate limit.
+    SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
+    ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", "no-reply@example.com")
+    # How long a worker trusts its in-memory collection versions before
+    # re-reading them; bounds staleness after writes made by other workers.
+    HTTP_CACHE_TTL_SECONDS: float = float(os.getenv("HTTP_CACHE_TTL_SECONDS", "2"))
+    # How often a worker's access graph catches up on other workers' writes.
+    ACCESS_GRAPH_SYNC_SECONDS: float = float(os.getenv("ACCESS_GRAPH_SYNC_SECONDS", "1.0"))
+    # Response compression; brotli and zstd are used when their packages are installed.
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+    ZSTD_LEVEL: int = int(os.getenv("ZSTD_LEVEL", "3"))
+    # Admission control: in-flight request limit per worker, slots only
+    # single-item review actions may use, and how long non-bulk requests
+    # wait for a slot before a 429.
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+    ADMISSION_INTERACTIVE_RESERVE: int = int(os.getenv("ADMISSION_INTERACTIVE_RESERVE", "8"))
+    ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "0.5"))
+    # Per-user token bucket (0 disables); "memory" or a redis:// URL to share across workers.
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "100"))
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    # How long a stored Idempotency-Key result is replayed, and after how
+    # long an unfinished first attempt is presumed dead and may be retried.
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+    # Change feed waiters wake at once for commits in this process; this is
+    # how often they re-check the database for other workers' commits.
+    CHANGE_FEED_POLL_SECONDS: float = float(os.getenv("CHANGE_FEED_POLL_SECONDS", "1.0"))
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+    # Decoded archived review items a worker keeps in memory, across cycles.
+    ARCHIVE_CACHE_ITEMS: int = int(os.getenv("ARCHIVE_CACHE_ITEMS", "200000"))
+    # Entitlement snapshots the API may reconcile are file names in here.
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+    # Connector runs: JSON list of connectors, parallel extractions, worker
+    # processes for parsing-heavy ones, per-connector timeout and how many
+    # extracted snapshots may wait for the single Access writer.
+    CONNECTORS_CONFIG: str = os.getenv("CONNECTORS_CONFIG", "connectors.json")
+    CONNECTOR_CONCURRENCY: int = int(os.getenv("CONNECTOR_CONCURRENCY", "8"))
+    CONNECTOR_PROCESSES: int = int(os.getenv("CONNECTOR_PROCESSES", str(os.cpu_count() or 2)))
+    CONNECTOR_TIMEOUT_SECONDS: float = float(os.getenv("CONNECTOR_TIMEOUT_SECONDS", "600"))
+    CONNECTOR_QUEUE_SIZE: int = int(os.getenv("CONNECTOR_QUEUE_SIZE", "4"))
+    # Worker processes for role mining signatures and verification (1 = in-process).
+    ROLE_MINING_PROCESSES: int = int(os.getenv("ROLE_MINING_PROCESSES", str(os.cpu_count() or 2)))
 
 settings = Settings()
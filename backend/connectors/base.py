@@ -0,0 +1,124 @@
+"""Connector plugin interface.
+
+A connector pulls the accounts one application reports and writes them as a
+reconciliation snapshot: a ``business_user_id`` CSV, sorted and without
+duplicates, which ``ReconciliationService`` merge-joins against ``Access``.
+
+Connectors declare how they should be scheduled:
+- ``IO``: waiting on a remote source. Runs as an asyncio task; override
+  ``extract_async`` for a natively async client.
+- ``CPU``: parsing-heavy. ``extract`` runs in a worker process, so the
+  instance must be picklable (plain attributes only).
+
+New connector types are registered with ``@register("type")`` and
+configured in the CONNECTORS_CONFIG JSON file.
+"""
+import asyncio
+import csv
+import heapq
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+IO, CPU = "io", "cpu"
+
+CONNECTOR_TYPES: dict[str, type] = {}
+
+_SORT_CHUNK = 1_000_000
+
+
+def register(type_name: str):
+    def decorator(cls):
+        CONNECTOR_TYPES[type_name] = cls
+        return cls
+    return decorator
+
+
+class Connector(ABC):
+    kind = IO
+
+    def __init__(self, name: str, application: str, timeout: float = None, **options):
+        self.name = name
+        self.application = application
+        self.timeout = timeout
+        self.options = options
+
+    @abstractmethod
+    def accounts(self) -> Iterable[str]:
+        """Every business_user_id the source reports, in any order."""
+
+    def extract(self, path: str) -> int:
+        """Write the snapshot to ``path``; returns the number of accounts."""
+        return write_snapshot(self.accounts(), path)
+
+    async def extract_async(self, path: str) -> int:
+        return await asyncio.to_thread(self.extract, path)
+
+
+def write_snapshot(accounts: Iterable[str], path: str, chunk_size: int = _SORT_CHUNK) -> int:
+    """Sort and de-duplicate ``accounts`` into a snapshot file.
+
+    Memory is bounded by ``chunk_size``. Larger inputs are sorted in runs
+    that are spilled to temporary files and merged.
+    """
+    runs = []
+    chunk = []
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path) or None) as tmp:
+        for account in accounts:
+            account = account.strip()
+            if account:
+                chunk.append(account)
+            if len(chunk) >= chunk_size:
+                runs.append(_spill(sorted(set(chunk)), tmp, len(runs)))
+                chunk = []
+        if runs:
+            if chunk:
+                runs.append(_spill(sorted(set(chunk)), tmp, len(runs)))
+            files = [open(run) for run in runs]
+            try:
+                merged = heapq.merge(*((line.rstrip("\n") for line in f) for f in files))
+                return _write(merged, path)
+            finally:
+                for f in files:
+                    f.close()
+        return _write(sorted(set(chunk)), path)
+
+
+def _spill(accounts, directory, index) -> str:
+    run = os.path.join(directory, f"run-{index}")
+    with open(run, "w") as f:
+        f.writelines(account + "\n" for account in accounts)
+    return run
+
+
+def _write(accounts, path) -> int:
+    count = 0
+    previous = None
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["business_user_id"])
+        for account in accounts:
+            if account != previous:
+                writer.writerow([account])
+                count += 1
+                previous = account
+    return count
+
+
+def load_connectors(config_path: str) -> list[Connector]:
+    """Instantiate connectors from a JSON list of ``{"name", "type",
+    "application", ...options}`` objects."""
+    from backend.connectors import file_connector, sqlite_connector  # noqa: F401  (register built-ins)
+
+    with open(config_path) as f:
+        entries = json.load(f)
+    connectors = []
+    for entry in entries:
+        entry = dict(entry)
+        type_name = entry.pop("type")
+        if type_name not in CONNECTOR_TYPES:
+            raise ValueError(f"Unknown connector type: {type_name}")
+        connectors.append(CONNECTOR_TYPES[type_name](**entry))
+    return connectors
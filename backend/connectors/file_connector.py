@@ -0,0 +1,30 @@
+import csv
+import gzip
+
+from backend.connectors.base import CPU, Connector, register
+
+
+@register("file")
+class FileConnector(Connector):
+    """Accounts from a delimited export on local disk (optionally ``.gz``).
+
+    Options: ``path``, ``column`` (header name, default ``business_user_id``)
+    and ``delimiter`` (default ``,``). Parsing big exports is CPU-bound, so
+    this runs in the process pool.
+    """
+
+    kind = CPU
+
+    def accounts(self):
+        path = self.options["path"]
+        column = self.options.get("column", "business_user_id")
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f, delimiter=self.options.get("delimiter", ","))
+            header = next(reader, None) or []
+            if column not in header:
+                raise ValueError(f"{path}: no '{column}' column")
+            index = header.index(column)
+            for row in reader:
+                if len(row) > index:
+                    yield row[index]
@@ -0,0 +1,172 @@
+"""Run many connectors at once and feed their snapshots to one Access writer.
+
+Extractions run concurrently, at most ``concurrency`` at a time. I/O
+connectors run as asyncio tasks and CPU connectors in a process pool. Each
+extraction has its own timeout. Finished snapshots go into a bounded queue
+drained by a single writer, which reconciles them one at a time. One writer
+keeps SQLite's lock uncontended. When the writer falls behind, the queue
+fills and extractions wait before handing over, so at most
+``queue_size + concurrency`` snapshots are staged on disk.
+
+Every connector execution is recorded as a ``ConnectorRun`` row with its
+outcome, counts and timings.
+
+A timed-out extraction is abandoned, not killed. A thread or pool process
+still running it finishes in the background and its output is discarded.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from fastapi import HTTPException
+from backend.config import settings
+from backend.connectors.base import CPU
+from backend.db import models
+from backend.db.database import SessionLocal
+from backend.services.reconciliation_service import ReconciliationService, SnapshotError
+
+
+class ConnectorScheduler:
+    def __init__(self, connectors, concurrency: int = None, processes: int = None, queue_size: int = None,
+                 timeout: float = None, session_factory=SessionLocal):
+        self.connectors = connectors
+        self.concurrency = concurrency or settings.CONNECTOR_CONCURRENCY
+        self.processes = processes or settings.CONNECTOR_PROCESSES
+        self.queue_size = queue_size or settings.CONNECTOR_QUEUE_SIZE
+        self.timeout = timeout or settings.CONNECTOR_TIMEOUT_SECONDS
+        self.session_factory = session_factory
+
+    async def run(self) -> list[int]:
+        """Run every connector; returns the ConnectorRun ids in connector order."""
+        runs = await asyncio.to_thread(self._start_runs)
+        work_dir = tempfile.mkdtemp(prefix="acm-connectors-")
+        pool = ProcessPoolExecutor(self.processes) if any(c.kind == CPU for c in self.connectors) else None
+        queue = asyncio.Queue(self.queue_size)
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            writer = asyncio.create_task(self._writer(queue))
+            await asyncio.gather(*(
+                self._extract(connector, run_id, app_id, work_dir, pool, slots, queue)
+                for connector, (run_id, app_id) in zip(self.connectors, runs)
+            ))
+            await queue.put(None)
+            changed = await writer
+            if changed:
+                await asyncio.to_thread(self._refresh, changed)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return [run_id for run_id, _ in runs]
+
+    def _start_runs(self):
+        db = self.session_factory()
+        try:
+            names = {c.application for c in self.connectors}
+            app_ids = dict(db.query(models.Application.name, models.Application.id).filter(
+                models.Application.name.in_(names)
+            ))
+            rows = []
+            for connector in self.connectors:
+                app_id = app_ids.get(connector.application)
+                row = models.ConnectorRun(connector=connector.name, application_id=app_id,
+                                          started_at=datetime.utcnow())
+                if app_id is None:
+                    row.status, row.finished_at = "failed", row.started_at
+                    row.error = f"Unknown application '{connector.application}'"
+                rows.append(row)
+            db.add_all(rows)
+            db.commit()
+            return [(row.id, row.application_id) for row in rows]
+        finally:
+            db.close()
+
+    def _finish(self, run_id: int, **fields):
+        db = self.session_factory()
+        try:
+            fields.setdefault("finished_at", datetime.utcnow())
+            db.query(models.ConnectorRun).filter(models.ConnectorRun.id == run_id).update(
+                {getattr(models.ConnectorRun, k): v for k, v in fields.items()}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    async def _extract(self, connector, run_id, app_id, work_dir, pool, slots, queue):
+        if app_id is None:
+            return
+        path = os.path.join(work_dir, f"{run_id}.csv")
+        async with slots:
+            t0 = time.perf_counter()
+            try:
+                if connector.kind == CPU:
+                    job = asyncio.get_running_loop().run_in_executor(pool, connector.extract, path)
+                else:
+                    job = connector.extract_async(path)
+                accounts = await asyncio.wait_for(job, connector.timeout or self.timeout)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._finish, run_id, status="timeout",
+                                        extract_seconds=time.perf_counter() - t0)
+                return
+            except Exception as exc:
+                await asyncio.to_thread(self._finish, run_id, status="failed", error=repr(exc),
+                                        extract_seconds=time.perf_counter() - t0)
+                return
+            extracted = time.perf_counter()
+            await asyncio.to_thread(self._finish, run_id, status="running", finished_at=None,
+                                    accounts=accounts, extract_seconds=extracted - t0)
+            # Blocks here while the writer is behind.
+            await queue.put((run_id, app_id, path, extracted))
+
+    async def _writer(self, queue) -> set[int]:
+        """Apply snapshots in arrival order; returns the applications whose grants changed."""
+        changed = set()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return changed
+            run_id, app_id, path, extracted = item
+            if await asyncio.to_thread(self._apply, run_id, app_id, path, time.perf_counter() - extracted):
+                changed.add(app_id)
+
+    def _refresh(self, application_ids):
+        # Once for the whole run instead of after every application.
+        db = self.session_factory()
+        try:
+            ReconciliationService.refresh_derived(db, sorted(application_ids))
+        finally:
+            db.close()
+
+    def _apply(self, run_id, app_id, path, queued_seconds) -> bool:
+        t0 = time.perf_counter()
+        db = self.session_factory()
+        try:
+            result = ReconciliationService.reconcile(db, app_id, path, refresh=False)
+        except Exception as exc:
+            db.rollback()
+            if isinstance(exc, HTTPException):
+                error = exc.detail
+            elif isinstance(exc, SnapshotError):
+                error = str(exc)
+            else:
+                error = repr(exc)
+            self._finish(run_id, status="failed", error=error, queued_seconds=queued_seconds,
+                         apply_seconds=time.perf_counter() - t0)
+            return False
+        finally:
+            db.close()
+            os.remove(path)
+        self._finish(
+            run_id, status="succeeded", queued_seconds=queued_seconds, apply_seconds=time.perf_counter() - t0,
+            added=result["added"], restored=result["restored"], removed=result["removed"],
+            unknown_users=result["unknown_users"],
+        )
+        return bool(result["added"] or result["restored"] or result["removed"])
+
+
+def run_connectors(connectors, **options) -> list[int]:
+    return asyncio.run(ConnectorScheduler(connectors, **options).run())
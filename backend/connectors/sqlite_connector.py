@@ -0,0 +1,29 @@
+import sqlite3
+
+from backend.connectors.base import IO, Connector, register
+
+
+@register("sqlite")
+class SQLiteConnector(Connector):
+    """Accounts from an application's own SQLite database.
+
+    Options: ``path`` and ``query``, whose first column is the
+    business_user_id. The database is opened read-only. This stands in for
+    a remote directory or API, so it is scheduled as I/O.
+    """
+
+    kind = IO
+
+    def accounts(self):
+        conn = sqlite3.connect(f"file:{self.options['path']}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(self.options["query"])
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                for row in rows:
+                    if row[0] is not None:
+                        yield str(row[0])
+        finally:
+            conn.close()
@@ -0,0 +1,354 @@
+"""Deterministic synthetic data at production scale.
+
+python -m backend.datagen --preset medium --reset
+python -m backend.datagen --users 1000000 --apps 5000 --grants-per-user 10 --cycles 1 --reset
+
+Rows come from pure generator functions driven by a seeded RNG per table,
+so the same profile always yields the same database and the benchmarks can
+regenerate any table without reading it back. The loader writes them with
+Core executemany inserts in batches, dropping the secondary indexes of the
+tables it fills and rebuilding them once at the end.
+
+Running API workers keep in-memory state (access graph, caches); restart
+them after loading.
+"""
+import argparse
+import itertools
+import random
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text, update
+
+from backend.db import models
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+@dataclass(frozen=True)
+class Profile:
+    users: int = 10_000
+    apps: int = 200
+    roles: int = 50
+    roles_per_user: int = 2
+    # Mean draws per user; popular apps repeat, so skewed profiles land a bit lower.
+    grants_per_user: int = 5
+    # Zipf exponent of application popularity; 0 spreads grants evenly.
+    app_skew: float = 1.1
+    inactive_ratio: float = 0.05
+    # Share of applications that have each approver role mapped.
+    approver_coverage: float = 0.9
+    # Share of users that act as approvers.
+    approver_pool: float = 0.01
+    reports_per_manager: int = 8
+    # Completed historic cycles, oldest first, with per-stage decision rates.
+    cycles: int = 2
+    am_revoke_rate: float = 0.04
+    ao_reject_rate: float = 0.02
+    bo_reject_rate: float = 0.01
+    seed: int = 42
+
+
+PRESETS = {
+    "small": Profile(users=1_000, apps=50, roles=10),
+    "medium": Profile(users=100_000, apps=1_000, roles=200, grants_per_user=8),
+    "large": Profile(users=1_000_000, apps=5_000, roles=1_000, grants_per_user=10, cycles=1),
+}
+
+
+def _rng(profile: Profile, table: str) -> random.Random:
+    return random.Random(f"{profile.seed}:{table}")
+
+
+def gen_users(p: Profile):
+    for i in range(1, p.users + 1):
+        yield {"id": i, "business_user_id": f"IPAMC{i:07d}", "name": f"User {i}", "email": f"user{i}@example.com"}
+
+
+def gen_roles(p: Profile):
+    for r in range(1, p.roles + 1):
+        yield {"id": r, "name": f"Role {r:04d}"}
+
+
+def gen_user_roles(p: Profile):
+    rng = _rng(p, "user_roles")
+    weights = list(itertools.accumulate(1 / k for k in range(1, p.roles + 1)))
+    row_id = 0
+    for user_id in range(1, p.users + 1):
+        for role_id in sorted(set(rng.choices(range(1, p.roles + 1), cum_weights=weights, k=p.roles_per_user))):
+            row_id += 1
+            yield {"id": row_id, "user_id": user_id, "role_id": role_id}
+
+
+def gen_reporting(p: Profile):
+    """Every user reports to the first user of their block of ``reports_per_manager``;
+    those managers report the same way one level up, so the hierarchy is a
+    single tree about log(users) levels deep under user 1."""
+    r = p.reports_per_manager
+    for user_id in range(2, p.users + 1):
+        index = user_id - 1
+        block = r
+        while index % block == 0:
+            block *= r
+        yield {"id": user_id - 1, "manager_id": index // block * block + 1, "user_id": user_id}
+
+
+def gen_applications(p: Profile):
+    rng = _rng(p, "applications")
+    for a in range(1, p.apps + 1):
+        yield {
+            "id": a,
+            "name": f"App {a:05d}",
+            "description": f"Synthetic application {a}",
+            "status": rng.choice(("Not Started", "In Progress", "Completed")),
+            "last_updated": "Today",
+            "user_count": 0,
+        }
+
+
+def approver_chains(p: Profile) -> dict[int, tuple]:
+    """app_id -> (app_manager_id, app_owner_id, business_owner_id), any of them None."""
+    rng = _rng(p, "approvers")
+    pool = max(3, int(p.users * p.approver_pool))
+    chains = {}
+    for a in range(1, p.apps + 1):
+        chains[a] = tuple(
+            rng.randint(1, min(pool, p.users)) if rng.random() < p.approver_coverage else None
+            for _ in range(3)
+        )
+    return chains
+
+
+def gen_approver_maps(p: Profile, chains: dict, stage: int):
+    row_id = 0
+    for app_id, chain in chains.items():
+        if chain[stage] is not None:
+            row_id += 1
+            yield {"id": row_id, "app_id": app_id, "user_id": chain[stage]}
+
+
+def gen_access(p: Profile):
+    rng = _rng(p, "access")
+    weights = list(itertools.accumulate(1 / k ** p.app_skew for k in range(1, p.apps + 1)))
+    apps = range(1, p.apps + 1)
+    low, high = max(1, p.grants_per_user // 2), p.grants_per_user + p.grants_per_user // 2
+    row_id = 0
+    for user_id in range(1, p.users + 1):
+        picks = rng.choices(apps, cum_weights=weights, k=min(rng.randint(low, high), p.apps))
+        for app_id in sorted(set(picks)):
+            row_id += 1
+            yield {
+                "id": row_id,
+                "user_id": user_id,
+                "application_id": app_id,
+                "active": rng.random() >= p.inactive_ratio,
+                "created_at": BASE_TIME - timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+            }
+
+
+def gen_cycles(p: Profile):
+    for c in range(1, p.cycles + 1):
+        quarters_back = p.cycles - c + 1
+        year, quarter = divmod(BASE_TIME.year * 4 - quarters_back, 4)
+        yield {
+            "id": c,
+            "quarter": f"{year}-Q{quarter + 1}",
+            "status": "completed",
+            "created_at": BASE_TIME - timedelta(days=91 * quarters_back),
+        }
+
+
+def gen_review(p: Profile, chains: dict):
+    """Yield ("review_item" | "approval_history", row) for every historic cycle.
+
+    Each cycle covers the grants that were active; decisions walk the
+    approver chain the way the stage action endpoints do.
+    """
+    rng = _rng(p, "review")
+    item_id = history_id = 0
+    for cycle in gen_cycles(p):
+        decided_at = cycle["created_at"] + timedelta(days=14)
+        for access in gen_access(p):
+            if not access["active"]:
+                continue
+            item_id += 1
+            am, ao, bo = chains[access["application_id"]]
+            item = {
+                "id": item_id, "cycle_id": cycle["id"], "access_id": access["id"],
+                "app_manager_id": am, "app_owner_id": ao, "business_owner_id": bo,
+                "pending_stage": "completed", "final_status": None,
+                "application_manager_action": None, "application_manager_timestamp": None,
+                "application_owner_action": None, "application_owner_timestamp": None,
+                "business_owner_action": None, "business_owner_timestamp": None,
+            }
+            history = []
+            for approver, prefix, stage, rate, keep, drop, final in (
+                (am, "application_manager", "app_manager", p.am_revoke_rate, "Retain", "Revoke", "Revoked by App Manager"),
+                (ao, "application_owner", "app_owner", p.ao_reject_rate, "Approve", "Reject", "Revoked by App Owner"),
+                (bo, "business_owner", "business_owner", p.bo_reject_rate, "Approve", "Reject", "Reject"),
+            ):
+                if approver is None:
+                    continue
+                action = drop if rng.random() < rate else keep
+                item[f"{prefix}_action"] = action
+                item[f"{prefix}_timestamp"] = decided_at
+                item["final_status"] = final if action == drop else action
+                history_id += 1
+                history.append({"id": history_id, "review_item_id": item_id, "stage": stage,
+                                "action": action, "comment": None, "timestamp": decided_at})
+                if action == drop:
+                    break
+            yield "review_item", item
+            for row in history:
+                yield "approval_history", row
+
+
+def _batched(rows, size):
+    it = iter(rows)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _insert(conn, table, rows, batch_size) -> int:
+    count = 0
+    for batch in _batched(rows, batch_size):
+        conn.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def _insert_split(conn, tagged_rows, batch_size) -> dict[str, int]:
+    """Insert ("table", row) pairs, buffering per table."""
+    tables = {t.name: t for t in (models.ReviewItem.__table__, models.ApprovalHistory.__table__)}
+    buffers = {name: [] for name in tables}
+    counts = dict.fromkeys(tables, 0)
+    for name, row in tagged_rows:
+        buf = buffers[name]
+        buf.append(row)
+        if len(buf) >= batch_size:
+            conn.execute(tables[name].insert(), buf)
+            counts[name] += len(buf)
+            buf.clear()
+    for name, buf in buffers.items():
+        if buf:
+            conn.execute(tables[name].insert(), buf)
+            counts[name] += len(buf)
+    return counts
+
+
+def load(engine, profile: Profile, batch_size: int = 20_000, reset: bool = False, log=print) -> dict[str, int]:
+    """Generate ``profile`` into an empty (or ``reset``) database; returns row counts."""
+    from backend.db import migrations
+    from backend.services.access_history import backfill_versions
+    from backend.services.reporting_service import rebuild_closure
+    from backend.utils.http_cache import COLLECTIONS
+
+    if reset:
+        migrations.reset(engine)
+    else:
+        migrations.upgrade(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(models.User.__table__)).scalar():
+            raise SystemExit("Database already has users; pass --reset to replace it")
+
+    chains = approver_chains(profile)
+    plan = [
+        (models.User.__table__, lambda: gen_users(profile)),
+        (models.Role.__table__, lambda: gen_roles(profile)),
+        (models.UserRole.__table__, lambda: gen_user_roles(profile)),
+        (models.ReportingMap.__table__, lambda: gen_reporting(profile)),
+        (models.Application.__table__, lambda: gen_applications(profile)),
+        (models.AppManagerMap.__table__, lambda: gen_approver_maps(profile, chains, 0)),
+        (models.AppOwnerMap.__table__, lambda: gen_approver_maps(profile, chains, 1)),
+        (models.BusinessOwnerMap.__table__, lambda: gen_approver_maps(profile, chains, 2)),
+        (models.Access.__table__, lambda: gen_access(profile)),
+        (models.ReviewCycle.__table__, lambda: gen_cycles(profile)),
+    ]
+    derived_tables = [
+        models.ReviewItem.__table__,
+        models.ApprovalHistory.__table__,
+        models.ReportingClosure.__table__,
+        models.AccessVersion.__table__,
+    ]
+    indexes = [ix for table, _ in plan for ix in table.indexes] + [
+        ix for table in derived_tables for ix in table.indexes
+    ]
+
+    counts = {}
+    sqlite = engine.dialect.name == "sqlite"
+    with engine.connect() as conn:
+        if sqlite:
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.commit()
+        with conn.begin():
+            for ix in indexes:
+                ix.drop(conn, checkfirst=True)
+
+        for table, rows in plan:
+            t0 = time.perf_counter()
+            with conn.begin():
+                counts[table.name] = _insert(conn, table, rows(), batch_size)
+            log(f"{table.name:>20}: {counts[table.name]:>11,} rows in {time.perf_counter() - t0:6.1f}s")
+
+        t0 = time.perf_counter()
+        with conn.begin():
+            counts["reporting_closure"] = rebuild_closure(conn)
+        log(f"{'reporting_closure':>20}: {counts['reporting_closure']:>11,} rows in {time.perf_counter() - t0:6.1f}s")
+
+        t0 = time.perf_counter()
+        with conn.begin():
+            counts["access_version"] = backfill_versions(conn)
+        log(f"{'access_version':>20}: {counts['access_version']:>11,} rows in {time.perf_counter() - t0:6.1f}s")
+
+        t0 = time.perf_counter()
+        with conn.begin():
+            counts.update(_insert_split(conn, gen_review(profile, chains), batch_size))
+        log(f"{'review history':>20}: {counts['review_item']:>11,} items, "
+            f"{counts['approval_history']:,} actions in {time.perf_counter() - t0:6.1f}s")
+
+        t0 = time.perf_counter()
+        with conn.begin():
+            for ix in indexes:
+                ix.create(conn, checkfirst=True)
+            apps = models.Application.__table__
+            access = models.Access.__table__
+            conn.execute(update(apps).values(user_count=(
+                select(func.count()).where(access.c.application_id == apps.c.id, access.c.active == True)
+                .scalar_subquery()
+            )))
+            versions = models.CollectionVersion.__table__
+            conn.execute(update(versions).where(versions.c.name.in_(COLLECTIONS)).values(
+                version=versions.c.version + 1, updated_at=datetime.utcnow()
+            ))
+        log(f"{'indexes':>20}: rebuilt in {time.perf_counter() - t0:6.1f}s")
+        if sqlite:
+            conn.exec_driver_sql("PRAGMA synchronous=FULL")
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="start from a named profile")
+    for f in fields(Profile):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), dest=f.name)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the schema first")
+    args = parser.parse_args()
+
+    profile = PRESETS[args.preset] if args.preset else Profile()
+    overrides = {f.name: getattr(args, f.name) for f in fields(Profile) if getattr(args, f.name) is not None}
+    profile = replace(profile, **overrides)
+
+    from backend.db.database import engine
+
+    print(f"Profile: {asdict(profile)}")
+    t0 = time.perf_counter()
+    counts = load(engine, profile, batch_size=args.batch_size, reset=args.reset)
+    print(f"Loaded {sum(counts.values()):,} rows in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
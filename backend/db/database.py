@@ -1,22 +1,62 @@
-from sqlalchemy import create_engine, text
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from backend.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
-)
 
-# Enable WAL for SQLite
-if settings.DATABASE_URL.startswith("sqlite"):
-    with engine.connect() as conn:
-        conn.execute(text("PRAGMA journal_mode=WAL;"))
+def make_engine(url: str):
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+    )
+    # Enable WAL for SQLite. Done per connection rather than at import so that
+    # importing the app never touches the database.
+    if url.startswith("sqlite"):
+        @event.listens_for(engine, "connect")
+        def _sqlite_wal(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL;")
+            cursor.close()
+    return engine
+
+
+# Writer (primary) and reader (replica). Without DATABASE_READ_URL both are
+# the same engine and routing is a no-op.
+engine = make_engine(settings.DATABASE_URL)
+read_engine = (
+    make_engine(settings.DATABASE_READ_URL)
+    if settings.DATABASE_READ_URL and settings.DATABASE_READ_URL != settings.DATABASE_URL
+    else engine
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
-def get_db():
+# Request state keys shared with ReadYourWritesMiddleware.
+WROTE_STATE = "db_wrote"
+PRIMARY_STATE = "db_read_primary"
+
+
+def get_db(request: Request):
+    """Writer session. A commit marks the client as sticky to the primary."""
     db = SessionLocal()
+    event.listen(db, "after_commit", lambda session: setattr(request.state, WROTE_STATE, time.time()))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def read_sessionmaker(request: Request) -> sessionmaker:
+    """The replica, unless this client wrote recently."""
+    return SessionLocal if getattr(request.state, PRIMARY_STATE, False) else ReadSessionLocal
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes."""
+    db = read_sessionmaker(request)()
     try:
         yield db
     finally:
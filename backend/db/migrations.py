@@ -0,0 +1,188 @@
+"""Versioned schema migrations.
+
+Every migration is a function of a connection inside the upgrade
+transaction and must be idempotent: the baseline creates whatever tables
+are missing from the current models, so later steps check the live schema
+before adding columns or indexes. Append new steps to ``MIGRATIONS``; never
+edit or reorder released ones.
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from backend.db.database import Base, engine as default_engine
+from backend.db import models  # noqa: F401  (registers tables on Base.metadata)
+from backend.utils.http_cache import COLLECTIONS
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _index(name: str):
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(name)
+
+
+def create_indexes(conn, names):
+    for name in names:
+        _index(name).create(conn, checkfirst=True)
+
+
+def create_tables(conn, tables):
+    Base.metadata.create_all(conn, tables=tables, checkfirst=True)
+
+
+def add_columns(conn, table, column_names):
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    for name in column_names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(conn.dialect)}"
+        conn.execute(text(ddl))
+
+
+def _0001_baseline(conn):
+    Base.metadata.create_all(conn, checkfirst=True)
+
+
+def _0002_review_item_fulfillment(conn):
+    add_columns(conn, models.ReviewItem.__table__, ["fulfillment_status", "fulfilled_at"])
+
+
+def _0003_hot_path_indexes(conn):
+    create_indexes(conn, [
+        "ix_review_item_cycle_stage",
+        "ix_review_item_am_inbox",
+        "ix_review_item_ao_inbox",
+        "ix_review_item_bo_inbox",
+        "ix_review_item_access",
+        "ix_access_user",
+        "ix_access_app_active",
+        "ix_approval_history_review_item_id",
+        "ix_app_manager_map_app_id",
+        "ix_app_owner_map_app_id",
+        "ix_business_owner_map_app_id",
+    ])
+
+
+def _0004_collection_versions(conn):
+    create_tables(conn, [models.CollectionVersion.__table__])
+    table = models.CollectionVersion.__table__
+    existing = {name for (name,) in conn.execute(select(table.c.name))}
+    now = datetime.utcnow()
+    rows = [{"name": n, "version": 0, "updated_at": now} for n in COLLECTIONS if n not in existing]
+    if rows:
+        conn.execute(table.insert(), rows)
+
+
+def _0005_user_passwords(conn):
+    add_columns(conn, models.User.__table__, ["hashed_password"])
+
+
+def _0006_idempotency_records(conn):
+    create_tables(conn, [models.IdempotencyRecord.__table__])
+
+
+def _0007_change_events(conn):
+    create_tables(conn, [models.ChangeEvent.__table__])
+
+
+def _0008_connector_runs(conn):
+    create_tables(conn, [models.ConnectorRun.__table__])
+
+
+def _0009_reporting_closure(conn):
+    from backend.services.reporting_service import rebuild_closure
+
+    create_tables(conn, [models.ReportingClosure.__table__])
+    rebuild_closure(conn)
+
+
+def _0010_delegations(conn):
+    create_tables(conn, [models.Delegation.__table__, models.EffectiveApprover.__table__])
+    add_columns(conn, models.ApprovalHistory.__table__, ["actor_user_id"])
+
+
+def _0011_review_item_risk(conn):
+    add_columns(conn, models.ReviewItem.__table__, ["risk_score"])
+    create_indexes(conn, ["ix_review_item_cycle_risk"])
+
+
+def _0012_peer_outliers(conn):
+    create_tables(conn, [
+        models.PeerGroup.__table__,
+        models.PeerGroupMember.__table__,
+        models.PeerGroupApp.__table__,
+        models.PeerOutlier.__table__,
+    ])
+
+
+def _0013_access_versions(conn):
+    from backend.services.access_history import backfill_versions
+
+    create_tables(conn, [models.AccessVersion.__table__])
+    backfill_versions(conn)
+
+
+def _0014_archived_decisions(conn):
+    from backend.services.archive_service import backfill_decisions
+
+    create_tables(conn, [models.ArchivedDecision.__table__])
+    backfill_decisions(conn)
+
+
+MIGRATIONS = [
+    (1, "baseline schema", _0001_baseline),
+    (2, "review item fulfillment columns", _0002_review_item_fulfillment),
+    (3, "hot path indexes", _0003_hot_path_indexes),
+    (4, "collection versions for HTTP caching", _0004_collection_versions),
+    (5, "user password hashes for /token", _0005_user_passwords),
+    (6, "idempotency key results", _0006_idempotency_records),
+    (7, "change data feed", _0007_change_events),
+    (8, "connector run metrics", _0008_connector_runs),
+    (9, "reporting hierarchy closure", _0009_reporting_closure),
+    (10, "reviewer delegation", _0010_delegations),
+    (11, "review item risk scores", _0011_review_item_risk),
+    (12, "peer-group outliers", _0012_peer_outliers),
+    (13, "access validity intervals", _0013_access_versions),
+    (14, "archived decision summary", _0014_archived_decisions),
+]
+
+
+def current_version(engine=default_engine) -> int:
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_migrations.name):
+            return 0
+        return max((v for (v,) in conn.execute(select(schema_migrations.c.version))), default=0)
+
+
+def upgrade(engine=default_engine, target: int = None) -> list[int]:
+    """Apply pending migrations up to ``target`` (default: latest), one transaction each."""
+    _meta.create_all(engine, checkfirst=True)
+    applied = []
+    version = current_version(engine)
+    for number, name, step in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=number, name=name, applied_at=datetime.utcnow()
+            ))
+        applied.append(number)
+    return applied
+
+
+def reset(engine=default_engine) -> list[int]:
+    """Drop everything and rebuild from scratch. Local/test databases only."""
+    Base.metadata.drop_all(engine)
+    _meta.drop_all(engine)
+    return upgrade(engine)
@@ -5,7 +5,11 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     Boolean,
+    Float,
     Text,
+    LargeBinary,
+    Index,
+    JSON,
     UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
@@ -19,6 +23,8 @@ class User(Base):
     business_user_id = Column(String, unique=True, nullable=False, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False, index=True)
+    # Only users who sign in directly have one; login is by business_user_id.
+    hashed_password = Column(String, nullable=True)
 
     roles = relationship("UserRole", back_populates="user", cascade="all, delete-orphan")
     accesses = relationship("Access", back_populates="user", cascade="all, delete-orphan")
@@ -70,6 +76,11 @@ class Access(Base):
     user = relationship("User", back_populates="accesses")
     application = relationship("Application", back_populates="accesses")
 
+    __table_args__ = (
+        Index("ix_access_user", "user_id"),
+        Index("ix_access_app_active", "application_id", "active"),
+    )
+
 
 class ReportingMap(Base):
     __tablename__ = "reporting_map"
@@ -80,10 +91,26 @@ class ReportingMap(Base):
     __table_args__ = (UniqueConstraint("manager_id", "user_id", name="_manager_user_uc"),)
 
 
+class ReportingClosure(Base):
+    # Transitive closure of reporting_map: one row per (manager, report) pair
+    # at any distance, depth being the shortest chain. The primary key serves
+    # subtree membership, the depth index subtree listings in page order and
+    # the descendant index chains of command.
+    __tablename__ = "reporting_closure"
+    ancestor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_reporting_closure_ancestor_depth", "ancestor_id", "depth", "descendant_id"),
+        Index("ix_reporting_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+
 class AppManagerMap(Base):
     __tablename__ = "app_manager_map"
     id = Column(Integer, primary_key=True)
-    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     application = relationship("Application", back_populates="managers")
 
@@ -91,7 +118,7 @@ class AppManagerMap(Base):
 class AppOwnerMap(Base):
     __tablename__ = "app_owner_map"
     id = Column(Integer, primary_key=True)
-    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     application = relationship("Application", back_populates="owners")
 
@@ -99,7 +126,7 @@ class AppOwnerMap(Base):
 class BusinessOwnerMap(Base):
     __tablename__ = "business_owner_map"
     id = Column(Integer, primary_key=True)
-    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    app_id = Column(Integer, ForeignKey("applications.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     application = relationship("Application", back_populates="bos")
 
@@ -142,12 +169,254 @@ class ReviewItem(Base):
 
     final_status = Column(String, nullable=True)
 
+    # Set by the revocation pipeline once a revoked decision has been applied
+    # to the Access row: fulfilled / access_missing
+    fulfillment_status = Column(String, nullable=True)
+    fulfilled_at = Column(DateTime, nullable=True)
+
+    # 0-100, set by the risk-scoring stage (RiskService.score_cycle)
+    risk_score = Column(Float, nullable=True)
+
+    # One index per inbox shape: (approver, cycle, stage) for the stage lists,
+    # (cycle, stage) for the admin list and archival checks.
+    __table_args__ = (
+        Index("ix_review_item_cycle_stage", "cycle_id", "pending_stage"),
+        Index("ix_review_item_am_inbox", "app_manager_id", "cycle_id", "pending_stage"),
+        Index("ix_review_item_ao_inbox", "app_owner_id", "cycle_id", "pending_stage"),
+        Index("ix_review_item_bo_inbox", "business_owner_id", "cycle_id", "pending_stage"),
+        Index("ix_review_item_access", "access_id"),
+        Index("ix_review_item_cycle_risk", "cycle_id", "risk_score"),
+    )
+
+
+# final_status values that mean the grant should be taken away. The business
+# owner's action is stored verbatim, hence the plain verbs.
+REVOKED_STATUSES = ("Revoked by App Manager", "Revoked by App Owner", "Revoke", "Reject")
+
 
 class ApprovalHistory(Base):
     __tablename__ = "approval_history"
     id = Column(Integer, primary_key=True)
-    review_item_id = Column(Integer, ForeignKey("review_item.id"), nullable=False)
+    review_item_id = Column(Integer, ForeignKey("review_item.id"), nullable=False, index=True)
     stage = Column(String, nullable=False)
     action = Column(String, nullable=False)
     comment = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    # Who acted: the stage approver or one of their delegates.
+    actor_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+
+class ReviewCycleArchive(Base):
+    __tablename__ = "review_cycle_archive"
+    cycle_id = Column(Integer, ForeignKey("review_cycle.id"), primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
+    history_count = Column(Integer, nullable=False, default=0)
+    # zlib-compressed JSON: {"columns": [...], "rows": [[...], ...]}
+    items = Column(LargeBinary, nullable=False)
+    history = Column(LargeBinary, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedDecision(Base):
+    # Per-access summary of archived review decisions, kept by archive_cycle
+    # so findings and risk scoring never decode the cycle blobs: the latest
+    # archived decision and how many archived decisions revoked the grant.
+    # No foreign keys, like the blobs it summarizes.
+    __tablename__ = "archived_decision"
+    access_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True)
+    cycle_id = Column(Integer, nullable=False)
+    final_status = Column(String)
+    revocations = Column(Integer, nullable=False, default=0)
+
+
+class SodRule(Base):
+    __tablename__ = "sod_rule"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    kind = Column(String, nullable=False)  # application / role
+    left_id = Column(Integer, nullable=False)
+    right_id = Column(Integer, nullable=False)
+    description = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SodViolation(Base):
+    __tablename__ = "sod_violation"
+    id = Column(Integer, primary_key=True)
+    rule_id = Column(Integer, ForeignKey("sod_rule.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (UniqueConstraint("rule_id", "user_id", name="_sod_rule_user_uc"),)
+
+
+class AccessFinding(Base):
+    __tablename__ = "access_finding"
+    id = Column(Integer, primary_key=True)
+    access_id = Column(Integer, ForeignKey("access.id"), nullable=False, index=True)
+    kind = Column(String, nullable=False, index=True)
+    # orphaned_user / no_approver_chain / never_reviewed / revoked_but_active
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (UniqueConstraint("access_id", "kind", name="_finding_access_kind_uc"),)
+
+
+class CollectionVersion(Base):
+    __tablename__ = "collection_version"
+    # Bumped in the same transaction as any write to the collection; drives
+    # ETag / Last-Modified on the cached list endpoints.
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_record"
+    # sha256 of (caller, method, path, Idempotency-Key)
+    id = Column(String(64), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class ChangeEvent(Base):
+    __tablename__ = "change_event"
+    # Strictly increasing, never reused (AUTOINCREMENT on SQLite); consumers
+    # resume from the last seq they processed.
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # access / user_role / review_decision
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # create / modify / revoke / delete / assign / unassign / decision
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_change_event_entity_seq", "entity", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+CHANGE_ENTITIES = ("access", "user_role", "review_decision")
+
+
+class ConnectorRun(Base):
+    __tablename__ = "connector_run"
+    id = Column(Integer, primary_key=True)
+    connector = Column(String, nullable=False, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=True)
+    status = Column(String, nullable=False, default="running")  # running / succeeded / failed / timeout
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    accounts = Column(Integer, nullable=True)
+    # Time pulling and sorting, waiting for the writer (backpressure) and reconciling.
+    extract_seconds = Column(Float, nullable=True)
+    queued_seconds = Column(Float, nullable=True)
+    apply_seconds = Column(Float, nullable=True)
+    added = Column(Integer, nullable=True)
+    restored = Column(Integer, nullable=True)
+    removed = Column(Integer, nullable=True)
+    unknown_users = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+
+class Delegation(Base):
+    __tablename__ = "delegation"
+    id = Column(Integer, primary_key=True)
+    delegator_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    delegate_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stage = Column(String, nullable=True)  # app_manager / app_owner / business_owner; NULL = every stage
+    starts_at = Column(DateTime, nullable=False)
+    ends_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    revoked_at = Column(DateTime, nullable=True)
+
+
+class EffectiveApprover(Base):
+    # Precomputed from live delegations (chains included): user_id may act
+    # for approver_id at stage between valid_from and valid_to. Rebuilt
+    # whenever a delegation changes; the index covers inbox and
+    # authorization lookups.
+    __tablename__ = "effective_approver"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    stage = Column(String, nullable=False)
+    approver_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    valid_from = Column(DateTime, nullable=False)
+    valid_to = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_effective_approver_lookup", "user_id", "stage", "approver_id", "valid_from", "valid_to"),
+    )
+
+
+class PeerGroup(Base):
+    # Users holding exactly the same set of roles. role_key is the sorted
+    # role ids ("3,17"); "" groups the users without roles.
+    __tablename__ = "peer_group"
+    id = Column(Integer, primary_key=True)
+    role_key = Column(String, unique=True, nullable=False)
+    members = Column(Integer, nullable=False, default=0)
+
+
+class PeerGroupMember(Base):
+    __tablename__ = "peer_group_member"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    group_id = Column(Integer, ForeignKey("peer_group.id"), nullable=False, index=True)
+
+
+class PeerGroupApp(Base):
+    # Non-zero cells of the group x application matrix: active grants of
+    # the application among the group's members.
+    __tablename__ = "peer_group_app"
+    group_id = Column(Integer, ForeignKey("peer_group.id"), primary_key=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), primary_key=True)
+    holders = Column(Integer, nullable=False)
+
+
+class PeerOutlier(Base):
+    # Active grants held by few of the user's role peers; keyed by access so
+    # review items and dashboard rows join on the primary key.
+    __tablename__ = "peer_outlier"
+    access_id = Column(Integer, ForeignKey("access.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
+    group_id = Column(Integer, ForeignKey("peer_group.id"), nullable=False)
+    holders = Column(Integer, nullable=False)
+    peers = Column(Integer, nullable=False)
+    # Share of the other group members that hold the application too
+    frequency = Column(Float, nullable=False)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_peer_outlier_group_app", "group_id", "application_id"),
+        Index("ix_peer_outlier_app", "application_id"),
+    )
+
+
+class AccessVersion(Base):
+    # One row per interval a grant was active, [valid_from, valid_to); the
+    # open one ends at access_history.OPEN. No foreign keys: the history
+    # outlives grants deleted with their user. The interval indexes lead with
+    # valid_to so "active at T" is one range scan (valid_to > T) filtered on
+    # valid_from in the index.
+    __tablename__ = "access_version"
+    id = Column(Integer, primary_key=True)
+    access_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    application_id = Column(Integer, nullable=False)
+    # access.created_at, so point-in-time listings need not join access
+    granted_at = Column(DateTime)
+    valid_from = Column(DateTime, nullable=False)
+    valid_to = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_access_version_access", "access_id", "valid_to"),
+        Index("ix_access_version_interval", "valid_to", "valid_from"),
+        Index("ix_access_version_user_interval", "user_id", "valid_to", "valid_from"),
+        Index("ix_access_version_app_interval", "application_id", "valid_to", "valid_from"),
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from typing import Optional, List
 from datetime import datetime
 import re
@@ -12,8 +12,7 @@ class RoleCreate(RoleBase):
 
 class Role(RoleBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Users
 class UserBase(BaseModel):
@@ -34,8 +33,15 @@ class UserCreate(UserBase):
 
 class User(UserBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Auth
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
+class TokenData(BaseModel):
+    username: Optional[str] = None
 
 # UserRole
 class UserRoleBase(BaseModel):
@@ -47,8 +53,7 @@ class UserRoleCreate(UserRoleBase):
 
 class UserRole(UserRoleBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Application
 class ApplicationBase(BaseModel):
@@ -63,8 +68,7 @@ class ApplicationCreate(ApplicationBase):
 
 class Application(ApplicationBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Access
 class AccessBase(BaseModel):
@@ -85,8 +89,7 @@ class Access(AccessBase):
     id: int
     active: bool
     created_at: datetime
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Mappings
 class ReportingMapCreate(BaseModel):
@@ -97,8 +100,24 @@ class ReportingMap(BaseModel):
     id: int
     manager_id: int
     user_id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class OrgMember(BaseModel):
+    id: int
+    business_user_id: str
+    name: str
+    email: str
+    depth: int
+
+class OrgAccessCount(BaseModel):
+    application_id: int
+    application: str
+    users: int
+
+class OrgAccessSummary(BaseModel):
+    manager_id: int
+    members: int
+    applications: List[OrgAccessCount]
 
 class AppMapBase(BaseModel):
     app_id: int
@@ -115,18 +134,15 @@ class BusinessOwnerMapCreate(AppMapBase):
 
 class AppManagerMap(AppMapBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AppOwnerMap(AppMapBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class BusinessOwnerMap(AppMapBase):
     id: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Review
 class ReviewCycleBase(BaseModel):
@@ -139,8 +155,7 @@ class ReviewCycle(ReviewCycleBase):
     id: int
     status: str
     created_at: datetime
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ReviewItemBase(BaseModel):
     id: int
@@ -161,9 +176,10 @@ class ReviewItemBase(BaseModel):
     business_owner_action: Optional[str]
     business_owner_comment: Optional[str]
     final_status: Optional[str]
+    fulfillment_status: Optional[str] = None
+    risk_score: Optional[float] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class StageActionInput(BaseModel):
     review_item_id: int
@@ -179,3 +195,101 @@ class DashboardUserCreate(BaseModel):
     application: str  # Name of application, e.g. "Salesforce"
     role: str         # Name of role, e.g. "Admin"
     status: str       # "Active" or "Inactive"
+
+# Segregation of duties
+class SodRuleBase(BaseModel):
+    name: str
+    kind: str  # "application" or "role"
+    left_id: int
+    right_id: int
+    description: Optional[str] = None
+
+class SodRuleCreate(SodRuleBase):
+    pass
+
+class SodRule(SodRuleBase):
+    id: int
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class SodViolation(BaseModel):
+    id: int
+    rule_id: int
+    user_id: int
+    detected_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+# Findings
+class AccessFinding(BaseModel):
+    id: int
+    access_id: int
+    kind: str
+    detected_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+# Change data feed
+class ChangeEvent(BaseModel):
+    seq: int
+    entity: str
+    entity_id: int
+    op: str
+    payload: dict
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class ChangePage(BaseModel):
+    changes: List[ChangeEvent]
+    next_since: int
+    has_more: bool
+
+# Connectors
+class ConnectorRun(BaseModel):
+    id: int
+    connector: str
+    application_id: Optional[int] = None
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    accounts: Optional[int] = None
+    extract_seconds: Optional[float] = None
+    queued_seconds: Optional[float] = None
+    apply_seconds: Optional[float] = None
+    added: Optional[int] = None
+    restored: Optional[int] = None
+    removed: Optional[int] = None
+    unknown_users: Optional[int] = None
+    error: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+# Delegation
+class DelegationCreate(BaseModel):
+    delegator_id: int
+    delegate_id: int
+    stage: Optional[str] = None  # app_manager / app_owner / business_owner; omitted = every stage
+    starts_at: Optional[datetime] = None  # default: now
+    ends_at: datetime
+
+class Delegation(BaseModel):
+    id: int
+    delegator_id: int
+    delegate_id: int
+    stage: Optional[str] = None
+    starts_at: datetime
+    ends_at: datetime
+    created_at: datetime
+    revoked_at: Optional[datetime] = None
+    # Set on create / revoke: pending items whose routing changed.
+    pending_items: Optional[int] = None
+    model_config = ConfigDict(from_attributes=True)
+
+# Peer-group outliers
+class PeerOutlier(BaseModel):
+    access_id: int
+    user_id: int
+    application_id: int
+    group_id: int
+    holders: int
+    peers: int
+    frequency: float
+    detected_at: datetime
+    model_config = ConfigDict(from_attributes=True)
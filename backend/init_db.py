@@ -1,6 +1,5 @@
-from backend.db.database import Base, engine
-from backend.db import models
+from backend.db import migrations
 
-print("Creating tables...")
-Base.metadata.create_all(bind=engine)
-print("Tables created.")
+print("Applying migrations...")
+applied = migrations.upgrade()
+print(f"Schema at version {migrations.current_version()} (applied: {applied or 'none'}).")
@@ -0,0 +1,108 @@
+"""Batch jobs, run once per schedule tick (cron / CI):
+
+python -m backend.jobs findings
+python -m backend.jobs revocations --cycle-id 12
+python -m backend.jobs idempotency
+python -m backend.jobs reconcile --application-id 3 --snapshot /data/jira.csv.gz [--dry-run]
+python -m backend.jobs connectors [--connector jira]
+python -m backend.jobs risk --cycle-id 12
+python -m backend.jobs outliers
+python -m backend.jobs mine-roles [--similarity 0.6] [--min-users 10] [--processes 8] [--limit 100]
+"""
+import argparse
+import json
+
+from backend.config import settings
+from backend.connectors.base import load_connectors
+from backend.connectors.scheduler import run_connectors
+from backend.db import models
+from backend.db.database import SessionLocal
+from backend.services.findings_service import FindingsService
+from backend.services.idempotency_service import IdempotencyService
+from backend.services.peer_outlier_service import PeerOutlierService
+from backend.services.reconciliation_service import ReconciliationService
+from backend.services.revocation_service import RevocationService
+from backend.services.role_mining_service import RoleMiningService
+from backend.services.risk_service import RiskService
+
+
+def run_findings(db, args):
+    return FindingsService.refresh(db)
+
+
+def run_revocations(db, args):
+    if args.cycle_id is None:
+        raise SystemExit("--cycle-id is required")
+    return RevocationService.execute_cycle(db, args.cycle_id)
+
+
+def run_risk(db, args):
+    if args.cycle_id is None:
+        raise SystemExit("--cycle-id is required")
+    return RiskService.score_cycle(db, args.cycle_id)
+
+
+def run_outliers(db, args):
+    return PeerOutlierService.rebuild(db)
+
+
+def run_role_mining(db, args):
+    options = {"similarity": args.similarity, "min_users": args.min_users, "limit": args.limit}
+    return RoleMiningService.mine(db, processes=args.processes, **{k: v for k, v in options.items() if v is not None})
+
+
+def run_idempotency(db, args):
+    return IdempotencyService.purge_expired(db)
+
+
+def run_reconcile(db, args):
+    if args.application_id is None or args.snapshot is None:
+        raise SystemExit("--application-id and --snapshot are required")
+    return ReconciliationService.reconcile(db, args.application_id, args.snapshot, dry_run=args.dry_run)
+
+
+def run_connector_pull(db, args):
+    connectors = load_connectors(settings.CONNECTORS_CONFIG)
+    if args.connector:
+        connectors = [c for c in connectors if c.name in args.connector]
+    run_ids = run_connectors(connectors)
+    runs = db.query(models.ConnectorRun).filter(models.ConnectorRun.id.in_(run_ids)).order_by(models.ConnectorRun.id)
+    return [{c.name: getattr(run, c.name) for c in models.ConnectorRun.__table__.columns} for run in runs]
+
+
+JOBS = {
+    "findings": run_findings,
+    "revocations": run_revocations,
+    "idempotency": run_idempotency,
+    "reconcile": run_reconcile,
+    "connectors": run_connector_pull,
+    "risk": run_risk,
+    "outliers": run_outliers,
+    "mine-roles": run_role_mining,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a backend batch job")
+    parser.add_argument("job", choices=sorted(JOBS))
+    parser.add_argument("--cycle-id", type=int)
+    parser.add_argument("--application-id", type=int)
+    parser.add_argument("--snapshot", help="sorted CSV (or .csv.gz) of business_user_id")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--connector", action="append", help="only this connector (repeatable)")
+    parser.add_argument("--similarity", type=float, help="mine-roles: minimum Jaccard similarity")
+    parser.add_argument("--min-users", type=int, help="mine-roles: smallest cluster that proposes a role")
+    parser.add_argument("--processes", type=int, help="mine-roles: worker processes")
+    parser.add_argument("--limit", type=int, help="mine-roles: roles to print")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = JOBS[args.job](db, args)
+        print(json.dumps(result, default=str))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,15 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.db.database import Base, engine
-from backend.db import models
 from backend.routers import users, roles, user_roles, applications, access, mappings, review
-from backend.logger import logger
-import time
-
-Base.metadata.create_all(bind=engine)
+from backend.middleware.admission import AdmissionMiddleware
+from backend.middleware.compression import CompressionMiddleware
+from backend.middleware.idempotency import IdempotencyMiddleware
+from backend.middleware.instrumentation import InstrumentationMiddleware
+from backend.middleware.read_routing import STICKY_HEADER, ReadYourWritesMiddleware
 
+# Schema is managed by migrations (python -m backend.migrate), not at import.
 app = FastAPI(title="Access Review POC API v2")
 
-# Middleware for logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    logger.info(f"Request: {request.method} {request.url}")
-    
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Response: {response.status_code} (took {process_time:.4f}s)")
-        return response
-    except Exception as e:
-        logger.error(f"Request failed: {e}")
-        raise
-
 # CORS for local Next.js frontend
 origins = [
     "http://localhost:3000",
@@ -37,10 +22,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", STICKY_HEADER],
 )
 
-from backend.middleware.audit import audit_middleware
-app.middleware("http")(audit_middleware)
+# Replica reads, with primary stickiness for clients that just wrote
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Idempotency-Key replays; inside compression so stored bodies are plain
+app.add_middleware(IdempotencyMiddleware)
+
+# Negotiated gzip / brotli / zstd for large JSON and NDJSON bodies
+app.add_middleware(CompressionMiddleware)
+
+# Concurrency limit and per-user rate limits; rejects before any DB work
+app.add_middleware(AdmissionMiddleware)
+
+# Timing, request logging, audit and request ids (outermost layer)
+app.add_middleware(InstrumentationMiddleware)
 
 @app.get("/")
 def root():
@@ -56,3 +54,27 @@ app.include_router(review.router)
 
 from backend.routers import dashboard
 app.include_router(dashboard.router)
+
+from backend.routers import graph, sod, findings
+app.include_router(graph.router)
+app.include_router(sod.router)
+app.include_router(findings.router)
+
+from backend.routers import auth
+app.include_router(auth.router)
+
+from backend.routers import changes
+app.include_router(changes.router)
+
+from backend.routers import reconciliation, connectors
+app.include_router(reconciliation.router)
+app.include_router(connectors.router)
+
+from backend.routers import org
+app.include_router(org.router)
+
+from backend.routers import delegations
+app.include_router(delegations.router)
+
+from backend.routers import outliers
+app.include_router(outliers.router)
@@ -0,0 +1,249 @@
+import asyncio
+import math
+import re
+import threading
+import time
+
+from jose import JWTError, jwt
+
+from backend.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional: only needed for a shared bucket backend
+    redis_asyncio = None
+
+INTERACTIVE, STANDARD, BULK, STREAM = "interactive", "standard", "bulk", "stream"
+
+# First match wins. Interactive: one reviewer acting on one item. Bulk:
+# whole-cycle scans, exports and batch jobs. Stream: long-lived feed
+# connections that mostly sleep; rate limited but outside the concurrency
+# gate. Unlisted API routes are standard.
+ROUTE_CLASSES = [
+    ("GET", re.compile(r"^/changes/(stream|poll)$"), STREAM),
+    ("POST", re.compile(r"^/review/(app-manager|app-owner|business-owner)/action$"), INTERACTIVE),
+    ("POST", re.compile(r"^/token$"), INTERACTIVE),
+    ("GET", re.compile(r"^/review/items(/export)?$"), BULK),
+    ("GET", re.compile(r"^/dashboard/app-manager/users$"), BULK),
+    ("GET", re.compile(r"^/(users|access)/$"), BULK),
+    ("POST", re.compile(r"^/review/(start-cycle|cycles/\d+/(archive|execute-revocations|score))$"), BULK),
+    ("POST", re.compile(r"^/(findings/refresh|sod/evaluate|graph/rebuild|outliers/rebuild)$"), BULK),
+    ("POST", re.compile(r"^/reconciliation/"), BULK),
+]
+EXEMPT_PATHS = re.compile(r"^/(docs|redoc|openapi\.json)")
+
+
+def classify(method: str, path: str):
+    """Admission class of a request, or None for requests that skip admission."""
+    if method == "OPTIONS" or EXEMPT_PATHS.match(path):
+        return None
+    for route_method, pattern, cls in ROUTE_CLASSES:
+        if method == route_method and pattern.match(path):
+            return cls
+    return STANDARD
+
+
+class MemoryBuckets:
+    """Token buckets in this process. Each worker enforces its own share."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, cost: float, rate: float, burst: float, now: float = None) -> float:
+        """Spend ``cost`` tokens; returns 0 if allowed, else seconds until it would be."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now, rate, burst)
+                bucket = self._buckets[key] = [burst, now]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0.0
+            bucket[0] = tokens
+            return (cost - tokens) / rate
+
+    def _prune(self, now, rate, burst):
+        # Buckets that have refilled completely carry no state worth keeping.
+        full = [k for k, (tokens, last) in self._buckets.items() if tokens + (now - last) * rate >= burst]
+        for k in full:
+            del self._buckets[k]
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis (one atomic script per take)."""
+
+    SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 't') or ARGV[3])
+    local last = tonumber(redis.call('HGET', KEYS[1], 'l') or ARGV[4])
+    local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[2])
+    tokens = math.min(burst, tokens + math.max(0, now - last) * rate)
+    local wait = 0
+    if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+    redis.call('HSET', KEYS[1], 't', tokens, 'l', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND is a redis:// URL but the redis package is not installed")
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def take(self, key: str, cost: float, rate: float, burst: float, now: float = None) -> float:
+        now = time.time() if now is None else now
+        wait = await self._script(keys=[f"acm:bucket:{key}"], args=[rate, cost, burst, now])
+        return float(wait)
+
+
+def buckets_from_url(url: str):
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBuckets(url)
+    if url in ("", "memory"):
+        return MemoryBuckets()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {url}")
+
+
+class ConcurrencyGate:
+    """Global limit on in-flight requests with capacity held back for interactive ones.
+
+    Interactive requests may use every slot; standard ones all but
+    ``reserve``; bulk ones additionally at most ``bulk_limit``. Bulk is
+    rejected at once when full, the others wait up to ``max_wait``.
+    """
+
+    def __init__(self, limit: int, reserve: int, bulk_limit: int, max_wait: float):
+        self.limit = limit
+        self.reserve = min(reserve, limit - 1)
+        self.bulk_limit = bulk_limit
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.bulk_in_flight = 0
+        self._changed = None
+        self._loop = None
+
+    def _fits(self, cls) -> bool:
+        if cls == INTERACTIVE:
+            return self.in_flight < self.limit
+        if self.in_flight >= self.limit - self.reserve:
+            return False
+        return cls != BULK or self.bulk_in_flight < self.bulk_limit
+
+    def _take(self, cls):
+        self.in_flight += 1
+        if cls == BULK:
+            self.bulk_in_flight += 1
+
+    async def acquire(self, cls) -> bool:
+        if self._fits(cls):
+            self._take(cls)
+            return True
+        if cls == BULK or self.max_wait <= 0:
+            return False
+        loop = asyncio.get_running_loop()
+        if self._changed is None or self._loop is not loop:
+            self._changed, self._loop = asyncio.Condition(), loop
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: self._fits(cls)), self.max_wait)
+            except asyncio.TimeoutError:
+                return False
+            self._take(cls)
+        return True
+
+    async def release(self, cls):
+        self.in_flight -= 1
+        if cls == BULK:
+            self.bulk_in_flight -= 1
+        if self._changed is not None:
+            async with self._changed:
+                self._changed.notify_all()
+
+
+def client_key(scope) -> str:
+    """Bucket key: the token subject for authenticated calls, else the client address."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    sub = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+                except JWTError:
+                    sub = None
+                if sub:
+                    return f"user:{sub}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class AdmissionMiddleware:
+    """Global concurrency limit plus per-user token buckets, answered with a fast 429.
+
+    Runs before any database work so a rejected request costs no more than
+    routing it. ``rate`` of 0 disables the per-user buckets.
+    """
+
+    COSTS = {INTERACTIVE: 1.0, STANDARD: 1.0, BULK: 5.0, STREAM: 1.0}
+
+    def __init__(self, app, limit: int = None, reserve: int = None, bulk_limit: int = None,
+                 max_wait: float = None, rate: float = None, burst: float = None, buckets=None):
+        self.app = app
+        limit = settings.ADMISSION_MAX_CONCURRENCY if limit is None else limit
+        self.gate = ConcurrencyGate(
+            limit,
+            settings.ADMISSION_INTERACTIVE_RESERVE if reserve is None else reserve,
+            max(1, limit // 4) if bulk_limit is None else bulk_limit,
+            settings.ADMISSION_MAX_WAIT_SECONDS if max_wait is None else max_wait,
+        )
+        self.rate = settings.RATE_LIMIT_PER_SECOND if rate is None else rate
+        self.burst = settings.RATE_LIMIT_BURST if burst is None else burst
+        self.buckets = buckets if buckets is not None else (
+            buckets_from_url(settings.RATE_LIMIT_BACKEND) if self.rate > 0 else None
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cls = classify(scope["method"], scope["path"])
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.buckets is not None:
+            wait = await self.buckets.take(client_key(scope), self.COSTS[cls], self.rate, self.burst)
+            if wait > 0:
+                await _reject(send, "Rate limit exceeded", wait)
+                return
+
+        if cls == STREAM:
+            await self.app(scope, receive, send)
+            return
+        if not await self.gate.acquire(cls):
+            await _reject(send, "Server busy, retry shortly", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.gate.release(cls)
+
+
+async def _reject(send, detail: str, retry_after: float):
+    body = b'{"detail":"' + detail.encode() + b'"}'
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
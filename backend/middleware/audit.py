@@ -1,18 +1,18 @@
-from fastapi import Request
+import re
 from backend.logger import logger
-import time
 
-async def audit_middleware(request: Request, call_next):
-    # Logic to identify sensitive actions
-    sensitive_paths = ["/revoke", "/delete"]
-    is_sensitive = any(path in request.url.path for path in sensitive_paths)
-    
-    if is_sensitive:
-        logger.warning(f"AUDIT WARN: Sensitive action initiated on {request.url.path} by {request.client.host}")
-    
-    response = await call_next(request)
-    
-    if is_sensitive and response.status_code < 400:
-         logger.warning(f"AUDIT SUCCESS: Sensitive action completed on {request.url.path}")
+# Compiled once; matches the same paths as the old substring checks
+# ("/revoke" or "/delete" anywhere in the path).
+SENSITIVE_PATH = re.compile(r"/(?:revoke|delete)")
 
-    return response
+
+def is_sensitive(path: str) -> bool:
+    return SENSITIVE_PATH.search(path) is not None
+
+
+def audit_started(path: str, client_host: str, request_id: str):
+    logger.warning(f"AUDIT WARN: Sensitive action initiated on {path} by {client_host} [{request_id}]")
+
+
+def audit_completed(path: str, request_id: str):
+    logger.warning(f"AUDIT SUCCESS: Sensitive action completed on {path} [{request_id}]")
@@ -0,0 +1,198 @@
+import zlib
+from backend.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+_OPT_OUT_ATTR = "__acm_no_compression__"
+
+
+def no_compression(endpoint):
+    """Route decorator: never compress this endpoint's responses."""
+    setattr(endpoint, _OPT_OUT_ATTR, True)
+    return endpoint
+
+
+class _Gzip:
+    name = b"gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        c = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return c.compress(data) + c.flush()
+
+    def stream(self):
+        c = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return (lambda data: c.compress(data) + c.flush(zlib.Z_SYNC_FLUSH)), c.flush
+
+
+class _Brotli:
+    name = b"br"
+
+    def __init__(self, quality: int):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self):
+        c = brotli.Compressor(quality=self.quality)
+        return (lambda data: c.process(data) + c.flush()), c.finish
+
+
+class _Zstd:
+    name = b"zstd"
+
+    def __init__(self, level: int):
+        self.compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def stream(self):
+        c = self.compressor.compressobj()
+        return (lambda data: c.compress(data) + c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)), c.flush
+
+
+def available_encoders(gzip_level=None, brotli_quality=None, zstd_level=None) -> dict:
+    """Encoders this process can offer, keyed by content-coding, best first."""
+    encoders = {}
+    if zstandard is not None:
+        encoders[b"zstd"] = _Zstd(settings.ZSTD_LEVEL if zstd_level is None else zstd_level)
+    if brotli is not None:
+        encoders[b"br"] = _Brotli(settings.BROTLI_QUALITY if brotli_quality is None else brotli_quality)
+    encoders[b"gzip"] = _Gzip(settings.GZIP_LEVEL if gzip_level is None else gzip_level)
+    return encoders
+
+
+def negotiate(accept_encoding: bytes, encoders: dict):
+    """Pick the encoder with the highest q-value; ties go to the server's order."""
+    accepted = {}
+    for part in accept_encoding.lower().split(b","):
+        token, _, params = part.strip().partition(b";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith(b"q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token] = q
+    best, best_q = None, 0.0
+    for name, encoder in encoders.items():
+        q = accepted.get(name, accepted.get(b"*", 0.0))
+        if q > best_q:
+            best, best_q = encoder, q
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated gzip / brotli / zstd compression as a pure ASGI layer.
+
+    Single-message responses under ``min_size`` go out untouched. Streaming
+    responses (NDJSON exports) are compressed chunk by chunk with a flush
+    after each one, so clients still receive rows as they are produced.
+    Routes decorated with ``no_compression`` are skipped.
+    """
+
+    def __init__(self, app, min_size: int = None, encoders: dict = None):
+        self.app = app
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = b""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value
+                break
+        encoder = negotiate(accept, self.encoders) if accept else None
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None:
+                headers = start_message.get("headers", [])
+                if not self._should_compress(scope, start_message["status"], headers) or (
+                    not more_body and len(body) < self.min_size
+                ):
+                    passthrough = True
+                    if self._is_compressible_type(headers):
+                        start_message["headers"] = list(headers) + [(b"vary", b"Accept-Encoding")]
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers = [(k, v) for k, v in headers if k != b"content-length"]
+                headers += [(b"content-encoding", encoder.name), (b"vary", b"Accept-Encoding")]
+                if not more_body:
+                    compressed = encoder.compress(body)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    start_message["headers"] = headers
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                start_message["headers"] = headers
+                await send(start_message)
+                stream = encoder.stream()
+
+            chunk, finish = stream
+            out = chunk(body) if body else b""
+            if not more_body:
+                out += finish()
+            await send({"type": "http.response.body", "body": out, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _is_compressible_type(headers) -> bool:
+        for name, value in headers:
+            if name == b"content-type":
+                return value.startswith(COMPRESSIBLE_TYPES)
+        return False
+
+    def _should_compress(self, scope, status: int, headers) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if getattr(scope.get("endpoint"), _OPT_OUT_ATTR, False):
+            return False
+        if any(name == b"content-encoding" for name, _ in headers):
+            return False
+        return self._is_compressible_type(headers)
@@ -0,0 +1,122 @@
+import hashlib
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.db.database import SessionLocal
+from backend.middleware.admission import client_key
+from backend.services.idempotency_service import IN_PROGRESS, MISMATCH, REPLAY, IdempotencyService
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+
+
+def _with_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class IdempotencyMiddleware:
+    """Idempotency-Key support for mutating requests, as a pure ASGI layer.
+
+    The first request with a key runs normally and its response (below 500,
+    other than 429) is stored against the caller, method, path and key. A
+    retry with the same payload gets that response back without touching
+    the endpoint; a concurrent retry gets 409 and a reused key with a
+    different payload 422. Requests without the header are untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        key = None
+        for name, value in scope["headers"]:
+            if name == IDEMPOTENCY_HEADER:
+                key = value
+                break
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _respond(send, 400, b'{"detail":"Invalid Idempotency-Key"}')
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        record_id = hashlib.sha256("\n".join(
+            (client_key(scope), scope["method"], scope["path"], key.decode("latin-1"))
+        ).encode()).hexdigest()
+        request_hash = hashlib.sha256(scope.get("query_string", b"") + b"\n" + body).hexdigest()
+
+        outcome, record = await run_in_threadpool(_with_session, IdempotencyService.begin, record_id, request_hash)
+        if outcome == REPLAY:
+            await _respond(send, record.status_code, record.body or b"", record.content_type, replayed=True)
+            return
+        if outcome == IN_PROGRESS:
+            await _respond(send, 409, b'{"detail":"A request with this Idempotency-Key is in progress"}')
+            return
+        if outcome == MISMATCH:
+            await _respond(send, 422, b'{"detail":"Idempotency-Key was used with a different request"}')
+            return
+
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = None
+        content_type = None
+        response_body = []
+
+        async def send_wrapper(message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await run_in_threadpool(_with_session, IdempotencyService.release, record_id)
+            raise
+        if status_code is not None and status_code < 500 and status_code != 429:
+            await run_in_threadpool(
+                _with_session, IdempotencyService.complete, record_id, status_code, content_type, b"".join(response_body)
+            )
+        else:
+            await run_in_threadpool(_with_session, IdempotencyService.release, record_id)
+
+
+async def _respond(send, status: int, body: bytes, content_type: str = "application/json", replayed: bool = False):
+    headers = [(b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode("latin-1")))
+    if replayed:
+        headers.append((REPLAYED_HEADER, b"true"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,66 @@
+import time
+import uuid
+from backend.logger import logger
+from backend.middleware.audit import audit_completed, audit_started, is_sensitive
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class InstrumentationMiddleware:
+    """Timing, request logging, audit classification and request ids in one pure ASGI layer.
+
+    Replaces two ``@app.middleware("http")`` functions, each of which wrapped
+    the request in BaseHTTPMiddleware (an extra task and body stream per
+    request, and buffering that broke streaming responses). Messages pass
+    straight through here; only the response start is touched to add the
+    request id header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        path = scope["path"]
+        query = scope.get("query_string", b"")
+        target = f"{path}?{query.decode('latin-1')}" if query else path
+        logger.info(f"Request: {scope['method']} {target} [{request_id}]")
+
+        sensitive = is_sensitive(path)
+        if sensitive:
+            client = scope.get("client")
+            audit_started(path, client[0] if client else "unknown", request_id)
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+                ]
+                logger.info(f"Response: {status_code} (took {time.perf_counter() - start:.4f}s) [{request_id}]")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(f"Request failed: {e} [{request_id}]")
+            raise
+
+        if sensitive and status_code < 400:
+            audit_completed(path, request_id)
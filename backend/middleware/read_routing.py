@@ -0,0 +1,62 @@
+import time
+from http.cookies import SimpleCookie
+
+from backend.config import settings
+from backend.db.database import PRIMARY_STATE, WROTE_STATE
+
+STICKY_COOKIE = "acm_primary_until"
+# The same deadline as a header, for cross-origin clients whose fetch()
+# does not send the cookie back; they echo it on later requests.
+STICKY_HEADER = "X-Primary-Until"
+_STICKY_HEADER = STICKY_HEADER.lower().encode("latin-1")
+
+
+def _deadline(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for a short window after it writes.
+
+    ``get_db`` records a commit in the request state; on the way out this
+    layer turns that into a cookie and an ``X-Primary-Until`` header holding
+    the end of the window. On the way in, a live deadline from either sets
+    the state flag ``get_read_db`` checks, so the next inbox load after a
+    review action does not race replica lag.
+    """
+
+    def __init__(self, app, window: float = None):
+        self.app = app
+        self.window = settings.READ_YOUR_WRITES_SECONDS if window is None else window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        deadlines = []
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(STICKY_COOKIE)
+                if morsel is not None:
+                    deadlines.append(_deadline(morsel.value))
+            elif name == _STICKY_HEADER:
+                deadlines.append(_deadline(value.decode("latin-1")))
+        if deadlines:
+            state[PRIMARY_STATE] = max(deadlines) > time.time()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and state.get(WROTE_STATE):
+                until = state[WROTE_STATE] + self.window
+                cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1")),
+                    (_STICKY_HEADER, f"{until:.3f}".encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,30 @@
+"""Apply schema migrations. Run once per deploy, before starting workers:
+
+python -m backend.migrate            # upgrade to latest
+python -m backend.migrate --status   # show current and latest version
+"""
+import argparse
+
+from backend.db import migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--target", type=int, help="stop at this version")
+    parser.add_argument("--status", action="store_true", help="print versions and exit")
+    args = parser.parse_args()
+
+    latest = migrations.MIGRATIONS[-1][0]
+    if args.status:
+        print(f"current: {migrations.current_version()} latest: {latest}")
+        return
+
+    applied = migrations.upgrade(target=args.target)
+    if applied:
+        print(f"Applied migrations: {', '.join(map(str, applied))}")
+    else:
+        print(f"Database already at version {migrations.current_version()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
 from backend.services.access_service import AccessService
+from backend.utils.responses import rows_response, schema_columns
 
 router = APIRouter(prefix="/access", tags=["Access"])
 
@@ -12,8 +13,11 @@ def create_access(access: schemas.AccessCreate, db: Session = Depends(get_db)):
     return AccessService.create_access(db, access)
 
 @router.get("/", response_model=list[schemas.Access])
-def list_access(user_id: int = None, application_id: int = None, db: Session = Depends(get_db)):
-    return AccessService.list_access(db, user_id, application_id)
+def list_access(user_id: int = None, application_id: int = None, as_of: datetime = None,
+                db: Session = Depends(get_read_db)):
+    """With ``as_of``, the grants that were active at that time."""
+    columns = schema_columns(models.Access, schemas.Access)
+    return rows_response(AccessService.list_access(db, user_id, application_id, columns, as_of))
 
 @router.post("/{access_id}/revoke")
 def revoke_access(access_id: int, db: Session = Depends(get_db)):
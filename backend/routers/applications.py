@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
 from backend.services.application_service import ApplicationService
+from backend.utils.http_cache import cached_collection
+from backend.utils.responses import models_response
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
@@ -11,5 +13,7 @@ def create_application(app: schemas.ApplicationCreate, db: Session = Depends(get
     return ApplicationService.create_application(db, app)
 
 @router.get("/", response_model=list[schemas.Application])
-def list_applications(db: Session = Depends(get_db)):
-    return ApplicationService.list_applications(db)
+def list_applications(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "applications", lambda db: models_response(
+        schemas.Application, ApplicationService.list_applications(db)
+    ).body)
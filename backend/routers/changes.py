@@ -0,0 +1,111 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from backend.config import settings
+from backend.db.database import get_read_db, read_sessionmaker
+from backend.db import models, schemas
+from backend.middleware.compression import no_compression
+from backend.services.change_feed import ChangeFeedService, generation
+from backend.utils.responses import FastJSONResponse, dumps
+
+router = APIRouter(prefix="/changes", tags=["Change Feed"])
+
+STREAM_PAGE_SIZE = 500
+
+
+def _check_entity(entity: str):
+    if entity and entity not in models.CHANGE_ENTITIES:
+        raise HTTPException(400, f"entity must be one of {', '.join(models.CHANGE_ENTITIES)}")
+
+
+def _fetch(session_factory, since: int, limit: int, entity: str):
+    db = session_factory()
+    try:
+        return ChangeFeedService.list_changes(db, since, limit, entity)
+    finally:
+        db.close()
+
+
+async def _wait_for_commit(seen: int, timeout: float):
+    """Sleep until this process commits new events or ``timeout`` passes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while generation() == seen and loop.time() < deadline:
+        await asyncio.sleep(min(0.05, max(0.0, deadline - loop.time())))
+
+
+@router.get("/", response_model=schemas.ChangePage)
+def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    entity: str = None,
+    db: Session = Depends(get_read_db),
+):
+    # Pass next_since back as since to resume; has_more means page again now.
+    _check_entity(entity)
+    return FastJSONResponse(ChangeFeedService.list_changes(db, since, limit, entity))
+
+
+@router.get("/poll", response_model=schemas.ChangePage)
+async def poll_changes(
+    request: Request,
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    entity: str = None,
+    timeout: float = Query(25, ge=0, le=60),
+):
+    """Long poll: like ``GET /changes/`` but holds the request open until
+    there is at least one event after ``since`` or ``timeout`` seconds pass."""
+    _check_entity(entity)
+    session_factory = read_sessionmaker(request)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        seen = generation()
+        page = await run_in_threadpool(_fetch, session_factory, since, limit, entity)
+        remaining = deadline - loop.time()
+        if page["changes"] or remaining <= 0 or await request.is_disconnected():
+            return FastJSONResponse(page)
+        await _wait_for_commit(seen, min(remaining, settings.CHANGE_FEED_POLL_SECONDS))
+
+
+@router.get("/stream")
+@no_compression
+async def stream_changes(request: Request, since: int = Query(0, ge=0), entity: str = None):
+    """Server-sent events, one per change, with ``seq`` as the event id.
+
+    Reconnecting clients send ``Last-Event-ID`` and resume after it.
+    """
+    _check_entity(entity)
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    session_factory = read_sessionmaker(request)
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        cursor = since
+        last_sent = loop.time()
+        yield b"retry: 3000\n\n"
+        while not await request.is_disconnected():
+            seen = generation()
+            page = await run_in_threadpool(_fetch, session_factory, cursor, STREAM_PAGE_SIZE, entity)
+            if page["changes"]:
+                yield b"".join(
+                    b"id: %d\nevent: change\ndata: %s\n\n" % (change["seq"], dumps(change))
+                    for change in page["changes"]
+                )
+                cursor = page["next_since"]
+                last_sent = loop.time()
+                if page["has_more"]:
+                    continue
+            elif loop.time() - last_sent >= settings.CHANGE_FEED_HEARTBEAT_SECONDS:
+                yield b": keep-alive\n\n"
+                last_sent = loop.time()
+            await _wait_for_commit(seen, settings.CHANGE_FEED_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
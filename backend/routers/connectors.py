@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from backend.db.database import get_read_db
+from backend.db import models, schemas
+
+router = APIRouter(prefix="/connectors", tags=["Connectors"])
+
+@router.get("/runs", response_model=list[schemas.ConnectorRun])
+def list_runs(connector: str = None, limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_read_db)):
+    # Newest first. Runs are started by `python -m backend.jobs connectors`.
+    query = db.query(models.ConnectorRun)
+    if connector:
+        query = query.filter(models.ConnectorRun.connector == connector)
+    return query.order_by(models.ConnectorRun.id.desc()).limit(limit).all()
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from backend.db.database import get_db, get_read_db
+from backend.db import schemas
+from backend.services.delegation_service import DelegationService
+
+router = APIRouter(prefix="/delegations", tags=["Delegations"])
+
+@router.post("/", response_model=schemas.Delegation)
+def create_delegation(data: schemas.DelegationCreate, db: Session = Depends(get_db)):
+    return DelegationService.create_delegation(db, data)
+
+@router.get("/", response_model=list[schemas.Delegation])
+def list_delegations(user_id: int = None, active_only: bool = False, db: Session = Depends(get_read_db)):
+    # user_id matches either side of the delegation.
+    return DelegationService.list_delegations(db, user_id, active_only)
+
+@router.post("/{delegation_id}/revoke", response_model=schemas.Delegation)
+def revoke_delegation(delegation_id: int, db: Session = Depends(get_db)):
+    return DelegationService.revoke_delegation(db, delegation_id)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from backend.db.database import get_db, get_read_db
+from backend.db import schemas
+from backend.services.findings_service import FindingsService
+
+router = APIRouter(prefix="/findings", tags=["Findings"])
+
+@router.get("/", response_model=list[schemas.AccessFinding])
+def list_findings(kind: str = None, application_id: int = None, user_id: int = None, db: Session = Depends(get_read_db)):
+    return FindingsService.list_findings(db, kind, application_id, user_id)
+
+@router.post("/refresh")
+def refresh_findings(access_id: list[int] = Query(None), db: Session = Depends(get_db)):
+    # Without access_id the whole access table is rescanned; with it only
+    # those grants are re-checked.
+    return FindingsService.refresh(db, access_id)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from backend.db.database import get_db
+from backend.services.access_graph import access_graph
+
+router = APIRouter(prefix="/graph", tags=["Access Graph"])
+
+@router.get("/users/{user_id}/applications")
+def user_applications(user_id: int, db: Session = Depends(get_db)):
+    app_ids = access_graph.applications_for_user(db, user_id)
+    return {"version": access_graph.version, "user_id": user_id, "application_ids": app_ids}
+
+@router.get("/applications/{application_id}/users")
+def application_users(application_id: int, db: Session = Depends(get_db)):
+    user_ids = access_graph.users_for_application(db, application_id)
+    return {"version": access_graph.version, "application_id": application_id, "user_ids": user_ids}
+
+@router.get("/applications/{application_id}/approvers")
+def application_approvers(application_id: int, db: Session = Depends(get_db)):
+    approvers = access_graph.approvers_for_application(db, application_id)
+    return {"version": access_graph.version, "application_id": application_id, **approvers}
+
+@router.get("/stats")
+def graph_stats(db: Session = Depends(get_db)):
+    return access_graph.stats(db)
+
+@router.post("/rebuild")
+def rebuild_graph(db: Session = Depends(get_db)):
+    access_graph.load(db)
+    return access_graph.stats(db)
@@ -1,63 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
+from backend.services.access_graph import access_graph
+from backend.services.reporting_service import ReportingService
+from backend.utils.http_cache import cached_collection, collection_versions
+from backend.utils.responses import models_response
 
 router = APIRouter(prefix="/mappings", tags=["Mappings"])
 
 # Reporting manager <-> user
 @router.post("/reporting", response_model=schemas.ReportingMap)
 def create_reporting_map(body: schemas.ReportingMapCreate, db: Session = Depends(get_db)):
-    if db.query(models.ReportingMap).filter(
-        models.ReportingMap.manager_id == body.manager_id,
-        models.ReportingMap.user_id == body.user_id,
-    ).first():
-        raise HTTPException(400, "Mapping already exists")
-    m = models.ReportingMap(manager_id=body.manager_id, user_id=body.user_id)
-    db.add(m)
-    db.commit()
-    db.refresh(m)
-    return m
+    return ReportingService.add_edge(db, body.manager_id, body.user_id)
 
 @router.get("/reporting", response_model=list[schemas.ReportingMap])
-def list_reporting_maps(db: Session = Depends(get_db)):
-    return db.query(models.ReportingMap).all()
+def list_reporting_maps(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "reporting_map", lambda db: models_response(
+        schemas.ReportingMap, db.query(models.ReportingMap).all()
+    ).body)
 
 # App manager map
 @router.post("/app-manager", response_model=schemas.AppManagerMap)
 def create_app_manager_map(body: schemas.AppManagerMapCreate, db: Session = Depends(get_db)):
     m = models.AppManagerMap(app_id=body.app_id, user_id=body.user_id)
     db.add(m)
+    collection_versions.bump(db, "app_manager_map")
     db.commit()
     db.refresh(m)
+    access_graph.add_approver("app_manager", m.app_id, m.user_id)
     return m
 
 @router.get("/app-manager", response_model=list[schemas.AppManagerMap])
-def list_app_manager_maps(db: Session = Depends(get_db)):
-    return db.query(models.AppManagerMap).all()
+def list_app_manager_maps(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "app_manager_map", lambda db: models_response(
+        schemas.AppManagerMap, db.query(models.AppManagerMap).all()
+    ).body)
 
 # App owner map
 @router.post("/app-owner", response_model=schemas.AppOwnerMap)
 def create_app_owner_map(body: schemas.AppOwnerMapCreate, db: Session = Depends(get_db)):
     m = models.AppOwnerMap(app_id=body.app_id, user_id=body.user_id)
     db.add(m)
+    collection_versions.bump(db, "app_owner_map")
     db.commit()
     db.refresh(m)
+    access_graph.add_approver("app_owner", m.app_id, m.user_id)
     return m
 
 @router.get("/app-owner", response_model=list[schemas.AppOwnerMap])
-def list_app_owner_maps(db: Session = Depends(get_db)):
-    return db.query(models.AppOwnerMap).all()
+def list_app_owner_maps(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "app_owner_map", lambda db: models_response(
+        schemas.AppOwnerMap, db.query(models.AppOwnerMap).all()
+    ).body)
 
 # Business owner map
 @router.post("/business-owner", response_model=schemas.BusinessOwnerMap)
 def create_bo_map(body: schemas.BusinessOwnerMapCreate, db: Session = Depends(get_db)):
     m = models.BusinessOwnerMap(app_id=body.app_id, user_id=body.user_id)
     db.add(m)
+    collection_versions.bump(db, "business_owner_map")
     db.commit()
     db.refresh(m)
+    access_graph.add_approver("business_owner", m.app_id, m.user_id)
     return m
 
 @router.get("/business-owner", response_model=list[schemas.BusinessOwnerMap])
-def list_bo_maps(db: Session = Depends(get_db)):
-    return db.query(models.BusinessOwnerMap).all()
+def list_bo_maps(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "business_owner_map", lambda db: models_response(
+        schemas.BusinessOwnerMap, db.query(models.BusinessOwnerMap).all()
+    ).body)
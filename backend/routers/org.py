@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from backend.db.database import get_read_db
+from backend.db import schemas
+from backend.services.reporting_service import ReportingService
+from backend.utils.responses import FastJSONResponse, rows_response
+
+router = APIRouter(prefix="/org", tags=["Org Hierarchy"])
+
+@router.get("/{manager_id}/members", response_model=list[schemas.OrgMember])
+def subtree_members(
+    manager_id: int,
+    max_depth: int = Query(None, ge=1),
+    limit: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # Direct and indirect reports; max_depth=1 is direct reports only.
+    return rows_response(ReportingService.subtree(db, manager_id, max_depth, limit, offset))
+
+@router.get("/{manager_id}/access", response_model=schemas.OrgAccessSummary)
+def subtree_access(manager_id: int, db: Session = Depends(get_read_db)):
+    return FastJSONResponse(ReportingService.subtree_access(db, manager_id))
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from backend.db.database import get_db, get_read_db
+from backend.db import schemas
+from backend.services.peer_outlier_service import PeerOutlierService
+
+router = APIRouter(prefix="/outliers", tags=["Peer Outliers"])
+
+@router.get("/", response_model=list[schemas.PeerOutlier])
+def list_outliers(
+    application_id: int = None,
+    user_id: int = None,
+    limit: int = 1000,
+    offset: int = 0,
+    db: Session = Depends(get_read_db),
+):
+    # Rarest first.
+    return PeerOutlierService.list_outliers(db, application_id, user_id, limit, offset)
+
+@router.post("/rebuild")
+def rebuild_outliers(db: Session = Depends(get_db)):
+    return PeerOutlierService.rebuild(db)
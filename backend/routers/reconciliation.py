@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from backend.db.database import get_db
+from backend.services.reconciliation_service import ReconciliationService, SnapshotError, snapshot_path
+
+router = APIRouter(prefix="/reconciliation", tags=["Reconciliation"])
+
+@router.post("/applications/{application_id}")
+def reconcile_application(application_id: int, snapshot: str, dry_run: bool = False, db: Session = Depends(get_db)):
+    # ``snapshot`` is a file name in SNAPSHOT_DIR, sorted by business_user_id.
+    try:
+        return ReconciliationService.reconcile(db, application_id, snapshot_path(snapshot), dry_run=dry_run)
+    except SnapshotError as exc:
+        raise HTTPException(400, str(exc))
+    except FileNotFoundError as exc:
+        raise HTTPException(404, str(exc))
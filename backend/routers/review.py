@@ -1,60 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, insert, literal, select
 from sqlalchemy.orm import Session
 from datetime import datetime
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db, read_sessionmaker
 from backend.db import models, schemas
+from backend.services.archive_service import ArchiveService
+from backend.services.change_feed import record_change
+from backend.services.delegation_service import DelegationService
+from backend.services.revocation_service import RevocationService
+from backend.services.risk_service import RiskService
+from backend.utils.responses import dicts_response, ndjson_chunks, rows_response, schema_columns
 
 router = APIRouter(prefix="/review", tags=["Review & Workflow"])
 
+# Item lists are projected straight to the response fields.
+ITEM_COLUMNS = schema_columns(models.ReviewItem, schemas.ReviewItemBase)
+ITEM_SORTS = ("risk",)
+
+def _check_sort(sort: str = None):
+    if sort is not None and sort not in ITEM_SORTS:
+        raise HTTPException(400, f"sort must be one of {', '.join(ITEM_SORTS)}")
+
+def _sorted(query, sort: str = None):
+    _check_sort(sort)
+    if sort is None:
+        return query
+    # Riskiest first; items scored before the column existed go last.
+    return query.order_by(models.ReviewItem.risk_score.desc().nulls_last(), models.ReviewItem.id)
+
+def _outliers_only(query, outliers: bool):
+    # Grants few of the user's role peers hold; peer_outlier is keyed by access_id.
+    if not outliers:
+        return query
+    return query.join(models.PeerOutlier, models.PeerOutlier.access_id == models.ReviewItem.access_id)
+
 @router.post("/start-cycle")
 def start_cycle(quarter: str, db: Session = Depends(get_db)):
     # Only Admin should start cycle (omitted for POC simplicity, or check role here)
     cycle = models.ReviewCycle(quarter=quarter, status="in_progress")
     db.add(cycle)
     db.commit()
-    db.refresh(cycle)
-
-    accesses = db.query(models.Access).filter(models.Access.active == True).all()
-
-    for acc in accesses:
-        # app manager
-        am_map = db.query(models.AppManagerMap).filter(models.AppManagerMap.app_id == acc.application_id).first()
-        app_manager_id = am_map.user_id if am_map else None
+    cycle_id = cycle.id
 
-        # app owner
-        ao_map = db.query(models.AppOwnerMap).filter(models.AppOwnerMap.app_id == acc.application_id).first()
-        app_owner_id = ao_map.user_id if ao_map else None
-
-        # business owner
-        bo_map = db.query(models.BusinessOwnerMap).filter(models.BusinessOwnerMap.app_id == acc.application_id).first()
-        business_owner_id = bo_map.user_id if bo_map else None
+    # One item per active grant, with the application's first mapped
+    # approver per stage; the first stage that has one is pending.
+    def first_approver(model):
+        return (
+            select(model.user_id)
+            .where(model.app_id == models.Access.application_id)
+            .order_by(model.id)
+            .limit(1)
+            .scalar_subquery()
+        )
 
-        if app_manager_id:
-            pending_stage = "app_manager"
-        elif app_owner_id:
-            pending_stage = "app_owner"
-        elif business_owner_id:
-            pending_stage = "business_owner"
-        else:
-            pending_stage = "completed"
-
-        item = models.ReviewItem(
-            cycle_id=cycle.id,
-            access_id=acc.id,
-            app_manager_id=app_manager_id,
-            app_owner_id=app_owner_id,
-            business_owner_id=business_owner_id,
-            pending_stage=pending_stage,
+    grants = (
+        select(
+            models.Access.id.label("access_id"),
+            first_approver(models.AppManagerMap).label("app_manager_id"),
+            first_approver(models.AppOwnerMap).label("app_owner_id"),
+            first_approver(models.BusinessOwnerMap).label("business_owner_id"),
         )
-        db.add(item)
+        .where(models.Access.active == True)
+        .subquery()
+    )
+    pending_stage = case(
+        (grants.c.app_manager_id.isnot(None), "app_manager"),
+        (grants.c.app_owner_id.isnot(None), "app_owner"),
+        (grants.c.business_owner_id.isnot(None), "business_owner"),
+        else_="completed",
+    )
+    db.execute(insert(models.ReviewItem).from_select(
+        ["cycle_id", "access_id", "app_manager_id", "app_owner_id", "business_owner_id", "pending_stage"],
+        select(
+            literal(cycle_id), grants.c.access_id, grants.c.app_manager_id,
+            grants.c.app_owner_id, grants.c.business_owner_id, pending_stage,
+        ).order_by(grants.c.access_id),
+    ))
 
     db.commit()
-    return {"message": "Review cycle started", "cycle_id": cycle.id}
+    risk = RiskService.score_cycle(db, cycle_id)
+    return {"message": "Review cycle started", "cycle_id": cycle_id, "risk": risk}
 
 @router.get("/cycles", response_model=list[schemas.ReviewCycle])
-def list_cycles(db: Session = Depends(get_db)):
+def list_cycles(db: Session = Depends(get_read_db)):
     return db.query(models.ReviewCycle).order_by(models.ReviewCycle.created_at.desc()).all()
 
+@router.post("/cycles/{cycle_id}/archive")
+def archive_cycle(cycle_id: int, db: Session = Depends(get_db)):
+    return ArchiveService.archive_cycle(db, cycle_id)
+
+@router.post("/cycles/{cycle_id}/score")
+def score_cycle(cycle_id: int, db: Session = Depends(get_db)):
+    """Re-run the risk-scoring stage, e.g. after findings or SoD rules changed."""
+    return RiskService.score_cycle(db, cycle_id)
+
+@router.post("/cycles/{cycle_id}/execute-revocations")
+def execute_revocations(cycle_id: int, db: Session = Depends(get_db)):
+    return RevocationService.execute_cycle(db, cycle_id)
+
+@router.get("/cycles/{cycle_id}/history")
+def cycle_history(cycle_id: int, db: Session = Depends(get_read_db)):
+    # Only archived cycles keep their history in one place; live cycles are
+    # read through the item endpoints.
+    return ArchiveService.get_history(db, cycle_id)
+
 @router.get("/items", response_model=list[schemas.ReviewItemBase])
 def list_items(
     cycle_id: int, 
@@ -62,9 +112,20 @@ def list_items(
     stage: str = None, 
     user_id: int = None, 
     application_id: int = None, 
-    db: Session = Depends(get_db)
+    sort: str = None,
+    outliers: bool = False,
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(models.ReviewItem).filter(models.ReviewItem.cycle_id == cycle_id)
+    cycle = db.query(models.ReviewCycle).filter(models.ReviewCycle.id == cycle_id).first()
+    if cycle and cycle.status == "archived":
+        _check_sort(sort)
+        # Outlier flags describe today's grants, not the archived decisions.
+        if outliers:
+            raise HTTPException(400, "outliers is not available for archived cycles")
+        rows = ArchiveService.list_items(db, cycle_id, status, stage, user_id, application_id, sort)
+        return dicts_response(rows, schemas.ReviewItemBase)
+
+    query = db.query(*ITEM_COLUMNS).filter(models.ReviewItem.cycle_id == cycle_id)
     
     if status:
         query = query.filter(models.ReviewItem.final_status == status)
@@ -73,40 +134,78 @@ def list_items(
     
     if user_id or application_id:
         # Join with Access to filter by user or app
-        query = query.join(models.Access)
+        query = query.join(models.Access, models.Access.id == models.ReviewItem.access_id)
         if user_id:
             query = query.filter(models.Access.user_id == user_id)
         if application_id:
             query = query.filter(models.Access.application_id == application_id)
             
-    return query.all()
+    return rows_response(_sorted(_outliers_only(query, outliers), sort).all())
 
-# Stage-specific "my items"
+@router.get("/items/export")
+def export_items(cycle_id: int, request: Request):
+    """Every item of a cycle as NDJSON, streamed for offline review and audit."""
+    fields = list(schemas.ReviewItemBase.model_fields)
+    session_factory = read_sessionmaker(request)
+
+    def rows():
+        # Own session: the generator outlives the request's dependencies.
+        db = session_factory()
+        try:
+            cycle = db.query(models.ReviewCycle).filter(models.ReviewCycle.id == cycle_id).first()
+            if cycle and cycle.status == "archived":
+                for r in ArchiveService.get_items(db, cycle_id):
+                    yield {k: r.get(k) for k in fields}
+                return
+            query = (
+                db.query(*ITEM_COLUMNS)
+                .filter(models.ReviewItem.cycle_id == cycle_id)
+                .order_by(models.ReviewItem.id)
+                .yield_per(1000)
+            )
+            for row in query:
+                yield dict(zip(fields, row))
+        finally:
+            db.close()
+
+    return StreamingResponse(ndjson_chunks(rows()), media_type="application/x-ndjson")
+
+# Stage-specific "my items": the user's own plus those of approvers they stand in for
 @router.get("/app-manager/items", response_model=list[schemas.ReviewItemBase])
-def am_items(cycle_id: int, user_id: int, db: Session = Depends(get_db)):
-    return db.query(models.ReviewItem).filter(
+def am_items(cycle_id: int, user_id: int, sort: str = None, outliers: bool = False, db: Session = Depends(get_read_db)):
+    approvers = DelegationService.principals(user_id, "app_manager")
+    return rows_response(_sorted(_outliers_only(db.query(*ITEM_COLUMNS), outliers).filter(
         models.ReviewItem.cycle_id == cycle_id,
-        models.ReviewItem.app_manager_id == user_id,
+        models.ReviewItem.app_manager_id.in_(approvers),
         models.ReviewItem.pending_stage == "app_manager",
-    ).all()
+    ), sort).all())
 
 @router.get("/app-owner/items", response_model=list[schemas.ReviewItemBase])
-def ao_items(cycle_id: int, user_id: int, db: Session = Depends(get_db)):
-    return db.query(models.ReviewItem).filter(
+def ao_items(cycle_id: int, user_id: int, sort: str = None, outliers: bool = False, db: Session = Depends(get_read_db)):
+    approvers = DelegationService.principals(user_id, "app_owner")
+    return rows_response(_sorted(_outliers_only(db.query(*ITEM_COLUMNS), outliers).filter(
         models.ReviewItem.cycle_id == cycle_id,
-        models.ReviewItem.app_owner_id == user_id,
+        models.ReviewItem.app_owner_id.in_(approvers),
         models.ReviewItem.pending_stage == "app_owner",
-    ).all()
+    ), sort).all())
 
 @router.get("/business-owner/items", response_model=list[schemas.ReviewItemBase])
-def bo_items(cycle_id: int, user_id: int, db: Session = Depends(get_db)):
-    return db.query(models.ReviewItem).filter(
+def bo_items(cycle_id: int, user_id: int, sort: str = None, outliers: bool = False, db: Session = Depends(get_read_db)):
+    approvers = DelegationService.principals(user_id, "business_owner")
+    return rows_response(_sorted(_outliers_only(db.query(*ITEM_COLUMNS), outliers).filter(
         models.ReviewItem.cycle_id == cycle_id,
-        models.ReviewItem.business_owner_id == user_id,
+        models.ReviewItem.business_owner_id.in_(approvers),
         models.ReviewItem.pending_stage == "business_owner",
-    ).all()
+    ), sort).all())
 
 # Stage actions
+def _record_decision(db: Session, item: models.ReviewItem, stage: str, payload: schemas.StageActionInput):
+    record_change(
+        db, "review_decision", "decision", item.id,
+        cycle_id=item.cycle_id, access_id=item.access_id, stage=stage, action=payload.action,
+        pending_stage=item.pending_stage, final_status=item.final_status, actor_user_id=payload.actor_user_id,
+    )
+
 def _next_stage_after_am(item: models.ReviewItem):
     if item.app_owner_id:
         return "app_owner"
@@ -126,7 +225,7 @@ def app_manager_action(payload: schemas.StageActionInput, db: Session = Depends(
         raise HTTPException(404, "Review item not found")
     if item.pending_stage != "app_manager":
         raise HTTPException(400, "Item is not at app_manager stage")
-    if item.app_manager_id != payload.actor_user_id:
+    if not DelegationService.can_act(db, payload.actor_user_id, "app_manager", item.app_manager_id):
         raise HTTPException(403, "Not authorized")
 
     item.application_manager_action = payload.action
@@ -149,8 +248,10 @@ def app_manager_action(payload: schemas.StageActionInput, db: Session = Depends(
         stage="app_manager",
         action=payload.action,
         comment=payload.comment,
+        actor_user_id=payload.actor_user_id,
     )
     db.add(hist)
+    _record_decision(db, item, "app_manager", payload)
     db.commit()
     return {"message": "App manager action recorded"}
 
@@ -161,7 +262,7 @@ def app_owner_action(payload: schemas.StageActionInput, db: Session = Depends(ge
         raise HTTPException(404, "Review item not found")
     if item.pending_stage != "app_owner":
         raise HTTPException(400, "Item is not at app_owner stage")
-    if item.app_owner_id != payload.actor_user_id:
+    if not DelegationService.can_act(db, payload.actor_user_id, "app_owner", item.app_owner_id):
         raise HTTPException(403, "Not authorized")
 
     item.application_owner_action = payload.action
@@ -184,8 +285,10 @@ def app_owner_action(payload: schemas.StageActionInput, db: Session = Depends(ge
         stage="app_owner",
         action=payload.action,
         comment=payload.comment,
+        actor_user_id=payload.actor_user_id,
     )
     db.add(hist)
+    _record_decision(db, item, "app_owner", payload)
     db.commit()
     return {"message": "App owner action recorded"}
 
@@ -196,7 +299,7 @@ def business_owner_action(payload: schemas.StageActionInput, db: Session = Depen
         raise HTTPException(404, "Review item not found")
     if item.pending_stage != "business_owner":
         raise HTTPException(400, "Item is not at business_owner stage")
-    if item.business_owner_id != payload.actor_user_id:
+    if not DelegationService.can_act(db, payload.actor_user_id, "business_owner", item.business_owner_id):
         raise HTTPException(403, "Not authorized")
 
     item.business_owner_action = payload.action
@@ -211,7 +314,9 @@ def business_owner_action(payload: schemas.StageActionInput, db: Session = Depen
         stage="business_owner",
         action=payload.action,
         comment=payload.comment,
+        actor_user_id=payload.actor_user_id,
     )
     db.add(hist)
+    _record_decision(db, item, "business_owner", payload)
     db.commit()
     return {"message": "Business owner final action recorded"}
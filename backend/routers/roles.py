@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
 from backend.services.role_service import RoleService
+from backend.utils.http_cache import cached_collection
+from backend.utils.responses import models_response
 
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
@@ -11,5 +13,7 @@ def create_role(role: schemas.RoleCreate, db: Session = Depends(get_db)):
     return RoleService.create_role(db, role)
 
 @router.get("/", response_model=list[schemas.Role])
-def list_roles(db: Session = Depends(get_db)):
-    return RoleService.list_roles(db)
+def list_roles(request: Request, db: Session = Depends(get_read_db)):
+    return cached_collection(request, db, "roles", lambda db: models_response(
+        schemas.Role, RoleService.list_roles(db)
+    ).body)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from backend.db.database import get_db, get_read_db
+from backend.db import schemas
+from backend.services.sod_service import SodService
+
+router = APIRouter(prefix="/sod", tags=["Segregation of Duties"])
+
+@router.post("/rules", response_model=schemas.SodRule)
+def create_rule(rule: schemas.SodRuleCreate, db: Session = Depends(get_db)):
+    return SodService.create_rule(db, rule)
+
+@router.get("/rules", response_model=list[schemas.SodRule])
+def list_rules(db: Session = Depends(get_read_db)):
+    return SodService.list_rules(db)
+
+@router.post("/evaluate")
+def evaluate_rules(db: Session = Depends(get_db)):
+    return SodService.evaluate_rules(db)
+
+@router.get("/violations", response_model=list[schemas.SodViolation])
+def list_violations(rule_id: int = None, user_id: int = None, db: Session = Depends(get_read_db)):
+    return SodService.list_violations(db, rule_id, user_id)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
+from backend.services.change_feed import record_change
+from backend.services.sod_service import SodService
 
 router = APIRouter(prefix="/user-roles", tags=["User Roles"])
 
@@ -22,14 +24,17 @@ def assign_role(ur: schemas.UserRoleCreate, db: Session = Depends(get_db)):
 
     db_ur = models.UserRole(user_id=ur.user_id, role_id=ur.role_id)
     db.add(db_ur)
+    db.flush()
+    record_change(db, "user_role", "assign", db_ur.id, user_id=db_ur.user_id, role_id=db_ur.role_id)
+    SodService.evaluate_user(db, db_ur.user_id)
     db.commit()
     db.refresh(db_ur)
     return db_ur
 
 @router.get("/by-user/{user_id}", response_model=list[schemas.UserRole])
-def list_user_roles(user_id: int, db: Session = Depends(get_db)):
+def list_user_roles(user_id: int, db: Session = Depends(get_read_db)):
     return db.query(models.UserRole).filter(models.UserRole.user_id == user_id).all()
 
 @router.get("/by-role/{role_id}", response_model=list[schemas.UserRole])
-def list_users_by_role(role_id: int, db: Session = Depends(get_db)):
+def list_users_by_role(role_id: int, db: Session = Depends(get_read_db)):
     return db.query(models.UserRole).filter(models.UserRole.role_id == role_id).all()
@@ -1,8 +1,10 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.db import models, schemas
 from backend.services.user_service import UserService
+from backend.utils.responses import rows_response, schema_columns
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -11,8 +13,10 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     return UserService.create_user(db, user)
 
 @router.get("/", response_model=list[schemas.User])
-def list_users(application_id: int = None, db: Session = Depends(get_db)):
-    return UserService.list_users(db, application_id)
+def list_users(application_id: int = None, as_of: datetime = None, db: Session = Depends(get_read_db)):
+    """With ``as_of``, the users who held a grant (of ``application_id``) at that time."""
+    columns = schema_columns(models.User, schemas.User)
+    return rows_response(UserService.list_users(db, application_id, columns, as_of))
 
 @router.put("/{user_id}", response_model=schemas.User)
 def update_user(user_id: int, user_update: schemas.UserUpdate, db: Session = Depends(get_db)):
@@ -6,6 +6,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.db.database import SessionLocal, engine, Base
 from backend.db import models
+from backend.services.access_history import backfill_versions
 from sqlalchemy.orm import Session
 
 def seed_data():
@@ -148,6 +149,8 @@ def seed_data():
             else:
                 print(f"Skipping access for {u_data['name']}: App or Role not found.")
 
+        db.flush()
+        backfill_versions(db.connection())
         db.commit()
         print("Seeding complete.")
 
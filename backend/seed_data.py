@@ -1,10 +1,10 @@
-from backend.db.database import Base, engine, SessionLocal
-from backend.db import models
+from backend.db.database import SessionLocal
+from backend.db import models, migrations
+from backend.services.access_history import backfill_versions
 
 def seed_data():
     print("Recreating tables...")
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    migrations.reset()
     
     db = SessionLocal()
     try:
@@ -37,6 +37,8 @@ def seed_data():
         
         print("Seeding access...")
         db.add(models.Access(user_id=user1.id, application_id=app.id, active=True))
+        db.flush()
+        backfill_versions(db.connection())
         db.commit()
         
         print("Data seeded successfully.")
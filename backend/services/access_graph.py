@@ -0,0 +1,282 @@
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.db import models
+from backend.utils.columnar import fetch_columns
+
+APPROVER_STAGES = {
+    "app_manager": models.AppManagerMap,
+    "app_owner": models.AppOwnerMap,
+    "business_owner": models.BusinessOwnerMap,
+}
+# collection_version names bumped by the approver mapping writes
+_APPROVER_COLLECTIONS = [f"{stage}_map" for stage in APPROVER_STAGES]
+_BATCH = 5000
+
+
+class _Adjacency:
+    """CSR adjacency over integer ids plus a small add/remove overlay.
+
+    Node ids are database primary keys, which are dense enough to index the
+    offsets array directly. The base is built from numpy columns of sources
+    and targets: ``np.unique`` over ``source * width + target`` sorts the
+    edges and drops duplicates in one pass, and a ``bincount`` gives the
+    offsets. Targets are sorted per source so membership is a binary search.
+    Writes land in the overlay and are folded into a fresh CSR once the
+    overlay grows past a fraction of the base.
+    """
+
+    def __init__(self, sources=(), targets=()):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        size = 1
+        if len(sources):
+            width = int(targets.max()) + 1
+            sources, targets = np.divmod(np.unique(sources * width + targets), width)
+            size = int(sources[-1]) + 2
+        self.offsets = np.cumsum(np.bincount(sources + 1, minlength=size))
+        self.targets = targets
+        self.added: dict[int, set] = {}
+        self.removed: dict[int, set] = {}
+        self.delta = 0
+
+    @classmethod
+    def from_edges(cls, edges) -> "_Adjacency":
+        pairs = np.fromiter(edges, dtype=[("src", np.int64), ("dst", np.int64)])
+        return cls(pairs["src"], pairs["dst"])
+
+    def _base(self, src: int):
+        if src + 1 >= len(self.offsets):
+            return self.targets[0:0]
+        return self.targets[self.offsets[src]:self.offsets[src + 1]]
+
+    def _in_base(self, src: int, dst: int) -> bool:
+        row = self._base(src)
+        i = int(np.searchsorted(row, dst))
+        return i < len(row) and row[i] == dst
+
+    def neighbours(self, src: int) -> list[int]:
+        row = self._base(src)
+        removed = self.removed.get(src)
+        added = self.added.get(src)
+        if not removed and not added:
+            return row.tolist()
+        result = set(row.tolist())
+        if removed:
+            result -= removed
+        if added:
+            result |= added
+        return sorted(result)
+
+    def add(self, src: int, dst: int) -> bool:
+        if dst in self.removed.get(src, ()):
+            self.removed[src].discard(dst)
+        elif not self._in_base(src, dst) and dst not in self.added.get(src, ()):
+            self.added.setdefault(src, set()).add(dst)
+        else:
+            return False
+        self.delta += 1
+        return True
+
+    def remove(self, src: int, dst: int) -> bool:
+        if dst in self.added.get(src, ()):
+            self.added[src].discard(dst)
+        elif self._in_base(src, dst) and dst not in self.removed.get(src, ()):
+            self.removed.setdefault(src, set()).add(dst)
+        else:
+            return False
+        self.delta += 1
+        return True
+
+    def edges(self):
+        for src in range(len(self.offsets) - 1):
+            for dst in self.neighbours(src):
+                yield src, dst
+        for src in self.added:
+            if src + 1 >= len(self.offsets):
+                for dst in self.added[src]:
+                    yield src, dst
+
+    def needs_compaction(self) -> bool:
+        return self.delta > max(1024, len(self.targets) // 8)
+
+    def compacted(self) -> "_Adjacency":
+        return _Adjacency.from_edges(self.edges())
+
+    def __len__(self):
+        return len(self.targets) + sum(map(len, self.added.values())) - sum(map(len, self.removed.values()))
+
+
+class AccessGraph:
+    """Versioned in-process snapshot of who can reach what.
+
+    Loaded lazily on first lookup and kept current by the write paths in the
+    services. Each worker process holds its own copy, so lookups also catch
+    up on other workers' writes, at most every ``sync_seconds``: grants
+    from the change feed past the last ``seq`` seen (only the user/app pairs
+    it names are re-read), approvers by reloading them when their
+    collection versions moved.
+    """
+
+    def __init__(self, sync_seconds: float):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.sync_seconds = sync_seconds
+        self._synced_at = float("-inf")
+        self._seq = 0
+        self._approver_version = 0
+        self.version = 0
+        self.built_at = None
+        self.user_apps = _Adjacency()
+        self.app_users = _Adjacency()
+        self.approvers = {stage: _Adjacency() for stage in APPROVER_STAGES}
+
+    @staticmethod
+    def _stamp(db: Session) -> tuple[int, int]:
+        """(last change_event seq, sum of the approver map versions): one cheap query."""
+        versions = models.CollectionVersion
+        return tuple(db.query(
+            select(func.coalesce(func.max(models.ChangeEvent.seq), 0)).scalar_subquery(),
+            select(func.coalesce(func.sum(versions.version), 0))
+            .where(versions.name.in_(_APPROVER_COLLECTIONS)).scalar_subquery(),
+        ).one())
+
+    def _load_approvers(self, db: Session):
+        self.approvers = {
+            stage: _Adjacency(*fetch_columns(db, select(model.app_id, model.user_id), (np.int64, np.int64)))
+            for stage, model in APPROVER_STAGES.items()
+        }
+
+    def load(self, db: Session):
+        # Built under the lock so a write hook arriving mid-build is applied
+        # to the new snapshot instead of being overwritten by it. The stamp
+        # is read first: a write racing the reads is replayed by the next sync.
+        with self._lock:
+            self._seq, self._approver_version = self._stamp(db)
+            user_ids, app_ids = fetch_columns(
+                db,
+                select(models.Access.user_id, models.Access.application_id).where(models.Access.active == True),
+                (np.int64, np.int64),
+            )
+            self.user_apps = _Adjacency(user_ids, app_ids)
+            self.app_users = _Adjacency(app_ids, user_ids)
+            self._load_approvers(db)
+            self.version += 1
+            self.built_at = datetime.utcnow()
+            self._synced_at = time.monotonic()
+            self._loaded = True
+
+    def _sync(self, db: Session):
+        with self._lock:
+            seq, approver_version = self._stamp(db)
+            if approver_version != self._approver_version:
+                self._load_approvers(db)
+                self._approver_version = approver_version
+                self.version += 1
+            if seq != self._seq:
+                payloads = [p for (p,) in db.query(models.ChangeEvent.payload).filter(
+                    models.ChangeEvent.seq > self._seq,
+                    models.ChangeEvent.seq <= seq,
+                    models.ChangeEvent.entity == "access",
+                )]
+                if len(payloads) > max(1024, len(self.user_apps) // 8):
+                    return self.load(db)
+                pairs = {(p["user_id"], p["application_id"]) for p in payloads}
+                users = sorted({user_id for user_id, _ in pairs})
+                active = set()
+                for i in range(0, len(users), _BATCH):
+                    active.update(tuple(row) for row in db.query(
+                        models.Access.user_id, models.Access.application_id
+                    ).filter(
+                        models.Access.user_id.in_(users[i:i + _BATCH]),
+                        models.Access.active == True,
+                    ).distinct())
+                for pair in pairs:
+                    self.set_grant(*pair, pair in active)
+                self._seq = seq
+            self._synced_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        if not self._loaded:
+            self.load(db)
+        elif time.monotonic() - self._synced_at > self.sync_seconds:
+            self._sync(db)
+
+    def invalidate(self):
+        """Drop the snapshot; the next lookup reloads it. Used after bulk writes."""
+        with self._lock:
+            self._loaded = False
+
+    def _compact(self):
+        if self.user_apps.needs_compaction():
+            self.user_apps = self.user_apps.compacted()
+            self.app_users = self.app_users.compacted()
+
+    # Write hooks
+    def set_grant(self, user_id: int, application_id: int, active: bool):
+        with self._lock:
+            if not self._loaded:
+                return
+            if active:
+                changed = self.user_apps.add(user_id, application_id)
+                self.app_users.add(application_id, user_id)
+            else:
+                changed = self.user_apps.remove(user_id, application_id)
+                self.app_users.remove(application_id, user_id)
+            if changed:
+                self.version += 1
+                self._compact()
+
+    def refresh_grant(self, db: Session, user_id: int, application_id: int):
+        """Re-read one user/app pair; a pair may be backed by several Access rows."""
+        if not self._loaded:
+            return
+        active = db.query(models.Access.id).filter(
+            models.Access.user_id == user_id,
+            models.Access.application_id == application_id,
+            models.Access.active == True,
+        ).first() is not None
+        self.set_grant(user_id, application_id, active)
+
+    def add_approver(self, stage: str, application_id: int, user_id: int):
+        with self._lock:
+            if not self._loaded:
+                return
+            adjacency = self.approvers[stage]
+            if adjacency.add(application_id, user_id):
+                self.version += 1
+                if adjacency.needs_compaction():
+                    self.approvers[stage] = adjacency.compacted()
+
+    # Lookups
+    def applications_for_user(self, db: Session, user_id: int) -> list[int]:
+        self.ensure_loaded(db)
+        with self._lock:
+            return self.user_apps.neighbours(user_id)
+
+    def users_for_application(self, db: Session, application_id: int) -> list[int]:
+        self.ensure_loaded(db)
+        with self._lock:
+            return self.app_users.neighbours(application_id)
+
+    def approvers_for_application(self, db: Session, application_id: int) -> dict[str, list[int]]:
+        self.ensure_loaded(db)
+        with self._lock:
+            return {stage: adj.neighbours(application_id) for stage, adj in self.approvers.items()}
+
+    def stats(self, db: Session) -> dict:
+        self.ensure_loaded(db)
+        with self._lock:
+            return {
+                "version": self.version,
+                "built_at": self.built_at,
+                "grants": len(self.user_apps),
+                "approvers": {stage: len(adj) for stage, adj in self.approvers.items()},
+            }
+
+
+access_graph = AccessGraph(settings.ACCESS_GRAPH_SYNC_SECONDS)
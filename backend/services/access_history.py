@@ -0,0 +1,63 @@
+"""Validity intervals of grants, for point-in-time ("as of") queries.
+
+``access`` only holds the current state: revoking flips ``active`` in
+place. Write paths therefore also call ``record_versions`` in their
+transaction, which closes the grant's open ``access_version`` row and, when
+the grant is active afterwards, opens a new one. The versions of a grant
+tile the time it was active, so "who had access at T" is a lookup of the
+rows with ``valid_from <= T < valid_to``.
+
+Open versions end at ``OPEN`` rather than NULL, which keeps that predicate
+a single index range (``valid_to > T``) instead of an OR.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import and_, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+from backend.db import models
+
+OPEN = datetime(9999, 12, 31)
+
+
+def record_versions(db: Session, grants, active: bool, at: datetime = None):
+    """Record that ``grants`` (rows or models with id, user_id,
+    application_id and created_at) became active or inactive at ``at``."""
+    if not grants:
+        return
+    at = at or datetime.utcnow()
+    db.query(models.AccessVersion).filter(
+        models.AccessVersion.access_id.in_([g.id for g in grants]),
+        models.AccessVersion.valid_to == OPEN,
+    ).update({models.AccessVersion.valid_to: at}, synchronize_session=False)
+    if active:
+        db.execute(insert(models.AccessVersion), [
+            {"access_id": g.id, "user_id": g.user_id, "application_id": g.application_id,
+             "granted_at": g.created_at, "valid_from": at, "valid_to": OPEN}
+            for g in grants
+        ])
+
+
+def _utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC, like datetime.utcnow().
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def valid_at(as_of: datetime):
+    """Filter for the versions active at ``as_of`` (naive means UTC)."""
+    as_of = _utc(as_of)
+    return and_(models.AccessVersion.valid_to > as_of, models.AccessVersion.valid_from <= as_of)
+
+
+def backfill_versions(conn) -> int:
+    """Open a version, from its creation, for every active grant without one.
+
+    Revoked grants get none: ``access`` does not say when they stopped, so
+    their history starts with the next change.
+    """
+    versions = models.AccessVersion.__table__
+    access = models.Access.__table__
+    since = func.coalesce(access.c.created_at, literal(datetime.utcnow()))
+    return conn.execute(insert(versions).from_select(
+        ["access_id", "user_id", "application_id", "granted_at", "valid_from", "valid_to"],
+        select(access.c.id, access.c.user_id, access.c.application_id, access.c.created_at, since, literal(OPEN))
+        .where(access.c.active == True, ~exists().where(versions.c.access_id == access.c.id)),
+    )).rowcount
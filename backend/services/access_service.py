@@ -1,6 +1,13 @@
+from sqlalchemy import exists, insert, literal
 from sqlalchemy.orm import Session
 from datetime import datetime
 from backend.db import models, schemas
+from backend.services.access_graph import access_graph
+from backend.services.access_history import record_versions, valid_at
+from backend.services.change_feed import access_payload, record_change, record_changes
+from backend.services.findings_service import FindingsService
+from backend.services.peer_outlier_service import PeerOutlierService
+from backend.services.sod_service import SodService
 from fastapi import HTTPException
 
 class AccessService:
@@ -20,19 +27,51 @@ class AccessService:
             created_at=datetime.utcnow(),
         )
         db.add(db_access)
+        db.flush()
+        record_change(db, "access", "create", db_access.id, **access_payload(db_access))
+        record_versions(db, [db_access], True)
+        FindingsService.update_grants(db, [db_access.id])
+        SodService.evaluate_user(db, db_access.user_id)
         db.commit()
         db.refresh(db_access)
+        access_graph.set_grant(db_access.user_id, db_access.application_id, True)
+        PeerOutlierService.update_grant(db, db_access.user_id, db_access.application_id)
         return db_access
 
     @staticmethod
-    def list_access(db: Session, user_id: int = None, application_id: int = None):
-        query = db.query(models.Access)
+    def list_access(db: Session, user_id: int = None, application_id: int = None, columns=None, as_of: datetime = None):
+        if as_of:
+            return AccessService._list_access_as_of(db, as_of, user_id, application_id, columns)
+        query = db.query(*columns) if columns else db.query(models.Access)
         if user_id:
             query = query.filter(models.Access.user_id == user_id)
         if application_id:
             query = query.filter(models.Access.application_id == application_id)
         return query.all()
 
+    @staticmethod
+    def _list_access_as_of(db: Session, as_of: datetime, user_id: int = None, application_id: int = None, columns=None):
+        """Grants active at ``as_of``, read from their versions with one range
+        scan of an interval index; ``columns`` name the access fields wanted."""
+        version = models.AccessVersion
+        fields = {
+            "id": version.access_id,
+            "user_id": version.user_id,
+            "application_id": version.application_id,
+            "active": literal(True),
+            "created_at": version.granted_at,
+        }
+        names = [c.key for c in columns] if columns else list(fields)
+        # Deleted users' versions are kept but not listed, as in
+        # UserService.list_users, which can no longer name them.
+        query = db.query(*(fields[name].label(name) for name in names)).filter(
+            valid_at(as_of), exists().where(models.User.id == version.user_id))
+        if user_id:
+            query = query.filter(version.user_id == user_id)
+        if application_id:
+            query = query.filter(version.application_id == application_id)
+        return query.all()
+
     @staticmethod
     def get_access(db: Session, access_id: int):
         return db.query(models.Access).filter(models.Access.id == access_id).first()
@@ -43,19 +82,94 @@ class AccessService:
         if not access:
             raise HTTPException(404, "Access not found")
         
+        # Already revoked: nothing changes, so no event or new interval.
+        if not access.active:
+            return {"message": "Access revoked"}
+        record_versions(db, [access], False)
         access.active = False
+        record_change(db, "access", "revoke", access.id, **access_payload(access))
+        FindingsService.update_grants(db, [access.id])
+        SodService.evaluate_user(db, access.user_id)
         db.commit()
+        access_graph.refresh_grant(db, access.user_id, access.application_id)
+        PeerOutlierService.update_grant(db, access.user_id, access.application_id)
         return {"message": "Access revoked"}
 
+    @staticmethod
+    def bulk_revoke(db: Session, access_ids: list[int]) -> int:
+        """Deactivate many grants with one UPDATE. The caller owns the commit."""
+        return AccessService._bulk_set_active(db, access_ids, False, "revoke")
+
+    @staticmethod
+    def bulk_restore(db: Session, access_ids: list[int]) -> int:
+        """Reactivate many revoked grants with one UPDATE. The caller owns the commit."""
+        return AccessService._bulk_set_active(db, access_ids, True, "modify")
+
+    @staticmethod
+    def _bulk_set_active(db: Session, access_ids: list[int], active: bool, op: str) -> int:
+        if not access_ids:
+            return 0
+        targets = db.query(
+            models.Access.id, models.Access.user_id, models.Access.application_id, models.Access.created_at
+        ).filter(
+            models.Access.id.in_(access_ids),
+            models.Access.active == (not active),
+        ).all()
+        if not targets:
+            return 0
+        db.query(models.Access).filter(models.Access.id.in_([t.id for t in targets])).update(
+            {models.Access.active: active}, synchronize_session=False
+        )
+        record_changes(db, "access", op, [
+            {"entity_id": t.id, "user_id": t.user_id, "application_id": t.application_id, "active": active}
+            for t in targets
+        ])
+        record_versions(db, targets, active)
+        return len(targets)
+
+    @staticmethod
+    def bulk_grant(db: Session, application_id: int, user_ids: list[int]) -> int:
+        """Insert active grants for users with no row for the application yet.
+        One SELECT and one multi-row INSERT; the caller owns the commit."""
+        if not user_ids:
+            return 0
+        existing = {u for (u,) in db.query(models.Access.user_id).filter(
+            models.Access.application_id == application_id,
+            models.Access.user_id.in_(user_ids),
+        )}
+        new_ids = sorted(set(user_ids) - existing)
+        if not new_ids:
+            return 0
+        now = datetime.utcnow()
+        inserted = db.execute(
+            insert(models.Access).returning(
+                models.Access.id, models.Access.user_id, models.Access.application_id, models.Access.created_at,
+                sort_by_parameter_order=True,
+            ),
+            [{"user_id": u, "application_id": application_id, "active": True, "created_at": now} for u in new_ids],
+        ).all()
+        record_changes(db, "access", "create", [
+            {"entity_id": row.id, "user_id": row.user_id, "application_id": application_id, "active": True}
+            for row in inserted
+        ])
+        record_versions(db, inserted, True, at=now)
+        return len(inserted)
+
     @staticmethod
     def modify_access(db: Session, access_id: int, access_update: schemas.AccessUpdate):
         access = AccessService.get_access(db, access_id)
         if not access:
             raise HTTPException(404, "Access not found")
         
-        if access_update.active is not None:
+        if access_update.active is not None and bool(access.active) != access_update.active:
+            record_versions(db, [access], access_update.active)
             access.active = access_update.active
-            
+            record_change(db, "access", "modify", access.id, **access_payload(access))
+            FindingsService.update_grants(db, [access.id])
+            SodService.evaluate_user(db, access.user_id)
+
         db.commit()
         db.refresh(access)
+        access_graph.refresh_grant(db, access.user_id, access.application_id)
+        PeerOutlierService.update_grant(db, access.user_id, access.application_id)
         return access
@@ -1,11 +1,13 @@
 from sqlalchemy.orm import Session
 from backend.db import models, schemas
+from backend.utils.http_cache import collection_versions
 
 class ApplicationService:
     @staticmethod
     def create_application(db: Session, app: schemas.ApplicationCreate):
         db_app = models.Application(**app.model_dump())
         db.add(db_app)
+        collection_versions.bump(db, "applications")
         db.commit()
         db.refresh(db_app)
         return db_app
@@ -0,0 +1,220 @@
+import json
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterator
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from backend.config import settings
+from backend.db import models
+
+ITEM_COLUMNS = [c.name for c in models.ReviewItem.__table__.columns]
+HISTORY_COLUMNS = [c.name for c in models.ApprovalHistory.__table__.columns]
+# Access columns are snapshotted with each item so the user/app filters keep
+# working after the grant itself changes.
+ITEM_ARCHIVE_COLUMNS = ITEM_COLUMNS + ["user_id", "application_id"]
+
+# Archived cycles are immutable, so decoded rows can be kept per process:
+# as plain row lists, and only up to ARCHIVE_CACHE_ITEMS items in total. A
+# cycle larger than that is decoded for each request instead.
+_decoded_items: "OrderedDict[int, tuple[list[str], list[list]]]" = OrderedDict()
+_BATCH = 5000
+
+
+def _pack(columns, rows) -> bytes:
+    body = {
+        "columns": columns,
+        "rows": [
+            [v.isoformat() if isinstance(v, datetime) else v for v in row]
+            for row in rows
+        ],
+    }
+    return zlib.compress(json.dumps(body, separators=(",", ":")).encode(), 6)
+
+
+def _decode(blob: bytes) -> tuple[list[str], list[list]]:
+    body = json.loads(zlib.decompress(blob))
+    return body["columns"], body["rows"]
+
+
+def _unpack(blob: bytes) -> list[dict]:
+    columns, rows = _decode(blob)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _archived_items(db: Session, cycle_id: int) -> tuple[list[str], list[list]]:
+    if cycle_id in _decoded_items:
+        _decoded_items.move_to_end(cycle_id)
+        return _decoded_items[cycle_id]
+
+    blob = db.query(models.ReviewCycleArchive.items).filter(
+        models.ReviewCycleArchive.cycle_id == cycle_id
+    ).scalar()
+    if blob is None:
+        raise HTTPException(404, "Review cycle archive not found")
+
+    decoded = _decode(blob)
+    if len(decoded[1]) <= settings.ARCHIVE_CACHE_ITEMS:
+        _decoded_items[cycle_id] = decoded
+        while sum(len(rows) for _, rows in _decoded_items.values()) > settings.ARCHIVE_CACHE_ITEMS:
+            _decoded_items.popitem(last=False)
+    return decoded
+
+
+def record_decisions(conn, cycle_id: int, items) -> None:
+    """Fold one cycle's decisions into ``archived_decision``.
+
+    ``conn`` is a Session or Connection and ``items`` are mappings with
+    access_id, user_id and final_status. Cycles may be archived in any
+    order; the latest cycle's decision wins and revocations add up.
+    """
+    table = models.ArchivedDecision.__table__
+    items = list(items)
+    for start in range(0, len(items), _BATCH):
+        batch = items[start:start + _BATCH]
+        known = {row.access_id: dict(row._mapping) for row in conn.execute(
+            select(table).where(table.c.access_id.in_({item["access_id"] for item in batch}))
+        )}
+        merged = {}
+        for item in batch:
+            access_id = item["access_id"]
+            row = merged.get(access_id) or known.get(access_id)
+            if row is None:
+                row = {"access_id": access_id, "user_id": item["user_id"], "cycle_id": cycle_id,
+                       "final_status": item["final_status"], "revocations": 0}
+            elif cycle_id >= row["cycle_id"]:
+                row.update(cycle_id=cycle_id, final_status=item["final_status"],
+                           user_id=item["user_id"] or row["user_id"])
+            row["revocations"] += item["final_status"] in models.REVOKED_STATUSES
+            merged[access_id] = row
+
+        new = [row for access_id, row in merged.items() if access_id not in known]
+        if new:
+            conn.execute(insert(table), new)
+        changed = [{f"b_{k}": v for k, v in row.items()} for access_id, row in merged.items() if access_id in known]
+        if changed:
+            conn.execute(
+                update(table).where(table.c.access_id == bindparam("b_access_id")).values(
+                    {c: bindparam(f"b_{c}") for c in ("user_id", "cycle_id", "final_status", "revocations")}
+                ),
+                changed,
+            )
+
+
+def backfill_decisions(conn) -> int:
+    """Summarize cycles archived before ``archived_decision`` existed; once only."""
+    table = models.ArchivedDecision.__table__
+    if conn.execute(select(func.count()).select_from(table)).scalar():
+        return 0
+    archives = models.ReviewCycleArchive.__table__
+    cycle_ids = [c for (c,) in conn.execute(select(archives.c.cycle_id).order_by(archives.c.cycle_id))]
+    for cycle_id in cycle_ids:
+        blob = conn.execute(select(archives.c.items).where(archives.c.cycle_id == cycle_id)).scalar()
+        record_decisions(conn, cycle_id, _unpack(blob))
+    return len(cycle_ids)
+
+
+class ArchiveService:
+    @staticmethod
+    def archive_cycle(db: Session, cycle_id: int):
+        cycle = db.query(models.ReviewCycle).filter(models.ReviewCycle.id == cycle_id).first()
+        if not cycle:
+            raise HTTPException(404, "Review cycle not found")
+        if cycle.status == "archived":
+            raise HTTPException(400, "Review cycle already archived")
+
+        pending = db.query(func.count(models.ReviewItem.id)).filter(
+            models.ReviewItem.cycle_id == cycle_id,
+            models.ReviewItem.pending_stage != "completed",
+        ).scalar()
+        if pending:
+            raise HTTPException(400, f"Review cycle has {pending} pending items")
+        # Revocations are executed from live items only; archiving first
+        # would leave the grants in place for good.
+        unexecuted = db.query(func.count(models.ReviewItem.id)).filter(
+            models.ReviewItem.cycle_id == cycle_id,
+            models.ReviewItem.final_status.in_(models.REVOKED_STATUSES),
+            models.ReviewItem.fulfillment_status.is_(None),
+        ).scalar()
+        if unexecuted:
+            raise HTTPException(400, f"Review cycle has {unexecuted} revocations not yet executed")
+
+        item_ids = select(models.ReviewItem.id).where(models.ReviewItem.cycle_id == cycle_id)
+
+        items = (
+            db.query(*models.ReviewItem.__table__.columns, models.Access.user_id, models.Access.application_id)
+            .outerjoin(models.Access, models.Access.id == models.ReviewItem.access_id)
+            .filter(models.ReviewItem.cycle_id == cycle_id)
+            .order_by(models.ReviewItem.id)
+            .all()
+        )
+        history = (
+            db.query(*models.ApprovalHistory.__table__.columns)
+            .filter(models.ApprovalHistory.review_item_id.in_(item_ids))
+            .order_by(models.ApprovalHistory.id)
+            .all()
+        )
+
+        db.add(models.ReviewCycleArchive(
+            cycle_id=cycle_id,
+            item_count=len(items),
+            history_count=len(history),
+            items=_pack(ITEM_ARCHIVE_COLUMNS, items),
+            history=_pack(HISTORY_COLUMNS, history),
+        ))
+        record_decisions(db, cycle_id, [row._mapping for row in items])
+
+        db.query(models.ApprovalHistory).filter(
+            models.ApprovalHistory.review_item_id.in_(item_ids)
+        ).delete(synchronize_session=False)
+        db.query(models.ReviewItem).filter(
+            models.ReviewItem.cycle_id == cycle_id
+        ).delete(synchronize_session=False)
+
+        cycle.status = "archived"
+        db.commit()
+        return {
+            "message": "Review cycle archived",
+            "cycle_id": cycle_id,
+            "items": len(items),
+            "history": len(history),
+        }
+
+    @staticmethod
+    def get_items(db: Session, cycle_id: int) -> Iterator[dict]:
+        columns, rows = _archived_items(db, cycle_id)
+        return (dict(zip(columns, row)) for row in rows)
+
+    @staticmethod
+    def get_history(db: Session, cycle_id: int) -> list[dict]:
+        blob = db.query(models.ReviewCycleArchive.history).filter(
+            models.ReviewCycleArchive.cycle_id == cycle_id
+        ).scalar()
+        if blob is None:
+            raise HTTPException(404, "Review cycle archive not found")
+        return _unpack(blob)
+
+    @staticmethod
+    def list_items(
+        db: Session,
+        cycle_id: int,
+        status: str = None,
+        stage: str = None,
+        user_id: int = None,
+        application_id: int = None,
+        sort: str = None,
+    ) -> list[dict]:
+        columns, rows = _archived_items(db, cycle_id)
+        index = {name: i for i, name in enumerate(columns)}
+        # Filter the row lists; only the matches become dicts.
+        for name, value in (("final_status", status), ("pending_stage", stage),
+                            ("user_id", user_id), ("application_id", application_id)):
+            if value:
+                i = index[name]
+                rows = [r for r in rows if r[i] == value]
+        if sort == "risk" and "risk_score" in index:
+            # As on live cycles: riskiest first, unscored last, then by id.
+            score, item_id = index["risk_score"], index["id"]
+            rows = sorted(rows, key=lambda r: (r[score] is None, -(r[score] or 0), r[item_id]))
+        return [dict(zip(columns, row)) for row in rows]
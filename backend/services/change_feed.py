@@ -0,0 +1,83 @@
+"""Append-only change log of grants, role assignments and review decisions.
+
+Write paths call ``record_change`` (or ``record_changes``) inside their
+own transaction, before the commit, so an event exists exactly when the
+change it describes does. Consumers page through ``change_event`` by
+``seq`` and keep the last one they processed.
+
+On SQLite writers are serialized, so ``seq`` order is also commit order.
+With concurrent writers on a server database a lower ``seq`` can become
+visible after a higher one; consumers there should re-read a short window
+behind their cursor.
+"""
+from datetime import datetime
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from backend.db import models
+
+_COMMITTED = {"generation": 0}
+_NOTIFY_KEY = "change_feed_notify"
+
+
+def _notify(session):
+    session.info.pop(_NOTIFY_KEY, None)
+    _COMMITTED["generation"] += 1
+
+
+def _watch(db: Session):
+    if not db.info.get(_NOTIFY_KEY):
+        db.info[_NOTIFY_KEY] = True
+        event.listen(db, "after_commit", _notify, once=True)
+
+
+def generation() -> int:
+    """Bumped whenever this process commits change events; lets waiters skip idle polls."""
+    return _COMMITTED["generation"]
+
+
+def record_change(db: Session, entity: str, op: str, entity_id: int, **payload):
+    db.add(models.ChangeEvent(entity=entity, op=op, entity_id=entity_id, payload=payload,
+                              created_at=datetime.utcnow()))
+    _watch(db)
+
+
+def record_changes(db: Session, entity: str, op: str, rows: list[dict]):
+    """Many events in one INSERT; each row needs ``entity_id`` plus its payload fields."""
+    if not rows:
+        return
+    now = datetime.utcnow()
+    db.execute(insert(models.ChangeEvent), [
+        {"entity": entity, "op": op, "entity_id": row.pop("entity_id"), "payload": row, "created_at": now}
+        for row in rows
+    ])
+    _watch(db)
+
+
+def access_payload(access: models.Access) -> dict:
+    return {"user_id": access.user_id, "application_id": access.application_id, "active": bool(access.active)}
+
+
+class ChangeFeedService:
+    @staticmethod
+    def list_changes(db: Session, since: int = 0, limit: int = 1000, entity: str = None):
+        """Events after ``since`` in seq order, read straight off the primary key
+        (or the entity index): cost depends on the page, not on the log size."""
+        query = db.query(
+            models.ChangeEvent.seq,
+            models.ChangeEvent.entity,
+            models.ChangeEvent.entity_id,
+            models.ChangeEvent.op,
+            models.ChangeEvent.payload,
+            models.ChangeEvent.created_at,
+        ).filter(models.ChangeEvent.seq > since)
+        if entity:
+            query = query.filter(models.ChangeEvent.entity == entity)
+        rows = query.order_by(models.ChangeEvent.seq).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changes = [row._asdict() for row in rows]
+        return {
+            "changes": changes,
+            "next_since": changes[-1]["seq"] if changes else since,
+            "has_more": has_more,
+        }
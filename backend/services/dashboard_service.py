@@ -1,5 +1,12 @@
 from sqlalchemy.orm import Session
 from backend.db import models, schemas
+from backend.services.access_graph import access_graph
+from backend.services.access_history import record_versions
+from backend.services.change_feed import access_payload, record_change
+from backend.services.findings_service import FindingsService
+from backend.services.peer_outlier_service import PeerOutlierService
+from backend.services.sod_service import SodService
+from backend.utils.http_cache import collection_versions
 
 class DashboardService:
     @staticmethod
@@ -8,25 +15,39 @@ class DashboardService:
         # For simplicity, assuming UserRole is 1:1 or taking the first role found.
         # Returns a list of dicts matching the frontend AppManagerUser shape.
         
+        # Only the columns the response needs; hydrating four ORM entities per
+        # row dominated this endpoint on large tenants.
         results = (
-            db.query(models.User, models.Access, models.Application, models.Role)
+            db.query(
+                models.User.id,
+                models.User.name,
+                models.User.email,
+                models.Application.name,
+                models.Role.name,
+                models.Access.active,
+                models.PeerOutlier.frequency,
+            )
+            .select_from(models.User)
             .join(models.Access, models.Access.user_id == models.User.id)
             .join(models.Application, models.Access.application_id == models.Application.id)
             .outerjoin(models.UserRole, models.UserRole.user_id == models.User.id)
             .outerjoin(models.Role, models.UserRole.role_id == models.Role.id)
+            .outerjoin(models.PeerOutlier, models.PeerOutlier.access_id == models.Access.id)
             .filter(models.Access.active == True)
             .all()
         )
         
         dashboard_users = []
-        for user, access, app, role in results:
+        for user_id, name, email, app_name, role_name, active, peer_frequency in results:
             dashboard_users.append({
-                "id": str(user.id),
-                "name": user.name,
-                "email": user.email,
-                "application": app.name,
-                "role": role.name if role else "Viewer",
-                "status": "Active" if access.active else "Inactive",
+                "id": str(user_id),
+                "name": name,
+                "email": email,
+                "application": app_name,
+                "role": role_name or "Viewer",
+                "status": "Active" if active else "Inactive",
+                # Held by few users with the same roles (see /outliers/)
+                "peerOutlier": peer_frequency is not None,
                 "lastLogin": "2024-01-01", # Mocked for now
                 "avatarUrl": "" # Frontend generates this
             })
@@ -65,9 +86,18 @@ class DashboardService:
                 active=(data.status == "Active")
             )
             db.add(access)
+            db.flush()
+            record_change(db, "access", "create", access.id, **access_payload(access))
+            if access.active:
+                record_versions(db, [access], True)
+            FindingsService.update_grants(db, [access.id])
         else:
             # Update status
-            existing_access.active = (data.status == "Active")
+            if bool(existing_access.active) != (data.status == "Active"):
+                record_versions(db, [existing_access], data.status == "Active")
+                existing_access.active = (data.status == "Active")
+                record_change(db, "access", "modify", existing_access.id, **access_payload(existing_access))
+                FindingsService.update_grants(db, [existing_access.id])
         
         # 4. Handle Role (UserRole)
         # Find Role by name
@@ -77,6 +107,7 @@ class DashboardService:
             # Lets auto-create role for POC flexibility
             role = models.Role(name=data.role)
             db.add(role)
+            collection_versions.bump(db, "roles")
             db.commit()
             db.refresh(role)
         
@@ -85,7 +116,12 @@ class DashboardService:
         if not user_role:
             user_role = models.UserRole(user_id=user.id, role_id=role.id)
             db.add(user_role)
+            db.flush()
+            record_change(db, "user_role", "assign", user_role.id, user_id=user.id, role_id=role.id)
         
+        SodService.evaluate_user(db, user.id)
         db.commit()
+        access_graph.refresh_grant(db, user.id, app.id)
+        PeerOutlierService.update_grant(db, user.id, app.id)
         
         return {"message": "User onboarded successfully", "user_id": user.id}
@@ -0,0 +1,163 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from sqlalchemy import func, insert, literal, or_, select, union
+from sqlalchemy.orm import Session
+from backend.db import models, schemas
+
+STAGE_APPROVER = {
+    "app_manager": models.ReviewItem.app_manager_id,
+    "app_owner": models.ReviewItem.app_owner_id,
+    "business_owner": models.ReviewItem.business_owner_id,
+}
+# Longest delegate-of-a-delegate chain that is followed.
+MAX_CHAIN = 5
+
+
+def _utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC, like datetime.utcnow().
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _effective_rows(delegations, now: datetime) -> set[tuple]:
+    """(user_id, stage, approver_id, valid_from, valid_to) for every delegate
+    reachable from an approver, with the window all links of the chain share."""
+    edges = defaultdict(list)  # (stage, delegator) -> [(delegate, start, end)]
+    for d in delegations:
+        for stage in ([d.stage] if d.stage else STAGE_APPROVER):
+            edges[(stage, d.delegator_id)].append((d.delegate_id, max(d.starts_at, now), d.ends_at))
+
+    rows = set()
+    for stage, approver_id in list(edges):
+        stack = [(approver_id, None, None, (approver_id,))]
+        while stack:
+            node, start, end, seen = stack.pop()
+            for delegate_id, d_start, d_end in edges.get((stage, node), ()):
+                window_start = d_start if start is None else max(start, d_start)
+                window_end = d_end if end is None else min(end, d_end)
+                if window_start >= window_end or delegate_id in seen:
+                    continue
+                rows.add((delegate_id, stage, approver_id, window_start, window_end))
+                if len(seen) < MAX_CHAIN:
+                    stack.append((delegate_id, window_start, window_end, seen + (delegate_id,)))
+    return rows
+
+
+class DelegationService:
+    @staticmethod
+    def rebuild(db: Session, now: datetime = None) -> int:
+        """Recompute ``effective_approver`` from live delegations in the caller's
+        transaction. Expired and revoked delegations drop out here."""
+        now = now or datetime.utcnow()
+        live = db.query(models.Delegation).filter(
+            models.Delegation.revoked_at.is_(None),
+            models.Delegation.ends_at > now,
+        ).all()
+        rows = _effective_rows(live, now)
+        db.query(models.EffectiveApprover).delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(models.EffectiveApprover), [
+                {"user_id": u, "stage": s, "approver_id": a, "valid_from": f, "valid_to": t}
+                for u, s, a, f, t in rows
+            ])
+        return len(rows)
+
+    @staticmethod
+    def principals(user_id: int, stage: str, now: datetime = None):
+        """``user_id`` plus every approver they currently act for at ``stage``,
+        as a subquery for ``IN`` so an inbox resolves them in its own statement."""
+        now = now or datetime.utcnow()
+        ea = models.EffectiveApprover
+        return union(
+            select(literal(user_id)),
+            select(ea.approver_id).where(
+                ea.user_id == user_id,
+                ea.stage == stage,
+                ea.valid_from <= now,
+                ea.valid_to > now,
+            ),
+        )
+
+    @staticmethod
+    def can_act(db: Session, actor_id: int, stage: str, approver_id: int, now: datetime = None) -> bool:
+        if approver_id is not None and actor_id == approver_id:
+            return True
+        now = now or datetime.utcnow()
+        ea = models.EffectiveApprover
+        return db.query(ea.id).filter(
+            ea.user_id == actor_id,
+            ea.stage == stage,
+            ea.approver_id == approver_id,
+            ea.valid_from <= now,
+            ea.valid_to > now,
+        ).first() is not None
+
+    @staticmethod
+    def _pending_items(db: Session, delegation: models.Delegation) -> int:
+        stages = [delegation.stage] if delegation.stage else list(STAGE_APPROVER)
+        return db.query(func.count(models.ReviewItem.id)).filter(or_(*(
+            (models.ReviewItem.pending_stage == stage) & (STAGE_APPROVER[stage] == delegation.delegator_id)
+            for stage in stages
+        ))).scalar()
+
+    @staticmethod
+    def create_delegation(db: Session, data: schemas.DelegationCreate):
+        if data.stage is not None and data.stage not in STAGE_APPROVER:
+            raise HTTPException(400, f"stage must be one of {', '.join(STAGE_APPROVER)}")
+        if data.delegator_id == data.delegate_id:
+            raise HTTPException(400, "A user cannot delegate to themselves")
+        found = db.query(func.count(models.User.id)).filter(
+            models.User.id.in_([data.delegator_id, data.delegate_id])
+        ).scalar()
+        if found != 2:
+            raise HTTPException(404, "User not found")
+        now = datetime.utcnow()
+        starts_at = _utc(data.starts_at) if data.starts_at else now
+        ends_at = _utc(data.ends_at)
+        if ends_at <= max(starts_at, now):
+            raise HTTPException(400, "Delegation must end in the future and after it starts")
+
+        delegation = models.Delegation(
+            delegator_id=data.delegator_id,
+            delegate_id=data.delegate_id,
+            stage=data.stage,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            created_at=now,
+        )
+        db.add(delegation)
+        db.flush()
+        # Inboxes and action checks read effective_approver, so this one
+        # rewrite re-routes every pending item of the delegator at once.
+        DelegationService.rebuild(db, now)
+        pending = DelegationService._pending_items(db, delegation)
+        db.commit()
+        db.refresh(delegation)
+        delegation.pending_items = pending
+        return delegation
+
+    @staticmethod
+    def revoke_delegation(db: Session, delegation_id: int):
+        delegation = db.query(models.Delegation).filter(models.Delegation.id == delegation_id).first()
+        if not delegation:
+            raise HTTPException(404, "Delegation not found")
+        if delegation.revoked_at is not None:
+            raise HTTPException(400, "Delegation already revoked")
+        delegation.revoked_at = datetime.utcnow()
+        DelegationService.rebuild(db, delegation.revoked_at)
+        pending = DelegationService._pending_items(db, delegation)
+        db.commit()
+        db.refresh(delegation)
+        delegation.pending_items = pending
+        return delegation
+
+    @staticmethod
+    def list_delegations(db: Session, user_id: int = None, active_only: bool = False):
+        query = db.query(models.Delegation)
+        if user_id:
+            query = query.filter(or_(models.Delegation.delegator_id == user_id,
+                                     models.Delegation.delegate_id == user_id))
+        if active_only:
+            query = query.filter(models.Delegation.revoked_at.is_(None),
+                                 models.Delegation.ends_at > datetime.utcnow())
+        return query.order_by(models.Delegation.id).all()
@@ -0,0 +1,154 @@
+from datetime import datetime
+from sqlalchemy import Select, and_, exists, func, insert, or_, select
+from sqlalchemy.orm import Session, aliased
+from fastapi import HTTPException
+from backend.db import models
+
+FINDING_KINDS = ("orphaned_user", "no_approver_chain", "never_reviewed", "revoked_but_active")
+_BATCH = 5000
+
+
+def _scoped(query, column, access_ids):
+    return query.filter(column.in_(access_ids)) if access_ids is not None else query
+
+
+class FindingsService:
+    """Set-based detectors for grants that reviewers would otherwise find one by one.
+
+    Each detector is a single query over the whole ``access`` table (or the
+    ``access_ids`` subset), and ``refresh`` only writes the difference
+    against what is already stored, so unchanged findings keep their
+    original ``detected_at``.
+    """
+
+    @staticmethod
+    def _orphaned_user(db: Session, access_ids=None):
+        query = (
+            db.query(models.Access.id)
+            .outerjoin(models.User, models.User.id == models.Access.user_id)
+            .filter(models.User.id.is_(None))
+        )
+        return {a for (a,) in _scoped(query, models.Access.id, access_ids)}
+
+    @staticmethod
+    def _no_approver_chain(db: Session, access_ids=None):
+        app_id = models.Access.application_id
+        query = db.query(models.Access.id).filter(
+            models.Access.active == True,
+            ~exists().where(models.AppManagerMap.app_id == app_id),
+            ~exists().where(models.AppOwnerMap.app_id == app_id),
+            ~exists().where(models.BusinessOwnerMap.app_id == app_id),
+        )
+        return {a for (a,) in _scoped(query, models.Access.id, access_ids)}
+
+    @staticmethod
+    def _never_reviewed(db: Session, access_ids=None):
+        access_id = models.Access.id
+        query = db.query(access_id).filter(
+            models.Access.active == True,
+            ~exists().where(models.ReviewItem.access_id == access_id),
+            ~exists().where(models.ArchivedDecision.access_id == access_id),
+        )
+        return {a for (a,) in _scoped(query, access_id, access_ids)}
+
+    @staticmethod
+    def _revoked_but_active(db: Session, access_ids=None):
+        """Active grants whose latest decision revoked them. The live decision
+        is the completed item of the access's latest live cycle; the archived
+        one comes from archive_cycle's summary. The later cycle wins, and the
+        archive on a tie."""
+        access_id = models.Access.id
+        item, other = aliased(models.ReviewItem), aliased(models.ReviewItem)
+        decision = models.ArchivedDecision
+        # The subqueries are nested two deep: correlate explicitly, since
+        # automatic correlation only reaches the directly enclosing SELECT.
+        # "No later item" rather than "cycle = max(...)" keeps every probe
+        # on the access_id index.
+        live = and_(
+            item.access_id == access_id,
+            item.pending_stage == "completed",
+            ~exists().where(other.access_id == access_id, other.cycle_id > item.cycle_id)
+            .correlate(models.Access, item),
+        )
+        revoked_live = exists().where(
+            live,
+            item.final_status.in_(models.REVOKED_STATUSES),
+            ~exists().where(decision.access_id == access_id, decision.cycle_id >= item.cycle_id)
+            .correlate(models.Access, item),
+        )
+        revoked_archived = exists().where(
+            decision.access_id == access_id,
+            decision.final_status.in_(models.REVOKED_STATUSES),
+            ~exists().where(live, item.cycle_id > decision.cycle_id).correlate(models.Access, decision),
+        )
+        query = db.query(access_id).filter(models.Access.active == True, or_(revoked_live, revoked_archived))
+        return {a for (a,) in _scoped(query, access_id, access_ids)}
+
+    @staticmethod
+    def detect(db: Session, access_ids=None) -> set[tuple[int, str]]:
+        found = set()
+        for kind, ids in (
+            ("orphaned_user", FindingsService._orphaned_user(db, access_ids)),
+            ("no_approver_chain", FindingsService._no_approver_chain(db, access_ids)),
+            ("never_reviewed", FindingsService._never_reviewed(db, access_ids)),
+            ("revoked_but_active", FindingsService._revoked_but_active(db, access_ids)),
+        ):
+            found.update((access_id, kind) for access_id in ids)
+        return found
+
+    @staticmethod
+    def update_grants(db: Session, access_ids):
+        """Recompute the findings of ``access_ids`` (ids or a SELECT of them)
+        and store the diff. Grant write paths call this inside their own
+        transaction; the caller owns the commit."""
+        db.flush()  # sessions do not autoflush; the detectors must see the write
+        if not isinstance(access_ids, Select):
+            access_ids = list(access_ids)
+            if not access_ids:
+                return {"findings": 0, "added": 0, "resolved": 0}
+        return FindingsService._store(db, access_ids)
+
+    @staticmethod
+    def refresh(db: Session, access_ids=None):
+        """Recompute findings, for everything or just ``access_ids``, and store the diff."""
+        result = FindingsService._store(db, None if access_ids is None else list(access_ids))
+        db.commit()
+        return result
+
+    @staticmethod
+    def _store(db: Session, access_ids):
+        wanted = FindingsService.detect(db, access_ids)
+        existing_query = _scoped(
+            db.query(models.AccessFinding.id, models.AccessFinding.access_id, models.AccessFinding.kind),
+            models.AccessFinding.access_id,
+            access_ids,
+        )
+        existing = {(access_id, kind): finding_id for finding_id, access_id, kind in existing_query}
+
+        now = datetime.utcnow()
+        rows = [{"access_id": a, "kind": k, "detected_at": now} for a, k in wanted - existing.keys()]
+        for i in range(0, len(rows), _BATCH):
+            db.execute(insert(models.AccessFinding), rows[i:i + _BATCH])
+
+        stale = [finding_id for key, finding_id in existing.items() if key not in wanted]
+        for i in range(0, len(stale), _BATCH):
+            db.query(models.AccessFinding).filter(
+                models.AccessFinding.id.in_(stale[i:i + _BATCH])
+            ).delete(synchronize_session=False)
+        return {"findings": len(wanted), "added": len(rows), "resolved": len(stale)}
+
+    @staticmethod
+    def list_findings(db: Session, kind: str = None, application_id: int = None, user_id: int = None):
+        if kind and kind not in FINDING_KINDS:
+            raise HTTPException(400, f"kind must be one of {', '.join(FINDING_KINDS)}")
+        query = db.query(models.AccessFinding)
+        if kind:
+            query = query.filter(models.AccessFinding.kind == kind)
+        if application_id or user_id:
+            access = select(models.Access.id)
+            if application_id:
+                access = access.where(models.Access.application_id == application_id)
+            if user_id:
+                access = access.where(models.Access.user_id == user_id)
+            query = query.filter(models.AccessFinding.access_id.in_(access))
+        return query.order_by(models.AccessFinding.id).all()
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.db import models
+
+NEW, REPLAY, IN_PROGRESS, MISMATCH = "new", "replay", "in_progress", "mismatch"
+
+
+class IdempotencyService:
+    @staticmethod
+    def begin(db: Session, record_id: str, request_hash: str, now: datetime = None):
+        """Claim ``record_id`` for a first attempt, or report what a retry should get.
+
+        Returns ``(NEW, None)`` when the caller must run the request,
+        ``(REPLAY, record)`` for a finished attempt with the same payload,
+        ``(IN_PROGRESS, None)`` while another attempt holds the key and
+        ``(MISMATCH, None)`` when the key was used for a different payload.
+        Expired results and attempts older than the lock timeout are taken
+        over.
+        """
+        now = now or datetime.utcnow()
+        expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+        db.add(models.IdempotencyRecord(id=record_id, request_hash=request_hash, created_at=now, expires_at=expires_at))
+        try:
+            db.commit()
+            return NEW, None
+        except IntegrityError:
+            db.rollback()
+
+        record = db.query(models.IdempotencyRecord).filter(models.IdempotencyRecord.id == record_id).first()
+        if record is None:
+            # Purged between our insert and read; the caller may simply retry.
+            return IN_PROGRESS, None
+        abandoned = record.status_code is None and record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+        if record.expires_at <= now or abandoned:
+            taken = db.query(models.IdempotencyRecord).filter(
+                models.IdempotencyRecord.id == record_id,
+                models.IdempotencyRecord.created_at == record.created_at,
+            ).update({
+                models.IdempotencyRecord.request_hash: request_hash,
+                models.IdempotencyRecord.status_code: None,
+                models.IdempotencyRecord.content_type: None,
+                models.IdempotencyRecord.body: None,
+                models.IdempotencyRecord.created_at: now,
+                models.IdempotencyRecord.expires_at: expires_at,
+            }, synchronize_session=False)
+            db.commit()
+            return (NEW, None) if taken else (IN_PROGRESS, None)
+        if record.request_hash != request_hash:
+            return MISMATCH, None
+        if record.status_code is None:
+            return IN_PROGRESS, None
+        return REPLAY, record
+
+    @staticmethod
+    def complete(db: Session, record_id: str, status_code: int, content_type: str, body: bytes):
+        db.query(models.IdempotencyRecord).filter(models.IdempotencyRecord.id == record_id).update({
+            models.IdempotencyRecord.status_code: status_code,
+            models.IdempotencyRecord.content_type: content_type,
+            models.IdempotencyRecord.body: body,
+        }, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, record_id: str):
+        """Forget an attempt that must not be replayed (server error, crash)."""
+        db.query(models.IdempotencyRecord).filter(
+            models.IdempotencyRecord.id == record_id,
+            models.IdempotencyRecord.status_code.is_(None),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session, now: datetime = None):
+        deleted = db.query(models.IdempotencyRecord).filter(
+            models.IdempotencyRecord.expires_at <= (now or datetime.utcnow())
+        ).delete(synchronize_session=False)
+        db.commit()
+        return {"deleted": deleted}
@@ -0,0 +1,243 @@
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from backend.db import models
+from backend.utils.columnar import executemany, fetch_columns
+
+# Groups with fewer other members than this are too small to call anything unusual.
+MIN_PEERS = 5
+# A grant is an outlier when at most this share of the user's peers hold it too.
+MAX_FREQUENCY = 0.1
+
+
+def _role_keys(user_ids: np.ndarray, role_ids: np.ndarray) -> tuple[np.ndarray, list[str]]:
+    """Distinct users and their role_key, from (user_id, role_id) sorted by both."""
+    if not len(user_ids):
+        return user_ids, []
+    starts = np.flatnonzero(np.r_[True, user_ids[1:] != user_ids[:-1]])
+    bounds = starts.tolist() + [len(user_ids)]
+    roles = role_ids.tolist()
+    return user_ids[starts], [",".join(map(str, roles[a:b])) for a, b in zip(bounds, bounds[1:])]
+
+
+def role_groups(db: Session) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[str]]:
+    """Peers are the users with exactly the same roles.
+
+    Returns (user ids, group index by user id, members per group, role key
+    per group); group 0 holds the users without roles.
+    """
+    (user_ids,) = fetch_columns(db, select(models.User.id), (np.int64,))
+    user_roles = select(models.UserRole.user_id, models.UserRole.role_id).order_by(
+        models.UserRole.user_id, models.UserRole.role_id
+    )
+    ur_users, ur_roles = fetch_columns(db, user_roles, (np.int64, np.int64))
+    size = int(max(user_ids.max(initial=0), ur_users.max(initial=0))) + 1
+    keyed_users, keys = _role_keys(ur_users, ur_roles)
+    group_index = {"": 0}
+    group_of = np.zeros(size, dtype=np.int64)
+    group_of[keyed_users] = [group_index.setdefault(k, len(group_index)) for k in keys]
+    role_keys = list(group_index)
+    members = np.bincount(group_of[user_ids], minlength=len(role_keys))
+    return user_ids, group_of, members, role_keys
+
+
+class PeerOutlierService:
+    """Grants that few of the user's role peers hold.
+
+    Peers are the users with exactly the same roles. The user x application
+    grant matrix is sparse, so it is kept as coordinate arrays: the group x
+    application frequency matrix (group membership times grants) is one
+    ``np.unique`` over (group, application) keys, and every grant reads its
+    cell back through the inverse index.
+    """
+
+    @staticmethod
+    def rebuild(db: Session):
+        """Recompute groups, the frequency matrix and the flagged grants from scratch."""
+        t0 = time.perf_counter()
+        user_ids, group_of, members, role_keys = role_groups(db)
+        grants = select(models.Access.id, models.Access.user_id, models.Access.application_id).where(
+            models.Access.active == True
+        )
+        access_ids, grant_users, grant_apps = fetch_columns(db, grants, (np.int64, np.int64, np.int64))
+
+        size = len(group_of)
+        known = np.zeros(size, dtype=bool)
+        known[user_ids] = True
+        keep = (grant_users < size) & known[np.minimum(grant_users, size - 1)]
+        access_ids, grant_users, grant_apps = access_ids[keep], grant_users[keep], grant_apps[keep]
+        groups = group_of[grant_users]
+        width = int(grant_apps.max(initial=0)) + 1
+        cells, inverse, cell_holders = np.unique(groups * width + grant_apps, return_inverse=True, return_counts=True)
+        holders = cell_holders[inverse]
+        peers = members[groups] - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frequency = np.where(peers > 0, (holders - 1) / peers, 1.0)
+        flagged = np.flatnonzero((peers >= MIN_PEERS) & (frequency <= MAX_FREQUENCY))
+
+        for model in (models.PeerOutlier, models.PeerGroupApp, models.PeerGroupMember, models.PeerGroup):
+            db.execute(delete(model))
+        group_ids = np.array(db.execute(
+            insert(models.PeerGroup).returning(models.PeerGroup.id, sort_by_parameter_order=True),
+            [{"role_key": k, "members": m} for k, m in zip(role_keys, members.tolist())],
+        ).scalars().all(), dtype=np.int64)
+        executemany(db, insert(models.PeerGroupMember), {
+            "user_id": user_ids.tolist(), "group_id": group_ids[group_of[user_ids]].tolist(),
+        })
+        executemany(db, insert(models.PeerGroupApp), {
+            "group_id": group_ids[cells // width].tolist(),
+            "application_id": (cells % width).tolist(),
+            "holders": cell_holders.tolist(),
+        })
+        now = datetime.utcnow()
+        executemany(db, insert(models.PeerOutlier), {
+            "access_id": access_ids[flagged].tolist(),
+            "user_id": grant_users[flagged].tolist(),
+            "application_id": grant_apps[flagged].tolist(),
+            "group_id": group_ids[groups[flagged]].tolist(),
+            "holders": holders[flagged].tolist(),
+            "peers": peers[flagged].tolist(),
+            "frequency": frequency[flagged].tolist(),
+            "detected_at": [now] * len(flagged),
+        })
+        db.commit()
+        return {
+            "groups": len(role_keys),
+            "grants": len(access_ids),
+            "cells": len(cells),
+            "outliers": len(flagged),
+            "seconds": round(time.perf_counter() - t0, 3),
+        }
+
+    @staticmethod
+    def _group_of(db: Session, user_id: int) -> tuple[models.PeerGroup, bool]:
+        """The user's group and whether they just joined it (or created it)
+        because they arrived after the last rebuild."""
+        member = db.query(models.PeerGroupMember).filter(models.PeerGroupMember.user_id == user_id).first()
+        if member:
+            return db.query(models.PeerGroup).filter(models.PeerGroup.id == member.group_id).one(), False
+        roles = db.query(models.UserRole.role_id).filter(models.UserRole.user_id == user_id).order_by(models.UserRole.role_id)
+        role_key = ",".join(str(r) for (r,) in roles)
+        group = db.query(models.PeerGroup).filter(models.PeerGroup.role_key == role_key).first()
+        if not group:
+            group = models.PeerGroup(role_key=role_key, members=0)
+            db.add(group)
+            db.flush()
+        group.members += 1
+        db.add(models.PeerGroupMember(user_id=user_id, group_id=group.id))
+        db.flush()
+        return group, True
+
+    @staticmethod
+    def _recount(db: Session, group: models.PeerGroup, application_id: int = None) -> int:
+        """Rewrite the group's cells and flags, for one application or all of
+        them, with set-based statements; returns the grants flagged."""
+        member = models.PeerGroupMember
+        held = (
+            select(models.Access.id, models.Access.user_id, models.Access.application_id)
+            .join(member, member.user_id == models.Access.user_id)
+            .where(member.group_id == group.id, models.Access.active == True)
+        )
+        cells = db.query(models.PeerGroupApp).filter(models.PeerGroupApp.group_id == group.id)
+        flags = db.query(models.PeerOutlier).filter(models.PeerOutlier.group_id == group.id)
+        if application_id is not None:
+            held = held.where(models.Access.application_id == application_id)
+            cells = cells.filter(models.PeerGroupApp.application_id == application_id)
+            flags = flags.filter(models.PeerOutlier.application_id == application_id)
+        cells.delete(synchronize_session=False)
+        flags.delete(synchronize_session=False)
+
+        held = held.subquery()
+        db.execute(insert(models.PeerGroupApp).from_select(
+            ["group_id", "application_id", "holders"],
+            select(literal(group.id), held.c.application_id, func.count()).group_by(held.c.application_id),
+        ))
+        peers = group.members - 1
+        if peers < MIN_PEERS:
+            return 0
+        cell = models.PeerGroupApp
+        return db.execute(insert(models.PeerOutlier).from_select(
+            ["access_id", "user_id", "application_id", "group_id", "holders", "peers", "frequency", "detected_at"],
+            select(
+                held.c.id, held.c.user_id, held.c.application_id, literal(group.id), cell.holders,
+                literal(peers), (cell.holders - 1) * 1.0 / peers, literal(datetime.utcnow()),
+            )
+            .join(cell, (cell.group_id == group.id) & (cell.application_id == held.c.application_id))
+            .where((cell.holders - 1) * 1.0 / peers <= MAX_FREQUENCY),
+        )).rowcount
+
+    @staticmethod
+    def update_grant(db: Session, user_id: int, application_id: int):
+        """Re-evaluate what a single grant change touches.
+
+        Every holder of an application within a group shares the cell's
+        frequency, so the cell's holders are recounted and their flags are
+        rewritten together. A user joining a group changes ``peers`` for
+        all of its cells, so then the whole group is recounted. Role changes
+        move users between groups and are picked up by the next ``rebuild``;
+        before the first one there are no groups to judge against, and
+        nothing is done.
+        """
+        if db.query(models.PeerGroup.id).first() is None:
+            return None
+        group, joined = PeerOutlierService._group_of(db, user_id)
+        flagged = PeerOutlierService._recount(db, group, None if joined else application_id)
+        db.commit()
+        return {"group_id": group.id, "recounted": "group" if joined else "cell", "outliers": flagged}
+
+    @staticmethod
+    def update_application(db: Session, application_id: int):
+        """Re-evaluate one application in every group after bulk grant
+        changes to it, such as a reconciliation. Holders who arrived after
+        the last rebuild join their groups first, which recounts those
+        groups whole."""
+        if db.query(models.PeerGroup.id).first() is None:
+            return None
+        member = models.PeerGroupMember
+        newcomers = (
+            db.query(models.Access.user_id)
+            .outerjoin(member, member.user_id == models.Access.user_id)
+            .filter(
+                models.Access.application_id == application_id,
+                models.Access.active == True,
+                member.user_id.is_(None),
+            )
+            .distinct()
+            .all()
+        )
+        resized = set()
+        for (user_id,) in newcomers:
+            group, joined = PeerOutlierService._group_of(db, user_id)
+            if joined:
+                resized.add(group.id)
+        flagged = 0
+        for group in db.query(models.PeerGroup).all():
+            flagged += PeerOutlierService._recount(db, group, None if group.id in resized else application_id)
+        db.commit()
+        return {"application_id": application_id, "groups_resized": len(resized), "outliers": flagged}
+
+    @staticmethod
+    def remove_user(db: Session, user_id: int):
+        """Take a user out of their group before they are deleted; the rest
+        of the group then has one peer fewer. The caller owns the commit."""
+        member = db.query(models.PeerGroupMember).filter(models.PeerGroupMember.user_id == user_id).first()
+        if not member:
+            return
+        group = db.query(models.PeerGroup).filter(models.PeerGroup.id == member.group_id).one()
+        db.query(models.PeerOutlier).filter(models.PeerOutlier.user_id == user_id).delete(synchronize_session=False)
+        db.delete(member)
+        group.members -= 1
+        db.flush()
+        PeerOutlierService._recount(db, group)
+
+    @staticmethod
+    def list_outliers(db: Session, application_id: int = None, user_id: int = None, limit: int = 1000, offset: int = 0):
+        query = db.query(models.PeerOutlier)
+        if application_id:
+            query = query.filter(models.PeerOutlier.application_id == application_id)
+        if user_id:
+            query = query.filter(models.PeerOutlier.user_id == user_id)
+        return query.order_by(models.PeerOutlier.frequency, models.PeerOutlier.access_id).offset(offset).limit(limit).all()
@@ -0,0 +1,235 @@
+"""Reconcile an application's Access rows against its entitlement snapshot.
+
+A snapshot is a CSV file (optionally ``.gz``) with a ``business_user_id``
+header. Its first column lists every account the application reports, and
+the rows are sorted by that column. It is read as a stream and merge-joined
+against the application's grants, which the database returns in the same
+order. Nothing proportional to the snapshot is held in memory. The diff is
+spooled to a temporary file and then applied in batches, with one commit
+per batch, once the scan has finished.
+"""
+import csv
+import gzip
+import os
+import tempfile
+from itertools import groupby
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.db import models
+from backend.services.access_graph import access_graph
+from backend.services.access_service import AccessService
+from backend.services.findings_service import FindingsService
+from backend.services.peer_outlier_service import PeerOutlierService
+from backend.services.sod_service import SodService
+from backend.utils.http_cache import collection_versions
+
+_BATCH = 5000
+_SAMPLES = 20
+
+GRANT, RESTORE, REVOKE, UNCHANGED = "grant", "restore", "revoke", "unchanged"
+
+
+class SnapshotError(ValueError):
+    """A snapshot that cannot be reconciled; the router answers 400."""
+
+
+def snapshot_path(name: str) -> str:
+    """Resolve a snapshot file name inside ``SNAPSHOT_DIR``."""
+    root = os.path.realpath(settings.SNAPSHOT_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root:
+        raise SnapshotError("Snapshot must be a file name inside the snapshot directory")
+    if not os.path.isfile(path):
+        raise FileNotFoundError("Snapshot not found")
+    return path
+
+
+def read_snapshot(path: str):
+    """Yield business_user_ids in file order, without duplicates.
+
+    The file must be sorted. Out-of-order input fails instead of producing a
+    wrong diff, because the merge join relies on the order.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or header[0].strip().lower() != "business_user_id":
+            raise SnapshotError("Snapshot must start with a business_user_id header")
+        previous = None
+        for line_no, row in enumerate(reader, start=2):
+            if not row or not row[0].strip():
+                continue
+            key = row[0].strip()
+            if previous is not None:
+                if key == previous:
+                    continue
+                if key < previous:
+                    raise SnapshotError(f"Snapshot is not sorted by business_user_id (line {line_no})")
+            previous = key
+            yield key
+
+
+def _granted(conn, application_id: int, batch_size: int):
+    """(business_user_id, [(access_id, active), ...]) for the application in snapshot order."""
+    key = models.User.business_user_id
+    if conn.dialect.name == "postgresql":
+        # Byte order, like Python string comparison on the snapshot side.
+        key = key.collate("C")
+    stmt = (
+        select(models.User.business_user_id, models.Access.id, models.Access.active)
+        .join(models.User, models.User.id == models.Access.user_id)
+        .where(models.Access.application_id == application_id)
+        .order_by(key, models.Access.id)
+    )
+    rows = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+    for business_user_id, group in groupby(rows, key=lambda row: row[0]):
+        yield business_user_id, [(row[1], bool(row[2])) for row in group]
+
+
+def merge(snapshot, granted):
+    """Merge-join two streams sorted by business_user_id.
+
+    Yields ``(kind, business_user_id, access_ids)``:
+    - GRANT: in the snapshot, with no row here.
+    - RESTORE: in the snapshot, with only revoked rows here.
+    - REVOKE: only here, with active rows to revoke.
+    - UNCHANGED: in both, and active here.
+    """
+    snapshot, granted = iter(snapshot), iter(granted)
+    account = next(snapshot, None)
+    current = next(granted, None)
+    while account is not None or current is not None:
+        if current is None or (account is not None and account < current[0]):
+            yield GRANT, account, None
+            account = next(snapshot, None)
+        elif account is None or current[0] < account:
+            active = [access_id for access_id, is_active in current[1] if is_active]
+            if active:
+                yield REVOKE, current[0], active
+            current = next(granted, None)
+        else:
+            if any(is_active for _, is_active in current[1]):
+                yield UNCHANGED, account, None
+            else:
+                yield RESTORE, account, [min(access_id for access_id, _ in current[1])]
+            account = next(snapshot, None)
+            current = next(granted, None)
+
+
+class ReconciliationService:
+    @staticmethod
+    def reconcile(db: Session, application_id: int, path: str, dry_run: bool = False, batch_size: int = _BATCH,
+                  refresh: bool = True):
+        """Diff ``path`` against the application's grants and, unless
+        ``dry_run``, apply it. Accounts unknown to the user table are counted
+        and sampled but never created. ``refresh=False`` leaves
+        ``refresh_derived`` to a caller reconciling many applications."""
+        app = db.query(models.Application).filter(models.Application.id == application_id).first()
+        if not app:
+            raise HTTPException(404, "Application not found")
+
+        result = {
+            "application_id": application_id,
+            "dry_run": dry_run,
+            "unchanged": 0, "added": 0, "restored": 0, "removed": 0, "unknown_users": 0,
+            "samples": {"added": [], "restored": [], "removed": [], "unknown_users": []},
+        }
+        samples = result["samples"]
+
+        def sample(kind, business_user_id):
+            if len(samples[kind]) < _SAMPLES:
+                samples[kind].append(business_user_id)
+
+        with tempfile.TemporaryFile("w+") as spool:
+            pending = []
+
+            def resolve_pending():
+                # Snapshot accounts are business ids; look up user ids a batch at a time.
+                found = dict(db.query(models.User.business_user_id, models.User.id).filter(
+                    models.User.business_user_id.in_(pending)
+                ))
+                for business_user_id in pending:
+                    user_id = found.get(business_user_id)
+                    if user_id is None:
+                        result["unknown_users"] += 1
+                        sample("unknown_users", business_user_id)
+                    else:
+                        result["added"] += 1
+                        sample("added", business_user_id)
+                        spool.write(f"{GRANT}\t{user_id}\n")
+                pending.clear()
+
+            with db.get_bind().connect() as conn:
+                for kind, business_user_id, access_ids in merge(
+                    read_snapshot(path), _granted(conn, application_id, batch_size)
+                ):
+                    if kind == UNCHANGED:
+                        result["unchanged"] += 1
+                    elif kind == GRANT:
+                        pending.append(business_user_id)
+                        if len(pending) >= batch_size:
+                            resolve_pending()
+                    else:
+                        counter = "restored" if kind == RESTORE else "removed"
+                        result[counter] += 1
+                        sample(counter, business_user_id)
+                        spool.writelines(f"{kind}\t{access_id}\n" for access_id in access_ids)
+            if pending:
+                resolve_pending()
+            db.commit()  # end the lookup transaction before writing
+
+            if dry_run or not (result["added"] or result["restored"] or result["removed"]):
+                return result
+            spool.seek(0)
+            ReconciliationService._apply(db, application_id, spool, batch_size)
+
+        active = db.query(func.count(models.Access.id)).filter(
+            models.Access.application_id == application_id,
+            models.Access.active == True,
+        ).scalar()
+        app.user_count = active
+        collection_versions.bump(db, "applications")
+        db.commit()
+        if refresh:
+            ReconciliationService.refresh_derived(db, [application_id])
+        return result
+
+    @staticmethod
+    def refresh_derived(db: Session, application_ids):
+        """Bring everything computed from grants up to date after bulk changes
+        to ``application_ids``: the access graph, SoD violations, peer-outlier
+        cells of those applications and the findings of their grants."""
+        access_graph.invalidate()
+        SodService.evaluate_rules(db)
+        for application_id in application_ids:
+            PeerOutlierService.update_application(db, application_id)
+        FindingsService.update_grants(
+            db, select(models.Access.id).where(models.Access.application_id.in_(application_ids))
+        )
+        db.commit()
+
+    @staticmethod
+    def _apply(db: Session, application_id: int, spool, batch_size: int):
+        batch = {GRANT: [], RESTORE: [], REVOKE: []}
+        size = 0
+        for line in spool:
+            kind, _, value = line.rstrip("\n").partition("\t")
+            batch[kind].append(int(value))
+            size += 1
+            if size >= batch_size:
+                ReconciliationService._apply_batch(db, application_id, batch)
+                batch = {GRANT: [], RESTORE: [], REVOKE: []}
+                size = 0
+        if size:
+            ReconciliationService._apply_batch(db, application_id, batch)
+
+    @staticmethod
+    def _apply_batch(db: Session, application_id: int, batch: dict):
+        AccessService.bulk_grant(db, application_id, batch[GRANT])
+        AccessService.bulk_restore(db, batch[RESTORE])
+        AccessService.bulk_revoke(db, batch[REVOKE])
+        db.commit()
@@ -0,0 +1,130 @@
+from fastapi import HTTPException
+from sqlalchemy import and_, case, delete, distinct, exists, func, insert, literal, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from backend.db import models
+from backend.utils.http_cache import collection_versions
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _chain(column_self, column_other, node_id: int):
+    """``node_id`` itself at depth 0 plus its closure rows on one side."""
+    closure = models.ReportingClosure
+    return select(column_other.label("node"), closure.depth).where(column_self == node_id).union_all(
+        select(literal(node_id), literal(0))
+    ).subquery()
+
+
+def rebuild_closure(conn) -> int:
+    """Recompute ``reporting_closure`` from ``reporting_map`` level by level:
+    one INSERT ... SELECT per hierarchy level. Returns the row count."""
+    closure = models.ReportingClosure.__table__
+    edges = models.ReportingMap.__table__
+    conn.execute(delete(closure))
+    total = conn.execute(insert(closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(edges.c.manager_id, edges.c.user_id, literal(1)).where(edges.c.manager_id != edges.c.user_id),
+    )).rowcount
+    depth = 1
+    while True:
+        known = closure.alias("known")
+        step = (
+            select(closure.c.ancestor_id, edges.c.user_id, literal(depth + 1))
+            .join(edges, edges.c.manager_id == closure.c.descendant_id)
+            .where(
+                closure.c.depth == depth,
+                closure.c.ancestor_id != edges.c.user_id,
+                ~exists().where(and_(known.c.ancestor_id == closure.c.ancestor_id,
+                                     known.c.descendant_id == edges.c.user_id)),
+            )
+            .distinct()
+        )
+        added = conn.execute(insert(closure).from_select(["ancestor_id", "descendant_id", "depth"], step)).rowcount
+        if not added:
+            return total
+        total += added
+        depth += 1
+
+
+class ReportingService:
+    @staticmethod
+    def add_edge(db: Session, manager_id: int, user_id: int):
+        """Add a manager -> user edge and extend the closure in the same transaction.
+
+        Every ancestor of the manager (and the manager) gains every
+        descendant of the user (and the user): one INSERT ... SELECT over two
+        indexed lookups, whatever the size of the hierarchy.
+        """
+        if manager_id == user_id:
+            raise HTTPException(400, "A user cannot report to themselves")
+        if db.query(models.ReportingMap).filter(
+            models.ReportingMap.manager_id == manager_id,
+            models.ReportingMap.user_id == user_id,
+        ).first():
+            raise HTTPException(400, "Mapping already exists")
+        closure = models.ReportingClosure
+        if db.query(closure).filter(closure.ancestor_id == user_id, closure.descendant_id == manager_id).first():
+            raise HTTPException(400, "Mapping would create a reporting cycle")
+
+        m = models.ReportingMap(manager_id=manager_id, user_id=user_id)
+        db.add(m)
+
+        up = _chain(closure.descendant_id, closure.ancestor_id, manager_id)
+        down = _chain(closure.ancestor_id, closure.descendant_id, user_id)
+        # WHERE true: SQLite needs it to parse INSERT ... SELECT ... ON CONFLICT.
+        paths = select(up.c.node, down.c.node, up.c.depth + down.c.depth + 1).select_from(up).join(down, true()).where(true())
+        columns = ["ancestor_id", "descendant_id", "depth"]
+        upsert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+        if upsert is not None:
+            stmt = upsert(closure).from_select(columns, paths)
+            # Another route between the same pair (matrix reporting) keeps the shorter depth.
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ancestor_id", "descendant_id"],
+                set_={"depth": case((stmt.excluded.depth < closure.depth, stmt.excluded.depth), else_=closure.depth)},
+            )
+        else:
+            known = models.ReportingClosure.__table__.alias("known")
+            stmt = insert(closure).from_select(columns, paths.where(~exists().where(and_(
+                known.c.ancestor_id == up.c.node, known.c.descendant_id == down.c.node,
+            ))))
+        db.execute(stmt)
+        collection_versions.bump(db, "reporting_map")
+        db.commit()
+        db.refresh(m)
+        return m
+
+    @staticmethod
+    def subtree(db: Session, manager_id: int, max_depth: int = None, limit: int = 1000, offset: int = 0):
+        """Everyone below ``manager_id``, nearest first: one range scan of the closure key."""
+        closure = models.ReportingClosure
+        query = db.query(
+            models.User.id,
+            models.User.business_user_id,
+            models.User.name,
+            models.User.email,
+            closure.depth,
+        ).join(closure, closure.descendant_id == models.User.id).filter(closure.ancestor_id == manager_id)
+        if max_depth is not None:
+            query = query.filter(closure.depth <= max_depth)
+        return query.order_by(closure.depth, closure.descendant_id).offset(offset).limit(limit).all()
+
+    @staticmethod
+    def subtree_access(db: Session, manager_id: int):
+        """Active users per application across the whole subtree."""
+        closure = models.ReportingClosure
+        members = db.query(func.count(closure.descendant_id)).filter(closure.ancestor_id == manager_id).scalar()
+        rows = (
+            db.query(
+                models.Access.application_id,
+                models.Application.name.label("application"),
+                func.count(distinct(models.Access.user_id)).label("users"),
+            )
+            .join(closure, closure.descendant_id == models.Access.user_id)
+            .join(models.Application, models.Application.id == models.Access.application_id)
+            .filter(closure.ancestor_id == manager_id, models.Access.active == True)
+            .group_by(models.Access.application_id, models.Application.name)
+            .order_by(func.count(distinct(models.Access.user_id)).desc(), models.Access.application_id)
+            .all()
+        )
+        return {"manager_id": manager_id, "members": members, "applications": [r._asdict() for r in rows]}
@@ -0,0 +1,85 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from backend.db import models
+from backend.services.access_graph import access_graph
+from backend.services.access_service import AccessService
+from backend.services.findings_service import FindingsService
+from backend.services.peer_outlier_service import PeerOutlierService
+from backend.services.sod_service import SodService
+
+_BATCH = 5000
+
+
+class RevocationService:
+    @staticmethod
+    def execute_cycle(db: Session, cycle_id: int, batch_size: int = _BATCH):
+        """Apply every revoked decision of a cycle to its Access row.
+
+        Items are walked in id order in batches; each batch is one UPDATE on
+        ``access``, one or two UPDATEs on ``review_item`` and one commit, so
+        the writer lock is held briefly and an interrupted run resumes where
+        it stopped. The batch's findings are refreshed in the same commit. Items already marked as fulfilled are skipped, which makes
+        re-runs no-ops.
+        """
+        cycle = db.query(models.ReviewCycle).filter(models.ReviewCycle.id == cycle_id).first()
+        if not cycle:
+            raise HTTPException(404, "Review cycle not found")
+        if cycle.status == "archived":
+            raise HTTPException(400, "Review cycle is archived")
+
+        result = {"cycle_id": cycle_id, "items": 0, "revoked": 0, "already_inactive": 0, "access_missing": 0}
+        last_id = 0
+        application_ids = set()
+        while True:
+            batch = (
+                db.query(models.ReviewItem.id, models.ReviewItem.access_id)
+                .filter(
+                    models.ReviewItem.cycle_id == cycle_id,
+                    models.ReviewItem.id > last_id,
+                    models.ReviewItem.pending_stage == "completed",
+                    models.ReviewItem.final_status.in_(models.REVOKED_STATUSES),
+                    models.ReviewItem.fulfillment_status.is_(None),
+                )
+                .order_by(models.ReviewItem.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            access_ids = sorted({access_id for _, access_id in batch})
+
+            present = set()
+            for access_id, application_id, active in db.query(
+                models.Access.id, models.Access.application_id, models.Access.active
+            ).filter(models.Access.id.in_(access_ids)):
+                present.add(access_id)
+                if active:
+                    application_ids.add(application_id)
+            revoked = AccessService.bulk_revoke(db, access_ids)
+
+            now = datetime.utcnow()
+            fulfilled = [item_id for item_id, access_id in batch if access_id in present]
+            missing = [item_id for item_id, access_id in batch if access_id not in present]
+            for status, item_ids in (("fulfilled", fulfilled), ("access_missing", missing)):
+                if item_ids:
+                    db.query(models.ReviewItem).filter(models.ReviewItem.id.in_(item_ids)).update(
+                        {models.ReviewItem.fulfillment_status: status, models.ReviewItem.fulfilled_at: now},
+                        synchronize_session=False,
+                    )
+            FindingsService.update_grants(db, access_ids)
+            db.commit()
+
+            result["items"] += len(batch)
+            result["revoked"] += revoked
+            result["already_inactive"] += len(present) - revoked
+            result["access_missing"] += len(missing)
+
+        if result["revoked"]:
+            access_graph.invalidate()
+            SodService.evaluate_rules(db)
+            # Revoked holders leave their peer-group cells.
+            for application_id in sorted(application_ids):
+                PeerOutlierService.update_application(db, application_id)
+        return result
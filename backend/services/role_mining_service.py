@@ -0,0 +1,293 @@
+"""Candidate roles mined from the application sets users actually hold.
+
+Users with identical application sets collapse into one weighted profile.
+Profiles get MinHash signatures; LSH banding over the signatures proposes
+candidate pairs, exact Jaccard similarity verifies them, and union-find
+joins verified pairs into clusters. Each large enough cluster proposes the
+applications most of its users share as a role.
+
+Signatures and verification work on flat numpy arrays in chunks, so both
+can be spread over a process pool.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from backend.config import settings
+from backend.db import models
+from backend.utils.columnar import fetch_columns
+
+_SEED = 7919
+# Profiles whose signature rows collide in any band become candidates:
+# pairs at the similarity threshold are found ~80% of the time directly
+# (and mostly through a third profile otherwise), pairs at 0.2 ~2%.
+BANDS = 12
+ROWS = 4
+# A candidate pair is kept when its exact Jaccard similarity reaches this.
+SIMILARITY = 0.6
+# Applications held by at least this share of a cluster's users make its role.
+SUPPORT = 0.8
+MIN_USERS = 10
+# Applications (signatures) or pair-applications (verification) per chunk.
+_CHUNK = 200_000
+
+# Profiles for the verification workers, set once per process by _share.
+_shared = {}
+
+
+def _share(apps: np.ndarray, offsets: np.ndarray, lengths: np.ndarray):
+    _shared.update(apps=apps, offsets=offsets, lengths=lengths)
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenation of range(s, s + n) for every (s, n)."""
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    firsts = np.cumsum(lengths) - lengths
+    return np.repeat(starts - firsts, lengths) + np.arange(total)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: summing mixed ids gives an order-free set hash.
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _profiles(user_ids: np.ndarray, app_ids: np.ndarray):
+    """Collapse users with the same application set.
+
+    Returns (apps, offsets, lengths, weights): profile i holds the sorted
+    apps[offsets[i]:offsets[i] + lengths[i]] and stands for weights[i] users.
+    """
+    if not len(user_ids):
+        empty = np.zeros(0, dtype=np.int64)
+        return app_ids, empty, empty, empty
+    order = np.lexsort((app_ids, user_ids))
+    user_ids, app_ids = user_ids[order], app_ids[order]
+    distinct = np.r_[True, (user_ids[1:] != user_ids[:-1]) | (app_ids[1:] != app_ids[:-1])]
+    user_ids, app_ids = user_ids[distinct], app_ids[distinct]
+    starts = np.flatnonzero(np.r_[True, user_ids[1:] != user_ids[:-1]])
+    lengths = np.diff(np.r_[starts, len(user_ids)])
+
+    fingerprint = np.add.reduceat(_mix(app_ids), starts) ^ _mix(lengths)
+    _, first, group = np.unique(fingerprint, return_index=True, return_inverse=True)
+    # Check every user against the first one with the same fingerprint;
+    # the rare collision keeps its own profile.
+    rep = first[group]
+    same = np.flatnonzero(lengths == lengths[rep])
+    equal = app_ids[_ranges(starts[same], lengths[same])] == app_ids[_ranges(starts[rep[same]], lengths[same])]
+    verified = np.zeros(len(starts), dtype=bool)
+    verified[same] = np.logical_and.reduceat(equal, np.cumsum(lengths[same]) - lengths[same])
+    group = np.where(verified, group, len(first) + np.arange(len(starts)))
+
+    _, rep_users, inverse = np.unique(group, return_index=True, return_inverse=True)
+    lengths = lengths[rep_users]
+    apps = app_ids[_ranges(starts[rep_users], lengths)]
+    return apps, np.cumsum(lengths) - lengths, lengths, np.bincount(inverse)
+
+
+def _chunks(lengths: np.ndarray, size: int):
+    """Consecutive index ranges whose ``lengths`` add up to about ``size``."""
+    bounds = np.searchsorted(np.cumsum(lengths), np.arange(size, int(lengths.sum()) + size, size), side="right")
+    start = 0
+    for end in np.unique(np.r_[bounds, len(lengths)]).tolist():
+        if end > start:
+            yield start, end
+            start = end
+
+
+def _signatures(apps: np.ndarray, lengths: np.ndarray, num_hashes: int) -> np.ndarray:
+    """MinHash signatures (profiles x num_hashes) of consecutive profiles."""
+    # Multiply-shift hashing stands in for random permutations.
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(0, 1 << 63, size=num_hashes, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_hashes, dtype=np.uint64)
+    hashes = ((apps.astype(np.uint64)[:, None] * a + b) >> np.uint64(32)).astype(np.uint32)
+    return np.minimum.reduceat(hashes, np.cumsum(lengths) - lengths, axis=0)
+
+
+def _candidates(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Distinct (left, right) profile pairs that share a band bucket.
+
+    Every bucket member is paired with the bucket's first member only: that
+    keeps big buckets linear and still connects them after union-find.
+    """
+    rng = np.random.default_rng(_SEED + 1)
+    multipliers = rng.integers(1, 1 << 62, size=rows, dtype=np.int64).astype(np.uint64)
+    positions = np.arange(len(signatures))
+    keys = []
+    for band in range(bands):
+        buckets = np.zeros(len(signatures), dtype=np.uint64)
+        for row in range(rows):
+            buckets += signatures[:, band * rows + row].astype(np.uint64) * multipliers[row]
+        order = np.argsort(buckets, kind="stable")
+        buckets = buckets[order]
+        first = np.r_[True, buckets[1:] != buckets[:-1]]
+        heads = order[np.maximum.accumulate(np.where(first, positions, 0))]
+        left, right = np.minimum(heads, order)[~first], np.maximum(heads, order)[~first]
+        keys.append(left * len(signatures) + right)
+    keys = np.unique(np.concatenate(keys))
+    return np.stack([keys // len(signatures), keys % len(signatures)], axis=1)
+
+
+def _jaccard(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Exact Jaccard similarity of each (left, right) pair of shared profiles.
+
+    Both sides' applications are tagged with the pair index and sorted;
+    a tag that appears twice is an application the pair shares.
+    """
+    apps, offsets, lengths = _shared["apps"], _shared["offsets"], _shared["lengths"]
+    width = int(apps.max()) + 1
+    pair = np.arange(len(left))
+    tags = np.concatenate([
+        np.repeat(pair, lengths[left]) * width + apps[_ranges(offsets[left], lengths[left])],
+        np.repeat(pair, lengths[right]) * width + apps[_ranges(offsets[right], lengths[right])],
+    ])
+    tags.sort()
+    shared = tags[1:][tags[1:] == tags[:-1]] // width
+    inter = np.bincount(shared, minlength=len(left))
+    return inter / (lengths[left] + lengths[right] - inter)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int):
+        x, y = self.find(x), self.find(y)
+        if x != y:
+            self.parent[max(x, y)] = min(x, y)
+
+
+def _roles(labels, apps, lengths, weights, support: float, min_users: int) -> list[dict]:
+    """The role each cluster of at least ``min_users`` users proposes, with coverage."""
+    cluster_users = np.bincount(labels, weights=weights).astype(np.int64)
+    cluster_profiles = np.bincount(labels)
+    cluster_grants = np.bincount(labels, weights=weights * lengths).astype(np.int64)
+    profile_of = np.repeat(np.arange(len(lengths)), lengths)
+    width = int(apps.max()) + 1
+    # Cells sort by cluster, so each cluster's role applications are contiguous.
+    cells, inverse = np.unique(labels[profile_of] * width + apps, return_inverse=True)
+    holders = np.bincount(inverse, weights=weights[profile_of]).astype(np.int64)
+    cell_cluster = cells // width
+    in_role = (cluster_users[cell_cluster] >= min_users) & (holders >= support * cluster_users[cell_cluster])
+    cells, holders, cell_cluster = cells[in_role], holders[in_role], cell_cluster[in_role]
+
+    roles = []
+    clusters, starts, counts = np.unique(cell_cluster, return_index=True, return_counts=True)
+    for cluster, start, count in zip(clusters.tolist(), starts.tolist(), counts.tolist()):
+        users = int(cluster_users[cluster])
+        covered = int(holders[start:start + count].sum())
+        roles.append({
+            "applications": (cells[start:start + count] % width).tolist(),
+            "users": users,
+            "profiles": int(cluster_profiles[cluster]),
+            "covered_grants": covered,
+            # Share of the cluster's grants the role would replace.
+            "coverage": round(covered / int(cluster_grants[cluster]), 4),
+            # Grants the role would add for members missing one of its applications.
+            "extra_grants": users * count - covered,
+        })
+    roles.sort(key=lambda r: (-r["covered_grants"], r["applications"]))
+    return roles
+
+
+def mine_roles(
+    user_ids: np.ndarray,
+    app_ids: np.ndarray,
+    similarity: float = SIMILARITY,
+    support: float = SUPPORT,
+    min_users: int = MIN_USERS,
+    bands: int = BANDS,
+    rows: int = ROWS,
+    processes: int = 1,
+    limit: int = 100,
+) -> dict:
+    """Candidate roles from (user_id, application_id) grant columns."""
+    timings = {}
+    t0 = time.perf_counter()
+    apps, offsets, lengths, weights = _profiles(user_ids, app_ids)
+    timings["profiles"] = time.perf_counter() - t0
+    result = {"users": int(weights.sum()), "grants": int((lengths * weights).sum()),
+              "profiles": len(lengths), "candidate_pairs": 0, "verified_pairs": 0, "clusters": 0}
+    if not len(lengths):
+        return {**result, "coverage": 0.0, "roles": [], "seconds": timings}
+
+    pool = None
+    if processes > 1:
+        pool = ProcessPoolExecutor(processes, initializer=_share, initargs=(apps, offsets, lengths))
+    else:
+        _share(apps, offsets, lengths)
+    run = pool.map if pool else map
+    try:
+        t0 = time.perf_counter()
+        chunks = list(_chunks(lengths, _CHUNK))
+        signatures = np.concatenate(list(run(
+            _signatures,
+            [apps[offsets[s]:offsets[e - 1] + lengths[e - 1]] for s, e in chunks],
+            [lengths[s:e] for s, e in chunks],
+            [bands * rows] * len(chunks),
+        )))
+        timings["minhash"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        pairs = _candidates(signatures, bands, rows)
+        timings["lsh"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batches = [(pairs[s:e, 0], pairs[s:e, 1]) for s, e in _chunks(lengths[pairs[:, 0]] * 2, _CHUNK)]
+        scores = list(run(_jaccard, *zip(*batches))) if batches else []
+        verified = pairs[np.concatenate(scores) >= similarity] if scores else pairs
+        timings["verify"] = time.perf_counter() - t0
+    finally:
+        if pool:
+            pool.shutdown()
+        _shared.clear()
+
+    t0 = time.perf_counter()
+    forest = _UnionFind(len(lengths))
+    for left, right in verified.tolist():
+        forest.union(left, right)
+    labels = np.fromiter(map(forest.find, range(len(lengths))), dtype=np.int64, count=len(lengths))
+    timings["union_find"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    roles = _roles(labels, apps, lengths, weights, support, min_users)
+    timings["roles"] = time.perf_counter() - t0
+    return {
+        **result,
+        "candidate_pairs": len(pairs),
+        "verified_pairs": len(verified),
+        "clusters": len(roles),
+        "coverage": round(sum(r["covered_grants"] for r in roles) / max(result["grants"], 1), 4),
+        "roles": roles[:limit],
+        "seconds": {k: round(v, 3) for k, v in timings.items()},
+    }
+
+
+class RoleMiningService:
+    @staticmethod
+    def mine(db: Session, processes: int = None, **options) -> dict:
+        """Mine candidate roles from active grants; ``options`` go to ``mine_roles``."""
+        grants = select(models.Access.user_id, models.Access.application_id).where(models.Access.active == True)
+        user_ids, app_ids = fetch_columns(db, grants, (np.int64, np.int64))
+        result = mine_roles(user_ids, app_ids, processes=processes or settings.ROLE_MINING_PROCESSES, **options)
+        app_ids = {a for role in result["roles"] for a in role["applications"]}
+        names = dict(db.query(models.Application.id, models.Application.name).filter(
+            models.Application.id.in_(app_ids)
+        ).all()) if app_ids else {}
+        for role in result["roles"]:
+            role["application_names"] = [names.get(a) for a in role["applications"]]
+        return result
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from backend.db import models, schemas
+from backend.utils.http_cache import collection_versions
 
 class RoleService:
     @staticmethod
@@ -9,6 +10,7 @@ class RoleService:
             raise HTTPException(400, "Role already exists")
         db_role = models.Role(name=role.name)
         db.add(db_role)
+        collection_versions.bump(db, "roles")
         db.commit()
         db.refresh(db_role)
         return db_role
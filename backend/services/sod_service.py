@@ -0,0 +1,170 @@
+import re
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from backend.db import models, schemas
+
+RULE_KINDS = ("application", "role")
+_BATCH = 5000
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def build_bitsets(pairs) -> dict[int, int]:
+    """Turn (key, user_id) pairs into one user bitset per key.
+
+    User ids are dense primary keys, so they are used directly as bit
+    positions. Bits are set in a bytearray and converted once, which keeps
+    construction linear instead of re-allocating a big int per pair.
+    """
+    buffers: dict[int, bytearray] = {}
+    for key, user_id in pairs:
+        buf = buffers.get(key)
+        if buf is None:
+            buf = buffers[key] = bytearray()
+        byte = user_id >> 3
+        if byte >= len(buf):
+            buf.extend(bytes(byte - len(buf) + 1))
+        buf[byte] |= 1 << (user_id & 7)
+    return {key: int.from_bytes(buf, "little") for key, buf in buffers.items()}
+
+
+def iter_bits(bits: int):
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    # Violations are sparse; let the regex engine skip the empty bytes.
+    for match in _NONZERO.finditer(data):
+        i, byte = match.start(), data[match.start()]
+        while byte:
+            low = byte & -byte
+            yield (i << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def evaluate(rules, app_bits: dict[int, int], role_bits: dict[int, int]) -> dict[int, list[int]]:
+    """Evaluate (rule_id, kind, left_id, right_id) rules against bitsets.
+
+    Returns the violating user ids per rule; one AND per rule covers the
+    whole population.
+    """
+    result = {}
+    for rule_id, kind, left_id, right_id in rules:
+        bits = app_bits if kind == "application" else role_bits
+        result[rule_id] = list(iter_bits(bits.get(left_id, 0) & bits.get(right_id, 0)))
+    return result
+
+
+def _rule_tuples(rules):
+    return [(r.id, r.kind, r.left_id, r.right_id) for r in rules]
+
+
+class SodService:
+    @staticmethod
+    def create_rule(db: Session, rule: schemas.SodRuleCreate):
+        if rule.kind not in RULE_KINDS:
+            raise HTTPException(400, f"kind must be one of {', '.join(RULE_KINDS)}")
+        if rule.left_id == rule.right_id:
+            raise HTTPException(400, "A rule needs two different sides")
+        target = models.Application if rule.kind == "application" else models.Role
+        found = db.query(target.id).filter(target.id.in_([rule.left_id, rule.right_id])).count()
+        if found != 2:
+            raise HTTPException(404, f"{target.__name__} not found")
+        if db.query(models.SodRule).filter(models.SodRule.name == rule.name).first():
+            raise HTTPException(400, "Rule already exists")
+
+        db_rule = models.SodRule(**rule.model_dump())
+        db.add(db_rule)
+        db.commit()
+        db.refresh(db_rule)
+        SodService.evaluate_rules(db, [db_rule])
+        return db_rule
+
+    @staticmethod
+    def list_rules(db: Session):
+        return db.query(models.SodRule).all()
+
+    @staticmethod
+    def list_violations(db: Session, rule_id: int = None, user_id: int = None):
+        query = db.query(models.SodViolation)
+        if rule_id:
+            query = query.filter(models.SodViolation.rule_id == rule_id)
+        if user_id:
+            query = query.filter(models.SodViolation.user_id == user_id)
+        return query.all()
+
+    @staticmethod
+    def evaluate_rules(db: Session, rules=None):
+        """Bulk re-evaluation of ``rules`` (default: all) over the whole population."""
+        if rules is None:
+            rules = db.query(models.SodRule).all()
+        if not rules:
+            return {"rules": 0, "violations": 0, "added": 0, "removed": 0}
+
+        app_ids = {i for r in rules if r.kind == "application" for i in (r.left_id, r.right_id)}
+        role_ids = {i for r in rules if r.kind == "role" for i in (r.left_id, r.right_id)}
+        app_bits = build_bitsets(
+            db.query(models.Access.application_id, models.Access.user_id)
+            .filter(models.Access.active == True, models.Access.application_id.in_(app_ids))
+            .yield_per(_BATCH)
+        ) if app_ids else {}
+        role_bits = build_bitsets(
+            db.query(models.UserRole.role_id, models.UserRole.user_id)
+            .filter(models.UserRole.role_id.in_(role_ids))
+            .yield_per(_BATCH)
+        ) if role_ids else {}
+
+        found = evaluate(_rule_tuples(rules), app_bits, role_bits)
+        wanted = {(rule_id, user_id) for rule_id, users in found.items() for user_id in users}
+        existing = set(
+            db.query(models.SodViolation.rule_id, models.SodViolation.user_id)
+            .filter(models.SodViolation.rule_id.in_(list(found)))
+            .all()
+        )
+        added, removed = SodService._apply(db, wanted - existing, existing - wanted)
+        db.commit()
+        return {"rules": len(rules), "violations": len(wanted), "added": added, "removed": removed}
+
+    @staticmethod
+    def evaluate_user(db: Session, user_id: int):
+        """Incremental path for a single grant or role change. Runs inside the
+        change's transaction, so the violation lands or rolls back with the
+        grant; the caller owns the commit."""
+        db.flush()  # sessions do not autoflush; the grant must be visible
+        rules = db.query(models.SodRule).all()
+        if not rules:
+            return
+        apps = {a for (a,) in db.query(models.Access.application_id).filter(
+            models.Access.user_id == user_id, models.Access.active == True
+        )}
+        roles = {r for (r,) in db.query(models.UserRole.role_id).filter(models.UserRole.user_id == user_id)}
+
+        wanted = set()
+        for rule in rules:
+            held = apps if rule.kind == "application" else roles
+            if rule.left_id in held and rule.right_id in held:
+                wanted.add((rule.id, user_id))
+        existing = set(
+            db.query(models.SodViolation.rule_id, models.SodViolation.user_id)
+            .filter(models.SodViolation.user_id == user_id)
+            .all()
+        )
+        SodService._apply(db, wanted - existing, existing - wanted)
+
+    @staticmethod
+    def _apply(db: Session, to_add: set, to_remove: set):
+        if not to_add and not to_remove:
+            return 0, 0
+        now = datetime.utcnow()
+        rows = [{"rule_id": r, "user_id": u, "detected_at": now} for r, u in to_add]
+        for i in range(0, len(rows), _BATCH):
+            db.execute(insert(models.SodViolation), rows[i:i + _BATCH])
+
+        by_rule: dict[int, list[int]] = {}
+        for rule_id, user_id in to_remove:
+            by_rule.setdefault(rule_id, []).append(user_id)
+        for rule_id, user_ids in by_rule.items():
+            for i in range(0, len(user_ids), _BATCH):
+                db.query(models.SodViolation).filter(
+                    models.SodViolation.rule_id == rule_id,
+                    models.SodViolation.user_id.in_(user_ids[i:i + _BATCH]),
+                ).delete(synchronize_session=False)
+        return len(rows), len(to_remove)
@@ -1,5 +1,11 @@
+from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.db import models, schemas
+from backend.services.access_graph import access_graph
+from backend.services.access_history import record_versions, valid_at
+from backend.services.change_feed import record_changes
+from backend.services.peer_outlier_service import PeerOutlierService
 from fastapi import HTTPException
 
 class UserService:
@@ -25,10 +31,16 @@ class UserService:
         return db.query(models.User).filter(models.User.id == user_id).first()
 
     @staticmethod
-    def list_users(db: Session, application_id: int = None):
-        query = db.query(models.User)
+    def list_users(db: Session, application_id: int = None, columns=None, as_of: datetime = None):
+        query = db.query(*columns) if columns else db.query(models.User)
+        if as_of:
+            # Users holding a grant (of the application) at as_of.
+            held = select(models.AccessVersion.user_id).where(valid_at(as_of))
+            if application_id:
+                held = held.where(models.AccessVersion.application_id == application_id)
+            return query.filter(models.User.id.in_(held)).all()
         if application_id:
-            query = query.join(models.Access).filter(models.Access.application_id == application_id)
+            query = query.join(models.Access, models.Access.user_id == models.User.id).filter(models.Access.application_id == application_id)
         return query.all()
 
     @staticmethod
@@ -52,6 +64,23 @@ class UserService:
         if not db_user:
             raise HTTPException(404, "User not found")
         
+        # Grants and role assignments go with the user (cascade); log them first.
+        record_changes(db, "access", "delete", [
+            {"entity_id": a.id, "user_id": a.user_id, "application_id": a.application_id, "active": bool(a.active)}
+            for a in db_user.accesses
+        ])
+        record_changes(db, "user_role", "unassign", [
+            {"entity_id": ur.id, "user_id": ur.user_id, "role_id": ur.role_id}
+            for ur in db_user.roles
+        ])
+        record_versions(db, [a for a in db_user.accesses if a.active], False)
+        PeerOutlierService.remove_user(db, user_id)
+        # Derived rows pointing at the user or their grants go in the same transaction.
+        grants = select(models.Access.id).where(models.Access.user_id == user_id)
+        db.query(models.AccessFinding).filter(models.AccessFinding.access_id.in_(grants)).delete(synchronize_session=False)
+        db.query(models.PeerOutlier).filter(models.PeerOutlier.user_id == user_id).delete(synchronize_session=False)
+        db.query(models.SodViolation).filter(models.SodViolation.user_id == user_id).delete(synchronize_session=False)
         db.delete(db_user)
         db.commit()
+        access_graph.invalidate()
         return {"message": "User deleted"}
@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway database before any backend module is imported.
+_tmp_dir = tempfile.mkdtemp(prefix="acm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test.db"
+# Per-user rate limits are covered by test_admission with their own app.
+os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.db.database import SessionLocal  # noqa: E402
+from backend.db import models, migrations  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.services import archive_service  # noqa: E402
+from backend.services.access_graph import access_graph  # noqa: E402
+from backend.utils.http_cache import collection_versions  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    migrations.reset()
+    archive_service._decoded_items.clear()
+    access_graph.invalidate()
+    collection_versions.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def workflow(db):
+    """One application with a full approver chain and two granted users."""
+    users = [
+        models.User(business_user_id="IPAMC002", name="App Manager", email="am@example.com"),
+        models.User(business_user_id="IPAMC003", name="App Owner", email="ao@example.com"),
+        models.User(business_user_id="IPAMC004", name="Biz Owner", email="bo@example.com"),
+        models.User(business_user_id="IPAMC005", name="Test User", email="user1@example.com"),
+        models.User(business_user_id="IPAMC006", name="Other User", email="user2@example.com"),
+    ]
+    db.add_all(users)
+    app_row = models.Application(name="Critical App", description="Test Application")
+    db.add(app_row)
+    db.commit()
+
+    am, ao, bo, user1, user2 = users
+    db.add(models.AppManagerMap(app_id=app_row.id, user_id=am.id))
+    db.add(models.AppOwnerMap(app_id=app_row.id, user_id=ao.id))
+    db.add(models.BusinessOwnerMap(app_id=app_row.id, user_id=bo.id))
+    db.add(models.Access(user_id=user1.id, application_id=app_row.id, active=True))
+    db.add(models.Access(user_id=user2.id, application_id=app_row.id, active=True))
+    db.commit()
+    return {"am": am.id, "ao": ao.id, "bo": bo.id, "users": [user1.id, user2.id], "app": app_row.id}
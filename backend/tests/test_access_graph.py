@@ -0,0 +1,67 @@
+import random
+
+from backend.db import models
+from backend.services.access_graph import _Adjacency, access_graph
+from backend.services.access_service import AccessService
+from backend.utils.http_cache import collection_versions
+
+
+def test_adjacency_overlay_matches_set_model():
+    rng = random.Random(7)
+    edges = {(rng.randrange(50), rng.randrange(30)) for _ in range(400)}
+    adj = _Adjacency.from_edges(edges)
+    for _ in range(3000):
+        edge = (rng.randrange(60), rng.randrange(30))
+        if rng.random() < 0.5:
+            adj.add(*edge)
+            edges.add(edge)
+        else:
+            adj.remove(*edge)
+            edges.discard(edge)
+        if adj.needs_compaction():
+            adj = adj.compacted()
+    for src in range(60):
+        assert adj.neighbours(src) == sorted(d for s, d in edges if s == src)
+    assert len(adj) == len(edges)
+
+
+def test_graph_endpoints_follow_writes(client, workflow):
+    user1, user2 = workflow["users"]
+    app_id = workflow["app"]
+
+    resp = client.get(f"/graph/applications/{app_id}/users").json()
+    assert resp["user_ids"] == [user1, user2]
+    version = resp["version"]
+
+    access = client.get("/access/", params={"user_id": user1}).json()[0]
+    client.post(f"/access/{access['id']}/revoke")
+
+    resp = client.get(f"/graph/applications/{app_id}/users").json()
+    assert resp["user_ids"] == [user2]
+    assert resp["version"] > version
+    assert client.get(f"/graph/users/{user1}/applications").json()["application_ids"] == []
+
+    approvers = client.get(f"/graph/applications/{app_id}/approvers").json()
+    assert approvers["app_manager"] == [workflow["am"]]
+    client.post("/mappings/app-owner", json={"app_id": app_id, "user_id": user2})
+    approvers = client.get(f"/graph/applications/{app_id}/approvers").json()
+    assert approvers["app_owner"] == sorted([workflow["ao"], user2])
+
+
+def test_graph_catches_up_on_other_workers_writes(client, db, workflow, monkeypatch):
+    user1, user2 = workflow["users"]
+    app_id = workflow["app"]
+    assert client.get(f"/graph/applications/{app_id}/users").json()["user_ids"] == [user1, user2]
+    monkeypatch.setattr(access_graph, "sync_seconds", 0)
+
+    # Writes that never touch this process's snapshot, as from another worker.
+    access = db.query(models.Access).filter(models.Access.user_id == user1).one()
+    AccessService.bulk_revoke(db, [access.id])
+    db.add(models.AppOwnerMap(app_id=app_id, user_id=user2))
+    collection_versions.bump(db, "app_owner_map")
+    db.commit()
+
+    assert client.get(f"/graph/applications/{app_id}/users").json()["user_ids"] == [user2]
+    assert client.get(f"/graph/users/{user1}/applications").json()["application_ids"] == []
+    approvers = client.get(f"/graph/applications/{app_id}/approvers").json()
+    assert approvers["app_owner"] == sorted([workflow["ao"], user2])
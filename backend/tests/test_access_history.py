@@ -0,0 +1,89 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from backend.db import models
+from backend.services.access_history import OPEN, backfill_versions
+from backend.services.access_service import AccessService
+from backend.services.user_service import UserService
+
+
+def _instant():
+    """A timestamp strictly between the writes around it."""
+    time.sleep(0.002)
+    moment = datetime.utcnow()
+    time.sleep(0.002)
+    return moment.isoformat()
+
+
+def _held(client, **params):
+    return {(a["user_id"], a["application_id"]) for a in client.get("/access/", params=params).json()}
+
+
+def test_as_of_follows_revocations_and_restores(client, db, workflow):
+    user1, user2 = workflow["users"]
+    # The fixture writes access rows directly; the migration backfill opens them once.
+    assert backfill_versions(db.connection()) == 2
+    assert backfill_versions(db.connection()) == 0
+    db.commit()
+    ledger = client.post("/applications/", json={"name": "Ledger"}).json()["id"]
+
+    before = _instant()
+    grant = client.post("/access/", json={"user_id": user1, "application_id": ledger}).json()
+    granted = _instant()
+    client.post(f"/access/{grant['id']}/revoke")
+    client.post(f"/access/{grant['id']}/revoke")  # already revoked: no new interval
+    revoked = _instant()
+    client.put(f"/access/{grant['id']}", json={"active": True})
+    restored = _instant()
+
+    assert _held(client, application_id=ledger, as_of=before) == set()
+    assert _held(client, application_id=ledger, as_of=granted) == {(user1, ledger)}
+    assert _held(client, application_id=ledger, as_of=revoked) == set()
+    assert _held(client, application_id=ledger, as_of=restored) == {(user1, ledger)}
+    row = client.get("/access/", params={"user_id": user1, "application_id": ledger, "as_of": granted}).json()
+    assert row == [{"user_id": user1, "application_id": ledger, "id": grant["id"], "active": True,
+                    "created_at": grant["created_at"]}]
+    assert db.query(models.AccessVersion).filter(models.AccessVersion.access_id == grant["id"]).count() == 2
+
+    users = client.get("/users/", params={"application_id": ledger, "as_of": granted}).json()
+    assert [u["id"] for u in users] == [user1]
+    assert {u["id"] for u in client.get("/users/", params={"as_of": revoked}).json()} == {user1, user2}
+
+    # An offset timestamp names the same instant as its naive UTC form.
+    for moment in (before, granted, revoked):
+        shifted = datetime.fromisoformat(moment).replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=5)))
+        assert _held(client, application_id=ledger, as_of=shifted.isoformat()) == \
+            _held(client, application_id=ledger, as_of=moment)
+
+    # Bulk paths and user deletion close intervals too. Deleted users drop
+    # out of both as-of lists, though their versions are kept.
+    AccessService.bulk_revoke(db, [grant["id"]])
+    db.commit()
+    client.delete(f"/users/{user2}")
+    after = _instant()
+    assert _held(client, as_of=after) == {(user1, workflow["app"])}
+    assert _held(client, as_of=restored) == {(user1, workflow["app"]), (user1, ledger)}
+    assert {u["id"] for u in client.get("/users/", params={"as_of": restored}).json()} == {user1}
+    assert db.query(models.AccessVersion).filter(models.AccessVersion.user_id == user2).count() == 1
+    assert db.query(models.AccessVersion).filter(models.AccessVersion.valid_to == OPEN).count() == 1
+
+
+def test_as_of_uses_interval_indexes(db, workflow):
+    statements = []
+    capture = lambda conn, cursor, sql, params, context, many: statements.append((sql, params))
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for params in ({}, {"user_id": 1}, {"application_id": 1}):
+            assert AccessService.list_access(db, as_of=datetime.utcnow(), **params) == []
+        UserService.list_users(db, as_of=datetime.utcnow())
+        UserService.list_users(db, application_id=1, as_of=datetime.utcnow())
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 5
+    for sql, params in statements:
+        plan = " ".join(str(row[-1]) for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+        assert "INDEX ix_access_version_" in plan, plan
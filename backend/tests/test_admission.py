@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from backend.middleware.admission import BULK, INTERACTIVE, STANDARD, STREAM, AdmissionMiddleware, MemoryBuckets, classify
+from backend.routers.auth import create_access_token
+
+
+def test_classify_routes():
+    assert classify("POST", "/review/app-owner/action") == INTERACTIVE
+    assert classify("GET", "/review/items") == BULK
+    assert classify("POST", "/dashboard/app-manager/users") == STANDARD
+    assert classify("GET", "/review/app-manager/items") == STANDARD
+    assert classify("GET", "/changes/stream") == STREAM
+    assert classify("GET", "/docs") is None
+    assert classify("OPTIONS", "/review/items") is None
+
+
+def test_token_bucket_refills_at_rate():
+    buckets = MemoryBuckets()
+    take = lambda cost, now: asyncio.run(buckets.take("k", cost, rate=2.0, burst=4.0, now=now))  # noqa: E731
+    assert [take(1, 0.0) for _ in range(4)] == [0.0] * 4
+    assert take(1, 0.0) == 0.5
+    assert take(1, 0.5) == 0.0
+    assert take(5, 0.5) > 0  # a bulk cost above the burst never fits
+
+
+def _app(**kwargs):
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/review/items")
+    async def heavy():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/review/app-manager/action")
+    async def act():
+        return {"ok": True}
+
+    @app.get("/roles/")
+    async def roles():
+        return []
+
+    app.add_middleware(AdmissionMiddleware, **kwargs)
+    return app, release
+
+
+def test_rate_limit_is_per_user_with_retry_after():
+    app, _ = _app(rate=1.0, burst=2.0, buckets=MemoryBuckets())
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': 'IPAMC1'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': 'IPAMC2'})}"}
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as c:
+            statuses = [(await c.get("/roles/", headers=alice)).status_code for _ in range(3)]
+            limited = await c.get("/roles/", headers=alice)
+            other = await c.get("/roles/", headers=bob)
+            return statuses, limited, other
+
+    statuses, limited, other = asyncio.run(run())
+    assert statuses == [200, 200, 429]
+    assert limited.status_code == 429 and int(limited.headers["retry-after"]) >= 1
+    assert other.status_code == 200
+
+
+def test_interactive_actions_keep_reserved_slots():
+    app, release = _app(limit=3, reserve=1, bulk_limit=2, max_wait=0.05, rate=0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as c:
+            heavy = [asyncio.create_task(c.get("/review/items")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            rejected_bulk = await c.get("/review/items")
+            rejected_standard = await c.get("/roles/")
+            action = await c.post("/review/app-manager/action")
+            release.set()
+            done = await asyncio.gather(*heavy)
+            after = await c.get("/roles/")
+            return rejected_bulk, rejected_standard, action, done, after
+
+    rejected_bulk, rejected_standard, action, done, after = asyncio.run(run())
+    assert rejected_bulk.status_code == 429 and rejected_bulk.headers["retry-after"] == "1"
+    assert rejected_standard.status_code == 429
+    assert action.status_code == 200
+    assert [r.status_code for r in done] == [200, 200]
+    assert after.status_code == 200
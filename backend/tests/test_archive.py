@@ -0,0 +1,77 @@
+from backend.config import settings
+from backend.db import models
+from backend.services import archive_service
+
+
+def _complete_cycle(client, workflow):
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    items = client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": workflow["am"]}).json()
+    for item in items:
+        client.post("/review/app-manager/action", json={
+            "review_item_id": item["id"], "actor_user_id": workflow["am"], "action": "Revoke",
+        })
+    return cycle_id
+
+
+def test_archive_requires_completed_items(client, workflow):
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    resp = client.post(f"/review/cycles/{cycle_id}/archive")
+    assert resp.status_code == 400
+
+
+def test_archived_cycle_reads_through_items_api(client, db, workflow):
+    cycle_id = _complete_cycle(client, workflow)
+    client.post(f"/review/cycles/{cycle_id}/execute-revocations")
+    before = client.get("/review/items", params={"cycle_id": cycle_id}).json()
+
+    resp = client.post(f"/review/cycles/{cycle_id}/archive")
+    assert resp.status_code == 200
+    assert resp.json()["items"] == 2
+    assert db.query(models.ReviewItem).filter(models.ReviewItem.cycle_id == cycle_id).count() == 0
+    assert db.query(models.ApprovalHistory).count() == 0
+
+    after = client.get("/review/items", params={"cycle_id": cycle_id}).json()
+    assert after == before
+
+    filtered = client.get("/review/items", params={"cycle_id": cycle_id, "user_id": workflow["users"][0]}).json()
+    assert [i["id"] for i in filtered] == [before[0]["id"]]
+
+    history = client.get(f"/review/cycles/{cycle_id}/history").json()
+    assert {h["stage"] for h in history} == {"app_manager"}
+    assert client.post(f"/review/cycles/{cycle_id}/archive").status_code == 400
+
+
+def test_archive_waits_for_revocations_to_execute(client, db, workflow):
+    cycle_id = _complete_cycle(client, workflow)
+    resp = client.post(f"/review/cycles/{cycle_id}/archive")
+    assert resp.status_code == 400 and "2 revocations" in resp.json()["detail"]
+    assert db.query(models.ReviewItem).filter(models.ReviewItem.cycle_id == cycle_id).count() == 2
+
+    assert client.post(f"/review/cycles/{cycle_id}/execute-revocations").json()["revoked"] == 2
+    assert client.post(f"/review/cycles/{cycle_id}/archive").status_code == 200
+    assert client.post(f"/review/cycles/{cycle_id}/execute-revocations").status_code == 400
+    assert db.query(models.Access).filter(models.Access.active == True).count() == 0
+
+
+def test_archived_items_sort_and_bounded_cache(client, db, workflow, monkeypatch):
+    cycle_id = _complete_cycle(client, workflow)
+    client.post(f"/review/cycles/{cycle_id}/execute-revocations")
+    db.query(models.ReviewItem).filter(models.ReviewItem.cycle_id == cycle_id).update(
+        {models.ReviewItem.risk_score: models.ReviewItem.id * 10}, synchronize_session=False)
+    db.commit()
+    params = {"cycle_id": cycle_id, "sort": "risk"}
+    live = client.get("/review/items", params=params).json()
+    assert [i["risk_score"] for i in live] == [20, 10]
+    client.post(f"/review/cycles/{cycle_id}/archive")
+
+    assert client.get("/review/items", params=params).json() == live
+    assert client.get("/review/items", params={**params, "sort": "age"}).status_code == 400
+    assert client.get("/review/items", params={"cycle_id": cycle_id, "outliers": True}).status_code == 400
+
+    # Only cycles within the item budget stay decoded in memory.
+    assert list(archive_service._decoded_items) == [cycle_id]
+    archive_service._decoded_items.clear()
+    monkeypatch.setattr(settings, "ARCHIVE_CACHE_ITEMS", 1)
+    assert len(client.get("/review/items", params={"cycle_id": cycle_id}).json()) == 2
+    assert not archive_service._decoded_items
+
@@ -0,0 +1,16 @@
+from backend.db import models
+from backend.routers.auth import get_password_hash
+
+
+def test_login_issues_token_for_valid_password(client, db):
+    db.add(models.User(business_user_id="IPAMC100", name="Admin", email="admin@example.com",
+                       hashed_password=get_password_hash("s3cret")))
+    db.add(models.User(business_user_id="IPAMC101", name="No Login", email="nologin@example.com"))
+    db.commit()
+
+    resp = client.post("/token", data={"username": "IPAMC100", "password": "s3cret"})
+    assert resp.status_code == 200
+    assert resp.json()["token_type"] == "bearer"
+
+    assert client.post("/token", data={"username": "IPAMC100", "password": "wrong"}).status_code == 401
+    assert client.post("/token", data={"username": "IPAMC101", "password": "anything"}).status_code == 401
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import threading
+
+from backend.db import schemas
+from backend.db.database import SessionLocal
+from backend.main import app
+from backend.services.access_service import AccessService
+
+
+def _ops(changes):
+    return [(c["entity"], c["op"]) for c in changes]
+
+
+def test_feed_records_grants_roles_and_decisions(client, workflow):
+    user1, user2 = workflow["users"]
+    new_app = client.post("/applications/", json={"name": "Payroll"}).json()["id"]
+    granted = client.post("/access/", json={"user_id": user1, "application_id": new_app}).json()
+    client.post(f"/access/{granted['id']}/revoke")
+    # Repeating a state the grant already has is not a change.
+    client.post(f"/access/{granted['id']}/revoke")
+    client.put(f"/access/{granted['id']}", json={"active": False})
+    role = client.post("/roles/", json={"name": "Auditor"}).json()["id"]
+    client.post("/user-roles/assign", json={"user_id": user2, "role_id": role})
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    client.post("/review/app-manager/action",
+                json={"review_item_id": 1, "actor_user_id": workflow["am"], "action": "Revoke"})
+
+    page = client.get("/changes/").json()
+    assert _ops(page["changes"]) == [
+        ("access", "create"), ("access", "revoke"), ("user_role", "assign"), ("review_decision", "decision"),
+    ]
+    seqs = [c["seq"] for c in page["changes"]]
+    assert seqs == sorted(seqs) and page["next_since"] == seqs[-1] and not page["has_more"]
+    assert page["changes"][1]["payload"] == {"user_id": user1, "application_id": new_app, "active": False}
+    decision = page["changes"][3]
+    assert decision["entity_id"] == 1
+    assert decision["payload"]["final_status"] == "Revoked by App Manager"
+
+    first = client.get("/changes/", params={"limit": 2}).json()
+    assert len(first["changes"]) == 2 and first["has_more"]
+    rest = client.get("/changes/", params={"since": first["next_since"]}).json()
+    assert [c["seq"] for c in first["changes"] + rest["changes"]] == seqs
+
+    only_access = client.get("/changes/", params={"entity": "access"}).json()
+    assert _ops(only_access["changes"]) == [("access", "create"), ("access", "revoke")]
+    assert client.get("/changes/", params={"entity": "nope"}).status_code == 400
+
+
+def test_bulk_revocation_and_user_delete_are_logged(client, workflow):
+    user1, _ = workflow["users"]
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    client.post("/review/app-manager/action",
+                json={"review_item_id": 1, "actor_user_id": workflow["am"], "action": "Revoke"})
+    client.post("/review/cycles/1/execute-revocations")
+    client.delete(f"/users/{user1}")
+
+    changes = client.get("/changes/", params={"entity": "access"}).json()["changes"]
+    assert _ops(changes) == [("access", "revoke"), ("access", "delete")]
+    assert changes[0]["entity_id"] == changes[1]["entity_id"]
+    assert changes[1]["payload"]["user_id"] == user1
+
+
+def test_long_poll_waits_for_the_next_change(client, workflow):
+    assert client.get("/changes/poll", params={"timeout": 0}).json()["changes"] == []
+
+    def grant():
+        db = SessionLocal()
+        try:
+            AccessService.create_access(db, schemas.AccessCreate(user_id=workflow["am"], application_id=workflow["app"]))
+        finally:
+            db.close()
+
+    timer = threading.Timer(0.3, grant)
+    timer.start()
+    try:
+        page = client.get("/changes/poll", params={"timeout": 10}).json()
+    finally:
+        timer.join()
+    assert _ops(page["changes"]) == [("access", "create")]
+
+
+def _read_stream(path, headers=(), events=1):
+    """Call the app directly and stop after ``events`` SSE events; the TestClient
+    would wait for the (endless) stream to finish."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"testserver"), *headers], "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    body = bytearray()
+    done = asyncio.Event()
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if body.count(b"event: change") >= events:
+                done.set()
+
+    async def run():
+        await asyncio.wait_for(app(scope, receive, send), 10)
+
+    asyncio.run(run())
+    return [json.loads(line[6:]) for line in bytes(body).decode().splitlines() if line.startswith("data: ")]
+
+
+def test_stream_resumes_after_last_event_id(client, workflow):
+    user1, user2 = workflow["users"]
+    for user in (user1, user2):
+        client.post("/access/", json={"user_id": user, "application_id": workflow["app"]})
+
+    first = _read_stream("/changes/stream", events=2)
+    assert [c["payload"]["user_id"] for c in first] == [user1, user2]
+    resumed = _read_stream("/changes/stream", headers=[(b"last-event-id", str(first[0]["seq"]).encode())])
+    assert [c["seq"] for c in resumed] == [first[1]["seq"]]
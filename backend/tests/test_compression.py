@@ -0,0 +1,83 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.db import models
+from backend.middleware.compression import (
+    CompressionMiddleware,
+    available_encoders,
+    negotiate,
+    no_compression,
+)
+
+
+def _many_users(db, n=200):
+    db.add_all([
+        models.User(business_user_id=f"IPAMC{i:05d}", name=f"User {i}", email=f"user{i}@example.com")
+        for i in range(n)
+    ])
+    db.commit()
+
+
+def test_negotiate_respects_q_values_and_server_order():
+    encoders = available_encoders()
+    assert negotiate(b"gzip, deflate", encoders).name == b"gzip"
+    assert negotiate(b"gzip;q=1.0, br;q=0.5", encoders).name == b"gzip"
+    assert negotiate(b"identity", encoders) is None
+    assert negotiate(b"*;q=0", encoders) is None
+    best = negotiate(b"gzip, br, zstd", encoders)
+    assert best is next(iter(encoders.values()))
+
+
+@pytest.mark.parametrize("coding", [c.decode() for c in available_encoders()])
+def test_large_json_is_compressed(client, db, coding):
+    _many_users(db)
+    plain = client.get("/users/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    resp = client.get("/users/", headers={"Accept-Encoding": coding})
+    assert resp.headers["content-encoding"] == coding
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert int(resp.headers["content-length"]) < len(plain.content)
+    assert resp.json() == plain.json()
+
+
+def test_small_bodies_pass_through(client, db):
+    resp = client.get("/users/", headers={"Accept-Encoding": "gzip"})
+    assert resp.json() == []
+    assert "content-encoding" not in resp.headers
+    assert "Accept-Encoding" in resp.headers["vary"]
+
+
+def test_export_streams_compressed_ndjson(client, db, workflow):
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    with client.stream("GET", "/review/items/export", params={"cycle_id": cycle_id},
+                       headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        raw = b"".join(resp.iter_raw())
+    rows = [json.loads(line) for line in gzip.decompress(raw).splitlines()]
+    assert [r["access_id"] for r in rows] == [1, 2]
+    assert {r["cycle_id"] for r in rows} == {cycle_id}
+
+
+def test_no_compression_opt_out():
+    app = FastAPI()
+
+    @app.get("/plain")
+    @no_compression
+    def plain():
+        return {"data": "x" * 5000}
+
+    @app.get("/packed")
+    def packed():
+        return {"data": "x" * 5000}
+
+    app.add_middleware(CompressionMiddleware, min_size=100)
+    with TestClient(app) as c:
+        assert "content-encoding" not in c.get("/plain", headers={"Accept-Encoding": "gzip"}).headers
+        assert c.get("/packed", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
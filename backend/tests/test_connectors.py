@@ -0,0 +1,65 @@
+import json
+import sqlite3
+import time
+
+from backend.connectors.base import IO, Connector, load_connectors, write_snapshot
+from backend.connectors.scheduler import run_connectors
+from backend.db import models
+
+
+class SlowConnector(Connector):
+    kind = IO
+
+    def accounts(self):
+        time.sleep(2)
+        return []
+
+
+def test_write_snapshot_sorts_in_bounded_runs(tmp_path):
+    path = tmp_path / "snap.csv"
+    count = write_snapshot(["C", "a", "B", "C", " ", "A", "b"], str(path), chunk_size=2)
+    assert count == 5
+    assert path.read_text().split() == ["business_user_id", "A", "B", "C", "a", "b"]
+
+
+def test_scheduler_runs_connectors_into_access(db, workflow, tmp_path):
+    db.add(models.Application(name="Payroll"))
+    db.commit()
+    payroll = db.query(models.Application).filter(models.Application.name == "Payroll").one().id
+
+    export = tmp_path / "critical.csv"
+    export.write_text("login,business_user_id\nbo,IPAMC004\nu1,IPAMC005\nx,IPAMC999\n")
+    source = tmp_path / "payroll.db"
+    conn = sqlite3.connect(source)
+    conn.execute("CREATE TABLE accounts (emp TEXT)")
+    conn.executemany("INSERT INTO accounts VALUES (?)", [("IPAMC006",), ("IPAMC002",)])
+    conn.commit()
+    conn.close()
+
+    config = tmp_path / "connectors.json"
+    config.write_text(json.dumps([
+        {"name": "critical", "type": "file", "application": "Critical App", "path": str(export)},
+        {"name": "payroll", "type": "sqlite", "application": "Payroll", "path": str(source),
+         "query": "SELECT emp FROM accounts"},
+        {"name": "ghost", "type": "file", "application": "Nope", "path": str(export)},
+    ]))
+    connectors = load_connectors(str(config))
+    connectors.append(SlowConnector("slow", "Payroll", timeout=0.2))
+
+    run_ids = run_connectors(connectors, processes=1, queue_size=1)
+
+    db.expire_all()
+    runs = {r.connector: r for r in db.query(models.ConnectorRun).filter(models.ConnectorRun.id.in_(run_ids))}
+    assert {name: r.status for name, r in runs.items()} == {
+        "critical": "succeeded", "payroll": "succeeded", "ghost": "failed", "slow": "timeout",
+    }
+    critical = runs["critical"]
+    assert (critical.accounts, critical.added, critical.removed, critical.unknown_users) == (3, 1, 1, 1)
+    assert critical.extract_seconds is not None and critical.apply_seconds is not None
+
+    user1, user2 = workflow["users"]
+    active = {(a.user_id, a.application_id) for a in db.query(models.Access).filter(models.Access.active == True)}
+    assert active == {
+        (workflow["bo"], workflow["app"]), (user1, workflow["app"]),
+        (user2, payroll), (workflow["am"], payroll),
+    }
@@ -0,0 +1,32 @@
+from backend import datagen
+from backend.db import models
+from backend.db.database import engine
+
+
+def test_generators_are_deterministic():
+    profile = datagen.Profile(users=200, apps=20, roles=5, cycles=1)
+    assert list(datagen.gen_access(profile)) == list(datagen.gen_access(profile))
+    chains = datagen.approver_chains(profile)
+    assert list(datagen.gen_review(profile, chains)) == list(datagen.gen_review(profile, chains))
+    other = datagen.Profile(users=200, apps=20, roles=5, cycles=1, seed=7)
+    assert list(datagen.gen_access(profile)) != list(datagen.gen_access(other))
+
+
+def test_load_produces_a_consistent_database(client, db):
+    profile = datagen.Profile(users=300, apps=25, roles=6, cycles=2)
+    counts = datagen.load(engine, profile, batch_size=97, log=lambda msg: None)
+
+    assert db.query(models.User).count() == counts["users"] == 300
+    assert db.query(models.Access).count() == counts["access"]
+    active = db.query(models.Access).filter(models.Access.active == True).count()
+    assert counts["review_item"] == 2 * active
+    assert sum(a.user_count for a in db.query(models.Application)) == active
+
+    revoked = db.query(models.ReviewItem).filter(models.ReviewItem.final_status.in_(models.REVOKED_STATUSES)).count()
+    assert 0 < revoked < counts["review_item"] // 2
+
+    # The API serves the generated data.
+    items = client.get("/review/items", params={"cycle_id": 1}).json()
+    assert len(items) == active
+    assert len(client.get("/applications/").json()) == 25
+    assert client.get("/users/").json()[0]["business_user_id"] == "IPAMC0000001"
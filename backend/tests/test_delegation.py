@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from backend.db import models
+from backend.services.delegation_service import DelegationService
+
+
+def _delegate(client, delegator, delegate, days=7, **extra):
+    ends_at = (datetime.utcnow() + timedelta(days=days)).isoformat()
+    return client.post("/delegations/", json={"delegator_id": delegator, "delegate_id": delegate,
+                                               "ends_at": ends_at, **extra})
+
+
+def _inbox(client, stage, user_id):
+    return [i["id"] for i in client.get(f"/review/{stage}/items", params={"cycle_id": 1, "user_id": user_id}).json()]
+
+
+def test_delegate_sees_and_acts_on_delegated_items(client, db, workflow):
+    am, ao, bo = workflow["am"], workflow["ao"], workflow["bo"]
+    user1, _ = workflow["users"]
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    assert _inbox(client, "app-manager", user1) == []
+
+    created = _delegate(client, am, user1, stage="app_manager")
+    assert created.status_code == 200 and created.json()["pending_items"] == 2
+    assert _inbox(client, "app-manager", user1) == [1, 2]
+    # Stage-scoped: nothing at other stages.
+    assert not DelegationService.can_act(db, user1, "app_owner", ao)
+
+    resp = client.post("/review/app-manager/action",
+                       json={"review_item_id": 1, "actor_user_id": user1, "action": "Retain"})
+    assert resp.status_code == 200
+    hist = db.query(models.ApprovalHistory).one()
+    assert hist.actor_user_id == user1
+    # The approver keeps their own rights.
+    assert client.post("/review/app-manager/action",
+                       json={"review_item_id": 2, "actor_user_id": am, "action": "Retain"}).status_code == 200
+
+    # Chains: the app owner hands over to the business owner, who is away too.
+    _delegate(client, ao, bo)
+    _delegate(client, bo, user1, days=2)
+    assert _inbox(client, "app-owner", user1) == [1, 2]
+
+    revoked = client.post(f"/delegations/{created.json()['id']}/revoke").json()
+    assert revoked["revoked_at"] is not None
+    assert client.post("/review/app-owner/action",
+                       json={"review_item_id": 1, "actor_user_id": user1, "action": "Approve"}).status_code == 200
+    assert len(client.get("/delegations/", params={"user_id": user1, "active_only": True}).json()) == 1
+
+
+def test_delegation_windows(client, db, workflow):
+    am, ao = workflow["am"], workflow["ao"]
+    user1, user2 = workflow["users"]
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    starts_at = (datetime.utcnow() + timedelta(days=3)).isoformat()
+    assert _delegate(client, am, user1, starts_at=starts_at).status_code == 200
+    assert _inbox(client, "app-manager", user1) == []
+    later = datetime.utcnow() + timedelta(days=4)
+    assert DelegationService.can_act(db, user1, "app_manager", am, now=later)
+    assert not DelegationService.can_act(db, user1, "app_manager", am, now=later + timedelta(days=7))
+
+    # A chain only holds while every link does.
+    _delegate(client, ao, user1, days=10)
+    _delegate(client, user1, user2, days=1)
+    now = datetime.utcnow()
+    assert DelegationService.can_act(db, user2, "app_owner", ao, now=now + timedelta(hours=1))
+    assert not DelegationService.can_act(db, user2, "app_owner", ao, now=now + timedelta(days=2))
+
+    assert _delegate(client, am, am).status_code == 400
+    assert _delegate(client, am, user1, days=-1).status_code == 400
+    assert _delegate(client, am, user1, stage="auditor").status_code == 400
+    assert client.post("/review/app-manager/action",
+                       json={"review_item_id": 1, "actor_user_id": user2, "action": "Retain"}).status_code == 403
+
+
+def test_inbox_resolves_delegations_in_its_own_query(client, db, workflow):
+    statements = []
+    capture = lambda conn, cursor, sql, params, context, many: statements.append((sql, params))
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.get("/review/app-manager/items", params={"cycle_id": 1, "user_id": workflow["am"]})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    (sql, params), = [s for s in statements if "FROM review_item" in s[0]]
+    assert "effective_approver" in sql
+    plan = " ".join(str(row[-1]) for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params))
+    assert "INDEX ix_review_item_am_inbox" in plan and "INDEX ix_effective_approver_lookup" in plan, plan
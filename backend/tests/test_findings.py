@@ -0,0 +1,61 @@
+from backend.db import models
+
+
+def _kinds(client, **params):
+    return sorted((f["access_id"], f["kind"]) for f in client.get("/findings/", params=params).json())
+
+
+def test_findings_refresh_incrementally(client, db, workflow):
+    user1, user2 = workflow["users"]
+    lonely_app = client.post("/applications/", json={"name": "No Approvers"}).json()["id"]
+    lonely = client.post("/access/", json={"user_id": user1, "application_id": lonely_app}).json()["id"]
+    a1, a2 = [a["id"] for a in client.get("/access/", params={"application_id": workflow["app"]}).json()]
+
+    # Grants written through the API get their findings in the same transaction...
+    assert _kinds(client) == sorted([(lonely, "never_reviewed"), (lonely, "no_approver_chain")])
+    # ...the fixture's rows bypass it and wait for a refresh.
+    assert client.post("/findings/refresh").json()["added"] == 2
+    assert _kinds(client) == sorted([
+        (a1, "never_reviewed"), (a2, "never_reviewed"),
+        (lonely, "never_reviewed"), (lonely, "no_approver_chain"),
+    ])
+
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    item = client.get("/review/items", params={"cycle_id": cycle_id, "user_id": user1, "application_id": workflow["app"]}).json()[0]
+    client.post("/review/app-manager/action", json={"review_item_id": item["id"], "actor_user_id": workflow["am"], "action": "Revoke"})
+
+    first = db.query(models.AccessFinding).filter_by(access_id=lonely, kind="no_approver_chain").one().detected_at
+    result = client.post("/findings/refresh").json()
+    assert result == {"findings": 2, "added": 1, "resolved": 3}
+    assert _kinds(client) == sorted([(a1, "revoked_but_active"), (lonely, "no_approver_chain")])
+    db.expire_all()
+    assert db.query(models.AccessFinding).filter_by(access_id=lonely, kind="no_approver_chain").one().detected_at == first
+
+    client.post(f"/access/{a1}/revoke")
+    assert _kinds(client, kind="revoked_but_active") == []
+    assert client.post("/findings/refresh", params={"access_id": [a1]}).json()["resolved"] == 0
+    assert client.get("/findings/", params={"kind": "bogus"}).status_code == 400
+
+
+def test_refresh_reads_archived_decisions_without_decoding(client, db, workflow, monkeypatch):
+    user1, _ = workflow["users"]
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    revoked = db.query(models.Access).filter(models.Access.user_id == user1).one().id
+    for item in client.get("/review/items", params={"cycle_id": cycle_id}).json():
+        action = "Revoke" if item["access_id"] == revoked else "Retain"
+        client.post("/review/app-manager/action", json={"review_item_id": item["id"], "actor_user_id": workflow["am"], "action": action})
+    for item in client.get("/review/app-owner/items", params={"cycle_id": cycle_id, "user_id": workflow["ao"]}).json():
+        client.post("/review/app-owner/action", json={"review_item_id": item["id"], "actor_user_id": workflow["ao"], "action": "Approve"})
+    for item in client.get("/review/business-owner/items", params={"cycle_id": cycle_id, "user_id": workflow["bo"]}).json():
+        client.post("/review/business-owner/action", json={"review_item_id": item["id"], "actor_user_id": workflow["bo"], "action": "Approve"})
+    client.post(f"/review/cycles/{cycle_id}/execute-revocations")
+    assert client.post(f"/review/cycles/{cycle_id}/archive").status_code == 200
+
+    summary = {d.user_id: (d.cycle_id, d.revocations) for d in db.query(models.ArchivedDecision)}
+    assert summary == {user1: (cycle_id, 1), workflow["users"][1]: (cycle_id, 0)}
+
+    # A revoked grant switched back on is caught from the summary alone.
+    monkeypatch.setattr("backend.services.archive_service._unpack", lambda blob: 1 / 0)
+    client.put(f"/access/{revoked}", json={"active": True})
+    assert _kinds(client) == [(revoked, "revoked_but_active")]
+    assert client.post("/findings/refresh").json() == {"findings": 1, "added": 0, "resolved": 0}
@@ -0,0 +1,41 @@
+from sqlalchemy import event
+
+from backend.db.database import engine
+
+
+def test_conditional_get_returns_304_without_queries(client, db):
+    client.post("/applications/", json={"name": "Jira"})
+    first = client.get("/applications/")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert [a["name"] for a in first.json()] == ["Jira"]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/applications/", headers={"If-None-Match": etag})
+        cached = client.get("/applications/")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert cached.content == first.content
+    assert statements == []
+
+    resp = client.get("/applications/", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert resp.status_code == 304
+
+
+def test_create_bumps_version(client, db):
+    etag = client.get("/roles/").headers["etag"]
+    client.post("/roles/", json={"name": "Admin"})
+    resp = client.get("/roles/", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert [r["name"] for r in resp.json()] == ["Admin"]
+
+    etag = client.get("/mappings/app-manager").headers["etag"]
+    client.post("/mappings/app-manager", json={"app_id": 1, "user_id": 1})
+    resp = client.get("/mappings/app-manager", headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and len(resp.json()) == 1
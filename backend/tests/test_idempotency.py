@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from backend.db import models
+from backend.services.idempotency_service import IdempotencyService
+
+
+def _am_action(client, workflow, key, action="Retain"):
+    return client.post(
+        "/review/app-manager/action",
+        json={"review_item_id": 1, "actor_user_id": workflow["am"], "action": action},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_retried_action_replays_stored_response(client, db, workflow):
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+
+    first = _am_action(client, workflow, "retry-1")
+    retry = _am_action(client, workflow, "retry-1")
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert db.query(models.ApprovalHistory).count() == 1
+
+    # Same key, different payload.
+    assert _am_action(client, workflow, "retry-1", action="Revoke").status_code == 422
+    # A new key re-runs the endpoint, which now rejects the stage.
+    assert _am_action(client, workflow, "retry-2").status_code == 400
+
+
+def test_retried_onboarding_creates_one_user(client, db, workflow):
+    payload = {"name": "New Hire", "email": "new.hire@example.com", "business_user_id": "IPAMC900",
+               "application": "Critical App", "role": "Viewer", "status": "Active"}
+    for _ in range(3):
+        resp = client.post("/dashboard/app-manager/users", json=payload, headers={"Idempotency-Key": "onboard-900"})
+        assert resp.status_code == 200
+    assert db.query(models.User).filter(models.User.business_user_id == "IPAMC900").count() == 1
+
+
+def test_in_progress_and_expired_keys(client, db, workflow):
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    first = _am_action(client, workflow, "k")
+    record = db.query(models.IdempotencyRecord).one()
+
+    # Simulate an attempt that is still running.
+    record.status_code = None
+    db.commit()
+    assert _am_action(client, workflow, "k").status_code == 409
+
+    # An expired result is not replayed; the request runs again.
+    record.status_code, record.expires_at = 200, datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    resp = _am_action(client, workflow, "k")
+    assert resp.status_code == 400 and first.status_code == 200
+
+    db.expire_all()
+    assert IdempotencyService.purge_expired(db, now=datetime.utcnow() + timedelta(days=2)) == {"deleted": 1}
@@ -0,0 +1,23 @@
+import logging
+
+from backend.middleware.audit import is_sensitive
+
+
+def test_sensitive_path_matching():
+    assert is_sensitive("/access/12/revoke")
+    assert is_sensitive("/things/delete")
+    assert not is_sensitive("/access/")
+    assert not is_sensitive("/users/5")
+
+
+def test_request_id_and_audit_logging(client, workflow, caplog):
+    resp = client.get("/access/", headers={"X-Request-ID": "abc123"})
+    assert resp.headers["x-request-id"] == "abc123"
+    assert len(client.get("/").headers["x-request-id"]) == 32
+
+    access_id = resp.json()[0]["id"]
+    with caplog.at_level(logging.WARNING, logger="access_review_backend"):
+        client.post(f"/access/{access_id}/revoke", headers={"X-Request-ID": "r1"})
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("AUDIT WARN") and "[r1]" in m for m in messages)
+    assert any(m.startswith("AUDIT SUCCESS") and "[r1]" in m for m in messages)
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from sqlalchemy import create_engine, inspect, text
+
+from backend.db import migrations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_upgrade_brings_legacy_database_to_latest():
+    path = os.path.join(tempfile.mkdtemp(prefix="acm-migrate-"), "legacy.db")
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE review_item (id INTEGER PRIMARY KEY, cycle_id INTEGER NOT NULL, "
+            "access_id INTEGER NOT NULL, app_manager_id INTEGER, app_owner_id INTEGER, "
+            "business_owner_id INTEGER, pending_stage VARCHAR NOT NULL, final_status VARCHAR)"
+        ))
+
+    assert migrations.upgrade(engine) == [number for number, _, _ in migrations.MIGRATIONS]
+    assert migrations.upgrade(engine) == []
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("review_item")}
+    assert {"fulfillment_status", "fulfilled_at"} <= columns
+    assert "ix_review_item_am_inbox" in {i["name"] for i in inspector.get_indexes("review_item")}
+    assert migrations.current_version(engine) == migrations.MIGRATIONS[-1][0]
+
+
+def test_importing_the_app_does_no_database_io():
+    # A database path that cannot be opened: any connection at import fails.
+    env = dict(os.environ, DATABASE_URL="sqlite:////nonexistent-dir/acm.db", PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", "import backend.main"],
+        cwd=tempfile.mkdtemp(), env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,57 @@
+from backend import datagen
+from backend.db import models
+from backend.db.database import engine
+from backend.services.reporting_service import rebuild_closure
+
+
+def _closure(db):
+    return {(c.ancestor_id, c.descendant_id): c.depth for c in db.query(models.ReportingClosure)}
+
+
+def test_edges_extend_the_closure_and_reject_cycles(client, db, workflow):
+    am, ao, bo = workflow["am"], workflow["ao"], workflow["bo"]
+    user1, user2 = workflow["users"]
+    # Attach a subtree (ao -> user1) under a chain built bottom-up.
+    for manager, report in ((ao, user1), (bo, ao), (am, bo), (am, user2)):
+        assert client.post("/mappings/reporting", json={"manager_id": manager, "user_id": report}).status_code == 200
+
+    assert _closure(db) == {
+        (ao, user1): 1, (bo, ao): 1, (bo, user1): 2,
+        (am, bo): 1, (am, ao): 2, (am, user1): 3, (am, user2): 1,
+    }
+    # A second, shorter route keeps the shorter depth.
+    client.post("/mappings/reporting", json={"manager_id": am, "user_id": user1})
+    db.expire_all()
+    assert _closure(db)[(am, user1)] == 1
+
+    cycle = client.post("/mappings/reporting", json={"manager_id": user1, "user_id": am})
+    assert cycle.status_code == 400 and "cycle" in cycle.json()["detail"]
+
+    # The incremental result matches a full rebuild.
+    before = _closure(db)
+    with engine.begin() as conn:
+        rebuild_closure(conn)
+    db.expire_all()
+    assert _closure(db) == before
+
+    members = client.get(f"/org/{am}/members").json()
+    assert [(m["id"], m["depth"]) for m in members] == sorted([(bo, 1), (user1, 1), (user2, 1), (ao, 2)], key=lambda r: (r[1], r[0]))
+    assert {m["id"] for m in client.get(f"/org/{am}/members", params={"max_depth": 1}).json()} == {bo, user1, user2}
+
+    summary = client.get(f"/org/{bo}/access").json()
+    assert summary["members"] == 2
+    assert summary["applications"] == [{"application_id": workflow["app"], "application": "Critical App", "users": 1}]
+
+
+def test_generated_hierarchy_is_deep_and_closed(client, db):
+    profile = datagen.Profile(users=600, apps=5, roles=3, cycles=0, reports_per_manager=4)
+    datagen.load(engine, profile, log=lambda msg: None)
+
+    assert db.query(models.ReportingMap).count() == 599
+    closure = db.query(models.ReportingClosure)
+    assert closure.filter(models.ReportingClosure.ancestor_id == 1).count() == 599
+    assert max(c.depth for c in closure) >= 4
+    summary = client.get("/org/1/access").json()
+    assert sum(a["users"] for a in summary["applications"]) == db.query(models.Access).filter(
+        models.Access.active == True, models.Access.user_id != 1
+    ).count()
@@ -0,0 +1,118 @@
+from backend.db import models
+
+
+def _clerks(db, count=10):
+    """``count`` users sharing one role who all hold Ledger; the first also holds Payroll."""
+    role = models.Role(name="Clerk")
+    ledger, payroll = models.Application(name="Ledger"), models.Application(name="Payroll")
+    users = [models.User(business_user_id=f"CLERK{i}", name=f"Clerk {i}", email=f"clerk{i}@example.com")
+             for i in range(count)]
+    db.add_all([role, ledger, payroll, *users])
+    db.flush()
+    for user in users:
+        db.add(models.UserRole(user_id=user.id, role_id=role.id))
+        db.add(models.Access(user_id=user.id, application_id=ledger.id, active=True))
+    db.add(models.Access(user_id=users[0].id, application_id=payroll.id, active=True))
+    db.commit()
+    return [u.id for u in users], ledger.id, payroll.id
+
+
+def _flagged(client, **params):
+    return {(o["user_id"], o["application_id"]) for o in client.get("/outliers/", params=params).json()}
+
+
+def test_rebuild_flags_grants_few_peers_hold(client, db, workflow):
+    clerks, ledger, payroll = _clerks(db)
+    result = client.post("/outliers/rebuild").json()
+    assert result["outliers"] == 1 and result["grants"] == 13
+
+    outlier = client.get("/outliers/", params={"user_id": clerks[0]}).json()
+    assert len(outlier) == 1
+    assert (outlier[0]["application_id"], outlier[0]["holders"], outlier[0]["peers"], outlier[0]["frequency"]) == (payroll, 1, 9, 0.0)
+    # The workflow users have no roles and too few peers to judge.
+    group = db.query(models.PeerGroup).filter(models.PeerGroup.role_key == "").one()
+    assert group.members == 5
+    cell = db.query(models.PeerGroupApp).filter(models.PeerGroupApp.application_id == ledger).one()
+    assert cell.holders == 10
+
+    # Review inboxes and the dashboard join on access_id.
+    client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    items = client.get("/review/items", params={"cycle_id": 1, "outliers": True}).json()
+    assert [i["access_id"] for i in items] == [outlier[0]["access_id"]]
+    rows = client.get("/dashboard/app-manager/users").json()
+    assert {(r["id"], r["application"]) for r in rows if r["peerOutlier"]} == {(str(clerks[0]), "Payroll")}
+
+
+def test_single_grant_changes_update_their_cell(client, db, workflow):
+    clerks, _, payroll = _clerks(db)
+    client.post("/outliers/rebuild")
+
+    # A second holder: 1 of 9 peers is above the threshold, so both clear.
+    second = client.post("/access/", json={"user_id": clerks[1], "application_id": payroll}).json()
+    assert _flagged(client) == set()
+    client.post(f"/access/{second['id']}/revoke")
+    assert _flagged(client) == {(clerks[0], payroll)}
+
+    # A user created after the rebuild joins their role group.
+    newcomer = models.User(business_user_id="CLERK99", name="Clerk 99", email="clerk99@example.com")
+    db.add(newcomer)
+    db.flush()
+    db.add(models.UserRole(user_id=newcomer.id, role_id=db.query(models.Role.id).filter(models.Role.name == "Clerk").scalar()))
+    db.commit()
+    client.post("/access/", json={"user_id": newcomer.id, "application_id": workflow["app"]})
+    db.expire_all()
+    assert db.query(models.PeerGroup).filter(models.PeerGroup.role_key != "").one().members == 11
+    assert _flagged(client, application_id=workflow["app"]) == {(newcomer.id, workflow["app"])}
+
+    # The incremental state matches a full rebuild.
+    before = _flagged(client)
+    client.post("/outliers/rebuild")
+    assert _flagged(client) == before
+
+
+def test_updates_wait_for_a_rebuild_and_track_group_size(client, db, workflow):
+    clerks, ledger, payroll = _clerks(db, count=5)
+    # No rebuild yet: grant changes leave the (empty) matrix alone.
+    client.post("/access/", json={"user_id": clerks[1], "application_id": workflow["app"]})
+    assert db.query(models.PeerGroup).count() == 0 and _flagged(client) == set()
+
+    # Four peers are too few to judge Payroll...
+    client.post("/outliers/rebuild")
+    assert _flagged(client) == set()
+    # ...a fifth joining makes every cell of the group judgeable, not just the one granted.
+    newcomer = models.User(business_user_id="CLERK99", name="Clerk 99", email="clerk99@example.com")
+    db.add(newcomer)
+    db.flush()
+    db.add(models.UserRole(user_id=newcomer.id, role_id=db.query(models.Role.id).filter(models.Role.name == "Clerk").scalar()))
+    db.commit()
+    client.post("/access/", json={"user_id": newcomer.id, "application_id": ledger})
+    assert _flagged(client) == {(clerks[0], payroll), (clerks[1], workflow["app"])}
+    before = _flagged(client)
+    client.post("/outliers/rebuild")
+    assert _flagged(client) == before
+
+    # Leaving shrinks the group again.
+    client.delete(f"/users/{newcomer.id}")
+    assert _flagged(client) == set()
+
+
+def test_onboarding_and_executed_revocations_update_outliers(client, db, workflow):
+    clerks, _, payroll = _clerks(db)
+    client.post("/outliers/rebuild")
+
+    # Onboarding a second Payroll holder clears the first, as a direct grant does.
+    onboard = {"name": "Clerk 1", "email": "clerk1@example.com", "business_user_id": "IPAMC101",
+               "application": "Payroll", "role": "Clerk", "status": "Active"}
+    assert client.post("/dashboard/app-manager/users", json=onboard).status_code == 200
+    assert _flagged(client) == set()
+
+    # Revoking that grant through a review cycle flags the remaining holder again.
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    access_id = db.query(models.Access.id).filter_by(user_id=clerks[1], application_id=payroll).scalar()
+    db.query(models.ReviewItem).filter_by(cycle_id=cycle_id, access_id=access_id).update(
+        {"pending_stage": "completed", "final_status": "Revoke"})
+    db.commit()
+    assert client.post(f"/review/cycles/{cycle_id}/execute-revocations").json()["revoked"] == 1
+    assert _flagged(client) == {(clerks[0], payroll)}
+    cell = db.query(models.PeerGroupApp).filter(models.PeerGroupApp.application_id == payroll).one()
+    assert cell.holders == 1
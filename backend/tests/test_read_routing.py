@@ -0,0 +1,60 @@
+import pytest
+
+from backend.db import database, migrations
+from backend.middleware.read_routing import STICKY_COOKIE, STICKY_HEADER
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """A second, never-replicated SQLite file standing in for a lagging replica."""
+    engine = database.make_engine(f"sqlite:///{tmp_path}/replica.db")
+    migrations.upgrade(engine)
+    database.ReadSessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        database.ReadSessionLocal.configure(bind=database.read_engine)
+        engine.dispose()
+
+
+def test_reads_go_to_replica_until_client_writes(client, workflow, replica):
+    assert client.get("/access/").json() == []
+    assert STICKY_COOKIE not in client.cookies
+
+    resp = client.post("/review/start-cycle", params={"quarter": "2025-Q1"})
+    assert STICKY_COOKIE in resp.headers["set-cookie"]
+    cycle_id = resp.json()["cycle_id"]
+
+    # Same client: read-your-writes from the primary.
+    items = client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": workflow["am"]}).json()
+    assert len(items) == 2
+
+    # Another client (no cookie) is served by the replica.
+    client.cookies.clear()
+    assert client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": workflow["am"]}).json() == []
+
+
+def test_expired_sticky_cookie_reads_replica(client, workflow, replica):
+    client.cookies.set(STICKY_COOKIE, "1.0")
+    assert client.get("/access/").json() == []
+    client.cookies.set(STICKY_COOKIE, "9999999999.0")
+    assert len(client.get("/access/").json()) == 2
+
+
+def test_cross_origin_clients_echo_the_deadline_header(client, workflow, replica):
+    origin = {"Origin": "http://localhost:3000"}
+    resp = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}, headers=origin)
+    assert STICKY_HEADER in resp.headers["access-control-expose-headers"]
+    until = resp.headers[STICKY_HEADER]
+    params = {"cycle_id": resp.json()["cycle_id"], "user_id": workflow["am"]}
+
+    # The frontend's cross-site fetch() sends no cookie back...
+    client.cookies.clear()
+    assert client.get("/review/app-manager/items", params=params, headers=origin).json() == []
+    # ...but may send the header, once the preflight allows it.
+    preflight = client.options("/review/app-manager/items", headers={
+        **origin, "Access-Control-Request-Method": "GET", "Access-Control-Request-Headers": STICKY_HEADER,
+    })
+    assert preflight.status_code == 200
+    items = client.get("/review/app-manager/items", params=params, headers={**origin, STICKY_HEADER: until}).json()
+    assert len(items) == 2
@@ -0,0 +1,90 @@
+import gzip
+
+import pytest
+
+from backend.config import settings
+from backend.db import models
+from backend.services.reconciliation_service import (
+    GRANT, RESTORE, REVOKE, UNCHANGED, SnapshotError, merge, read_snapshot,
+)
+
+
+def test_merge_join_classifies_accounts():
+    granted = [
+        ("A", [(1, True)]),
+        ("B", [(2, False)]),
+        ("D", [(3, True), (4, True)]),
+        ("E", [(5, False)]),
+    ]
+    assert list(merge(["A", "B", "C"], granted)) == [
+        (UNCHANGED, "A", None),
+        (RESTORE, "B", [2]),
+        (GRANT, "C", None),
+        (REVOKE, "D", [3, 4]),
+    ]
+
+
+def _snapshot(tmp_path, monkeypatch, name, ids):
+    monkeypatch.setattr(settings, "SNAPSHOT_DIR", str(tmp_path))
+    lines = "business_user_id,account\n" + "".join(f"{i},x\n" for i in ids)
+    if name.endswith(".gz"):
+        with gzip.open(tmp_path / name, "wt") as f:
+            f.write(lines)
+    else:
+        (tmp_path / name).write_text(lines)
+
+
+def test_reconcile_applies_snapshot_in_bulk(client, db, workflow, tmp_path, monkeypatch):
+    app_id = workflow["app"]
+    user1, user2 = workflow["users"]
+    db.add(models.Access(user_id=workflow["ao"], application_id=app_id, active=False))
+    other_app = models.Application(name="Untouched")
+    db.add(other_app)
+    db.flush()
+    untouched = models.Access(user_id=user1, application_id=other_app.id, active=True)
+    db.add(untouched)
+    db.commit()
+    # am (IPAMC002) is new, ao (IPAMC003) is restored, user1 (IPAMC005) unchanged,
+    # user2 (IPAMC006) is gone and IPAMC999 is not a known user.
+    _snapshot(tmp_path, monkeypatch, "critical.csv.gz", ["IPAMC002", "IPAMC003", "IPAMC005", "IPAMC005", "IPAMC999"])
+
+    url = f"/reconciliation/applications/{app_id}"
+    preview = client.post(url, params={"snapshot": "critical.csv.gz", "dry_run": True}).json()
+    assert {k: preview[k] for k in ("added", "restored", "removed", "unchanged", "unknown_users")} == {
+        "added": 1, "restored": 1, "removed": 1, "unchanged": 1, "unknown_users": 1,
+    }
+    assert preview["samples"]["unknown_users"] == ["IPAMC999"]
+    assert db.query(models.Access).filter(models.Access.application_id == app_id, models.Access.active == True).count() == 2
+    client.post("/outliers/rebuild")
+
+    applied = client.post(url, params={"snapshot": "critical.csv.gz"}).json()
+    assert applied["added"] == 1 and not applied["dry_run"]
+    db.expire_all()
+    active = {a.user_id for a in db.query(models.Access).filter(models.Access.application_id == app_id, models.Access.active == True)}
+    assert active == {workflow["am"], workflow["ao"], user1}
+    assert db.query(models.Application).filter(models.Application.id == app_id).one().user_count == 3
+    ops = sorted(c["op"] for c in client.get("/changes/", params={"entity": "access"}).json()["changes"])
+    assert ops == ["create", "modify", "revoke"]
+    # Grant-derived state follows the bulk writes.
+    cell = db.query(models.PeerGroupApp).filter(models.PeerGroupApp.application_id == app_id).one()
+    assert cell.holders == 3
+    new_grant = db.query(models.Access).filter(models.Access.user_id == workflow["am"]).one().id
+    findings = {(f["access_id"], f["kind"]) for f in client.get("/findings/").json()}
+    assert (new_grant, "never_reviewed") in findings
+    # Only the reconciled application's grants are re-evaluated.
+    assert all(access_id != untouched.id for access_id, _ in findings)
+
+    again = client.post(url, params={"snapshot": "critical.csv.gz"}).json()
+    assert (again["added"], again["restored"], again["removed"], again["unchanged"]) == (0, 0, 0, 3)
+
+
+def test_rejects_unsorted_or_outside_snapshots(client, workflow, tmp_path, monkeypatch):
+    _snapshot(tmp_path, monkeypatch, "unsorted.csv", ["IPAMC005", "IPAMC002"])
+    url = f"/reconciliation/applications/{workflow['app']}"
+    resp = client.post(url, params={"snapshot": "unsorted.csv"})
+    assert resp.status_code == 400 and "line 3" in resp.json()["detail"]
+    assert client.post(url, params={"snapshot": "../unsorted.csv"}).status_code == 400
+    assert client.post(url, params={"snapshot": "missing.csv"}).status_code == 404
+    # Outside the API (jobs, connectors) it is a plain ValueError.
+    with pytest.raises(SnapshotError):
+        list(read_snapshot(str(tmp_path / "unsorted.csv")))
@@ -0,0 +1,33 @@
+from backend.db import models
+
+
+def test_execute_revocations_is_batched_and_rerunnable(client, db, workflow):
+    user1, user2 = workflow["users"]
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    for item in client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": workflow["am"]}).json():
+        action = "Revoke" if item["id"] == 1 else "Retain"
+        client.post("/review/app-manager/action", json={"review_item_id": item["id"], "actor_user_id": workflow["am"], "action": action})
+    item = client.get("/review/app-owner/items", params={"cycle_id": cycle_id, "user_id": workflow["ao"]}).json()[0]
+    client.post("/review/app-owner/action", json={"review_item_id": item["id"], "actor_user_id": workflow["ao"], "action": "Reject"})
+
+    result = client.post(f"/review/cycles/{cycle_id}/execute-revocations").json()
+    assert result == {"cycle_id": cycle_id, "items": 2, "revoked": 2, "already_inactive": 0, "access_missing": 0}
+    assert all(not a["active"] for a in client.get("/access/").json())
+
+    items = client.get("/review/items", params={"cycle_id": cycle_id}).json()
+    assert {i["fulfillment_status"] for i in items} == {"fulfilled"}
+
+    again = client.post(f"/review/cycles/{cycle_id}/execute-revocations").json()
+    assert again["items"] == 0
+    assert db.query(models.Access).filter(models.Access.active == True).count() == 0
+
+
+def test_execute_revocations_resolves_revoked_but_active_findings(client, db, workflow):
+    cycle_id = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()["cycle_id"]
+    item = client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": workflow["am"]}).json()[0]
+    client.post("/review/app-manager/action", json={"review_item_id": item["id"], "actor_user_id": workflow["am"], "action": "Revoke"})
+    client.post("/findings/refresh")
+    assert [f["access_id"] for f in client.get("/findings/", params={"kind": "revoked_but_active"}).json()] == [item["access_id"]]
+
+    client.post(f"/review/cycles/{cycle_id}/execute-revocations")
+    assert client.get("/findings/", params={"kind": "revoked_but_active"}).json() == []
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.db import models
+from backend.services.archive_service import ArchiveService
+from backend.services.risk_service import WEIGHTS, RiskService
+
+
+def test_start_cycle_scores_items_and_inboxes_sort_by_risk(client, db, workflow):
+    am = workflow["am"]
+    user1, user2 = workflow["users"]
+    # user2: an old grant, a role nobody else holds and a revocation last cycle.
+    role = models.Role(name="Domain Admin")
+    db.add(role)
+    db.flush()
+    db.add(models.UserRole(user_id=user2, role_id=role.id))
+    access2 = db.query(models.Access).filter(models.Access.user_id == user2).one()
+    access2.created_at = datetime.utcnow() - timedelta(days=1000)
+    old_cycle = models.ReviewCycle(quarter="2024-Q4", status="completed")
+    db.add(old_cycle)
+    db.flush()
+    db.add(models.ReviewItem(cycle_id=old_cycle.id, access_id=access2.id, pending_stage="completed",
+                             final_status="Revoked by App Manager"))
+    db.commit()
+
+    started = client.post("/review/start-cycle", params={"quarter": "2025-Q1"}).json()
+    assert started["risk"]["items"] == 2
+    cycle_id = started["cycle_id"]
+
+    items = client.get("/review/items", params={"cycle_id": cycle_id, "sort": "risk"}).json()
+    assert all(0 <= i["risk_score"] <= 100 for i in items)
+    assert items[0]["access_id"] == access2.id
+    assert items[0]["risk_score"] > items[1]["risk_score"]
+    inbox = client.get("/review/app-manager/items", params={"cycle_id": cycle_id, "user_id": am, "sort": "risk"}).json()
+    assert [i["id"] for i in inbox] == [i["id"] for i in items]
+    assert client.get("/review/items", params={"cycle_id": cycle_id, "sort": "name"}).status_code == 400
+
+    # On demand: a finding on user1's grant raises its score.
+    access1 = db.query(models.Access).filter(models.Access.user_id == user1).one()
+    before = {i["access_id"]: i["risk_score"] for i in items}
+    db.add(models.AccessFinding(access_id=access1.id, kind="never_reviewed"))
+    db.commit()
+    assert client.post(f"/review/cycles/{cycle_id}/score").json()["items"] == 2
+    db.expire_all()
+    after = db.query(models.ReviewItem).filter(models.ReviewItem.cycle_id == cycle_id,
+                                               models.ReviewItem.access_id == access1.id).one()
+    assert after.risk_score == pytest.approx(before[access1.id] + 100 * WEIGHTS["dormant"], abs=0.01)
+
+
+def test_features_are_bounded(db, workflow):
+    cycle = models.ReviewCycle(quarter="2025-Q1", status="in_progress")
+    db.add(cycle)
+    db.flush()
+    for access in db.query(models.Access):
+        db.add(models.ReviewItem(cycle_id=cycle.id, access_id=access.id, pending_stage="app_manager"))
+    db.commit()
+
+    features = RiskService.features(db, cycle.id)
+    assert len(features["item_id"]) == db.query(models.Access).count()
+    for name in WEIGHTS:
+        assert ((features[name] >= 0) & (features[name] <= 1)).all(), name
+    with pytest.raises(HTTPException):
+        RiskService.score_cycle(db, 999)
+
+
+def test_archived_revocations_keep_counting(db, workflow):
+    access2 = db.query(models.Access).filter(models.Access.user_id == workflow["users"][1]).one()
+    old_cycle = models.ReviewCycle(quarter="2024-Q4", status="completed")
+    cycle = models.ReviewCycle(quarter="2025-Q1", status="in_progress")
+    db.add_all([old_cycle, cycle])
+    db.flush()
+    db.add(models.ReviewItem(cycle_id=old_cycle.id, access_id=access2.id, pending_stage="completed",
+                             final_status="Revoked by App Owner", fulfillment_status="fulfilled"))
+    for access in db.query(models.Access):
+        db.add(models.ReviewItem(cycle_id=cycle.id, access_id=access.id, pending_stage="app_manager"))
+    db.commit()
+
+    before = RiskService.features(db, cycle.id)["past_revocations"]
+    ArchiveService.archive_cycle(db, old_cycle.id)
+    after = RiskService.features(db, cycle.id)["past_revocations"]
+    assert before.max() > 0
+    assert after.tolist() == before.tolist()
@@ -0,0 +1,55 @@
+import numpy as np
+
+from backend.db import models
+from backend.services.role_mining_service import RoleMiningService, mine_roles
+
+ARCHETYPES = [[1, 2, 3, 4], [10, 11, 12], [20, 21, 22, 23, 24]]
+
+
+def _grants(per_archetype=30):
+    """Users drawn from ``ARCHETYPES``: every third holds one extra app and
+    every fifth lacks the archetype's first app."""
+    user_ids, app_ids = [], []
+    user = 0
+    for apps in ARCHETYPES:
+        for i in range(per_archetype):
+            user += 1
+            held = set(apps)
+            if i % 3 == 0:
+                held.add(100 + i)
+            if i % 5 == 0:
+                held.discard(apps[0])
+            user_ids += [user] * len(held)
+            app_ids += sorted(held)
+    return np.array(user_ids), np.array(app_ids)
+
+
+def test_mine_roles_recovers_archetypes():
+    user_ids, app_ids = _grants()
+    result = mine_roles(user_ids, app_ids, processes=1)
+    assert result["users"] == 90 and result["grants"] == len(user_ids)
+    # Identical app sets are clustered once.
+    assert result["profiles"] < result["users"]
+    assert sorted(role["applications"] for role in result["roles"]) == ARCHETYPES
+    assert all(role["users"] >= 20 for role in result["roles"])
+    assert 0.8 < result["coverage"] < 1
+
+    # Work split across processes gives the same roles.
+    assert mine_roles(user_ids, app_ids, processes=2)["roles"] == result["roles"]
+    assert mine_roles(user_ids, app_ids, processes=1, min_users=31)["roles"] == []
+    assert mine_roles(np.array([], dtype=np.int64), np.array([], dtype=np.int64))["roles"] == []
+
+
+def test_service_names_applications(db, workflow):
+    apps = [models.Application(name="Ledger"), models.Application(name="Payroll")]
+    users = [models.User(business_user_id=f"CLERK{i}", name=f"Clerk {i}", email=f"clerk{i}@example.com")
+             for i in range(12)]
+    db.add_all([*apps, *users])
+    db.flush()
+    for user in users:
+        for app in apps:
+            db.add(models.Access(user_id=user.id, application_id=app.id, active=True))
+    db.commit()
+
+    roles = RoleMiningService.mine(db, processes=1)["roles"]
+    assert [(role["application_names"], role["users"]) for role in roles] == [(["Ledger", "Payroll"], 12)]
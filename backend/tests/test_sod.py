@@ -0,0 +1,72 @@
+import pytest
+
+from backend.db import models
+from backend.services.sod_service import SodService, build_bitsets, evaluate, iter_bits
+
+
+def test_bitset_evaluation():
+    bits = build_bitsets([(1, 3), (1, 700), (1, 9), (2, 700), (2, 9), (2, 4)])
+    assert list(iter_bits(bits[1])) == [3, 9, 700]
+    assert evaluate([(10, "application", 1, 2)], bits, {}) == {10: [9, 700]}
+
+
+def test_rule_flags_existing_and_incremental_grants(client, db, workflow):
+    user1, user2 = workflow["users"]
+    payments = client.post("/applications/", json={"name": "Payments"}).json()["id"]
+    client.post("/access/", json={"user_id": user1, "application_id": payments})
+
+    rule = client.post("/sod/rules", json={
+        "name": "payments-vs-approvals",
+        "kind": "application",
+        "left_id": workflow["app"],
+        "right_id": payments,
+    }).json()
+    violations = client.get("/sod/violations", params={"rule_id": rule["id"]}).json()
+    assert [v["user_id"] for v in violations] == [user1]
+
+    client.post("/access/", json={"user_id": user2, "application_id": payments})
+    assert {v["user_id"] for v in client.get("/sod/violations").json()} == {user1, user2}
+
+    access = client.get("/access/", params={"user_id": user1, "application_id": payments}).json()[0]
+    client.post(f"/access/{access['id']}/revoke")
+    assert [v["user_id"] for v in client.get("/sod/violations").json()] == [user2]
+
+    # A full re-run agrees with the incremental state.
+    assert client.post("/sod/evaluate").json() == {"rules": 1, "violations": 1, "added": 0, "removed": 0}
+
+
+def test_role_rule(client, db, workflow):
+    user1 = workflow["users"][0]
+    admin = client.post("/roles/", json={"name": "Admin"}).json()["id"]
+    approver = client.post("/roles/", json={"name": "Approver"}).json()["id"]
+    client.post("/sod/rules", json={"name": "admin-approver", "kind": "role", "left_id": admin, "right_id": approver})
+    client.post("/user-roles/assign", json={"user_id": user1, "role_id": admin})
+    assert client.get("/sod/violations").json() == []
+    client.post("/user-roles/assign", json={"user_id": user1, "role_id": approver})
+    assert [v["user_id"] for v in client.get("/sod/violations").json()] == [user1]
+    assert db.query(models.SodViolation).count() == 1
+
+
+def test_violations_share_the_grant_transaction(client, db, workflow, monkeypatch):
+    user1, user2 = workflow["users"]
+    payments = client.post("/applications/", json={"name": "Payments"}).json()["id"]
+    client.post("/sod/rules", json={"name": "pay", "kind": "application", "left_id": workflow["app"], "right_id": payments})
+
+    def fail(*args):
+        raise RuntimeError("evaluation failed")
+
+    monkeypatch.setattr(SodService, "_apply", staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        client.post("/access/", json={"user_id": user1, "application_id": payments})
+    db.expire_all()
+    assert db.query(models.Access).filter(models.Access.application_id == payments).count() == 0
+    monkeypatch.undo()
+
+    grant = client.post("/access/", json={"user_id": user1, "application_id": payments}).json()["id"]
+    assert [v["user_id"] for v in client.get("/sod/violations").json()] == [user1]
+    assert db.query(models.AccessFinding).filter(models.AccessFinding.access_id == grant).count()
+
+    # Deleting the user takes their violations and findings along.
+    assert client.delete(f"/users/{user1}").status_code == 200
+    assert client.get("/sod/violations").json() == []
+    assert db.query(models.AccessFinding).filter(models.AccessFinding.access_id == grant).count() == 0
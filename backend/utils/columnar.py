@@ -0,0 +1,44 @@
+"""Bulk reads into numpy columns and bulk writes from them.
+
+Both go through the session's DB-API cursor: at a million rows, building
+SQLAlchemy Row objects or per-row bind dicts costs more than the SQL.
+"""
+import numpy as np
+from sqlalchemy.orm import Session
+
+
+def _compiled(db: Session, stmt, column_keys=None):
+    conn = db.connection()
+    compiled = stmt.compile(
+        dialect=conn.dialect, column_keys=column_keys, compile_kwargs={"render_postcompile": True}
+    )
+    return conn.connection.cursor(), compiled
+
+
+def fetch_columns(db: Session, stmt, dtypes) -> list[np.ndarray]:
+    """Run a SELECT in the session's transaction; one array per selected column."""
+    cursor, compiled = _compiled(db, stmt)
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    try:
+        cursor.execute(str(compiled), params)
+        dtype = [(f"c{i}", t) for i, t in enumerate(dtypes)]
+        rows = np.fromiter(cursor, dtype=dtype)
+    finally:
+        cursor.close()
+    return [rows[name] for name, _ in dtype]
+
+
+def executemany(db: Session, stmt, columns: dict[str, list]):
+    """Run ``stmt`` once per position of ``columns`` (bind or column name ->
+    values). INSERTs only name the columns given."""
+    cursor, compiled = _compiled(db, stmt, column_keys=list(columns))
+    if compiled.positional:
+        params = zip(*(columns[name] for name in compiled.positiontup))
+    else:
+        params = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    try:
+        cursor.executemany(str(compiled), params)
+    finally:
+        cursor.close()
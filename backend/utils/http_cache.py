@@ -0,0 +1,156 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.db import models
+from backend.db.database import SessionLocal
+from backend.utils.responses import FastJSONResponse
+
+# Reference-data collections served with ETag / Last-Modified.
+COLLECTIONS = (
+    "applications",
+    "roles",
+    "reporting_map",
+    "app_manager_map",
+    "app_owner_map",
+    "business_owner_map",
+)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class CollectionVersions:
+    """Per-process mirror of ``collection_version`` plus a body cache keyed by version.
+
+    Local writes move the mirror as soon as they commit. Writes from other
+    workers are picked up when the mirror is re-read, at most every ``ttl``
+    seconds, which is the only time a conditional GET can cost a query.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions: dict[str, tuple[int, datetime]] = {}
+        self._bodies: dict[str, tuple[int, bytes]] = {}
+        self._loaded_at = float("-inf")
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._bodies.clear()
+            self._loaded_at = float("-inf")
+
+    def _reload(self):
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                models.CollectionVersion.name,
+                models.CollectionVersion.version,
+                models.CollectionVersion.updated_at,
+            ).all()
+        finally:
+            db.close()
+        for row in rows:
+            self.observe(*row)
+        self._loaded_at = time.monotonic()
+
+    def get(self, name: str) -> tuple[int, datetime]:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            self._reload()
+        return self._versions.get(name, (0, _EPOCH))
+
+    def observe(self, name: str, version: int, updated_at: datetime):
+        with self._lock:
+            current = self._versions.get(name)
+            if current is None or current[0] < version:
+                self._versions[name] = (version, updated_at)
+
+    def bump(self, db: Session, name: str):
+        """Increment ``name`` inside the caller's transaction; call before its commit.
+
+        The local mirror only moves once that transaction commits, so no
+        request can see the new ETag before the new rows are visible.
+        """
+        now = datetime.utcnow()
+        updated = db.query(models.CollectionVersion).filter(models.CollectionVersion.name == name).update(
+            {models.CollectionVersion.version: models.CollectionVersion.version + 1,
+             models.CollectionVersion.updated_at: now},
+            synchronize_session=False,
+        )
+        if not updated:
+            db.add(models.CollectionVersion(name=name, version=1, updated_at=now))
+        db.flush()
+        version = db.query(models.CollectionVersion.version).filter(
+            models.CollectionVersion.name == name
+        ).scalar()
+        event.listen(db, "after_commit", lambda session: self.observe(name, version, now), once=True)
+
+    def cached_body(self, name: str, version: int):
+        entry = self._bodies.get(name)
+        return entry[1] if entry and entry[0] == version else None
+
+    def store_body(self, name: str, version: int, body: bytes):
+        with self._lock:
+            current = self._bodies.get(name)
+            if current is None or current[0] <= version:
+                self._bodies[name] = (version, body)
+
+
+collection_versions = CollectionVersions(settings.HTTP_CACHE_TTL_SECONDS)
+
+
+def _not_modified(request: Request, etag: str, updated_at: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return updated_at.replace(microsecond=0) <= since
+    return False
+
+
+def _validators(name: str, version: int, updated_at: datetime):
+    etag = f'W/"{name}-{version}"'
+    return etag, {
+        "ETag": etag,
+        "Last-Modified": format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def cached_collection(request: Request, db: Session, name: str, build) -> Response:
+    """Serve a reference-data list with validators, 304s and a body cache.
+
+    Conditional hits and body-cache hits are answered from memory; the
+    session is only used (and a connection only opened) on a miss, where
+    the version is read in the same transaction as the rows ``build(db)``
+    serializes so the body is never filed under the wrong version.
+    """
+    version, updated_at = collection_versions.get(name)
+    etag, headers = _validators(name, version, updated_at)
+    if _not_modified(request, etag, updated_at):
+        return Response(status_code=304, headers=headers)
+
+    body = collection_versions.cached_body(name, version)
+    if body is None:
+        row = db.query(models.CollectionVersion.version, models.CollectionVersion.updated_at).filter(
+            models.CollectionVersion.name == name
+        ).first()
+        version, updated_at = row or (0, _EPOCH)
+        body = build(db)
+        collection_versions.observe(name, version, updated_at)
+        collection_versions.store_body(name, version, body)
+        etag, headers = _validators(name, version, updated_at)
+    return FastJSONResponse(body, headers=headers)
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional, pydantic-core's encoder is the fallback
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return to_json(content)
+
+
+def ndjson_chunks(rows, chunk_size: int = 64 * 1024):
+    """Encode dicts as newline-delimited JSON, yielded in ~chunk_size blocks.
+
+    Batching keeps the number of ASGI messages (and compressor flushes) low
+    while still streaming.
+    """
+    buf = bytearray()
+    for row in rows:
+        buf += dumps(row)
+        buf += b"\n"
+        if len(buf) >= chunk_size:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that skips FastAPI's jsonable_encoder pass.
+
+    Content may be plain dicts/lists (encoded with orjson when installed,
+    otherwise pydantic-core) or bytes that were already serialized.
+    Returning it from a route also bypasses ``response_model`` validation,
+    which is the point for large lists; the declared model still documents
+    the shape in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
+
+
+def schema_columns(model, schema: type[BaseModel]) -> list:
+    """ORM columns matching the schema's fields, in field order, for projections."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(rows) -> FastJSONResponse:
+    """Serialize the Row tuples of a column projection without building models."""
+    if not rows:
+        return FastJSONResponse([])
+    keys = rows[0]._fields
+    return FastJSONResponse([dict(zip(keys, row)) for row in rows])
+
+
+def dicts_response(rows: list[dict], schema: type[BaseModel]) -> FastJSONResponse:
+    """Trim prepared dicts to the schema's fields and serialize them."""
+    keys = list(schema.model_fields)
+    return FastJSONResponse([{k: r.get(k) for k in keys} for r in rows])
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def models_response(schema: type[BaseModel], objects) -> FastJSONResponse:
+    """Validate ORM objects in one TypeAdapter pass and dump them in Rust."""
+    adapter = _list_adapter(schema)
+    return FastJSONResponse(adapter.dump_json(adapter.validate_python(objects, from_attributes=True)))
@@ -25,9 +25,23 @@ export interface ApiRole {
     name: string;
 }
 
+// Read-your-writes: writes answer with X-Primary-Until. Echoing the latest
+// one keeps this client's reads on the primary database until then; the
+// sticky cookie is not sent back on these cross-origin requests.
+let primaryUntil: string | null = null;
+
+const request = async (path: string, init: RequestInit = {}): Promise<Response> => {
+    const headers = new Headers(init.headers);
+    if (primaryUntil) headers.set('X-Primary-Until', primaryUntil);
+    const response = await fetch(`${API_BASE_URL}${path}`, { ...init, headers });
+    const until = response.headers.get('X-Primary-Until');
+    if (until) primaryUntil = until;
+    return response;
+};
+
 export const api = {
     getAppManagerUsers: async (): Promise<ApiUser[]> => {
-        const response = await fetch(`${API_BASE_URL}/dashboard/app-manager/users`);
+        const response = await request('/dashboard/app-manager/users');
         if (!response.ok) {
             throw new Error(`Failed to fetch users: ${response.statusText}`);
         }
@@ -40,20 +54,20 @@ export const api = {
     },
 
     getApplications: async (): Promise<ApiApplication[]> => {
-        const response = await fetch(`${API_BASE_URL}/applications/`);
+        const response = await request('/applications/');
         if (!response.ok) throw new Error('Failed to fetch applications');
         return response.json();
     },
 
     getRoles: async (): Promise<ApiRole[]> => {
-        const response = await fetch(`${API_BASE_URL}/roles/`);
+        const response = await request('/roles/');
         if (!response.ok) throw new Error('Failed to fetch roles');
         return response.json();
     },
 
     createUser: async (userData: any) => {
         // This calls the Dashboard Onboarding endpoint which handles User+Access+Role
-        const response = await fetch(`${API_BASE_URL}/dashboard/app-manager/users`, {
+        const response = await request('/dashboard/app-manager/users', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(userData),
@@ -66,7 +80,7 @@ export const api = {
     },
 
     deleteUser: async (userId: string) => {
-        const response = await fetch(`${API_BASE_URL}/users/${userId}`, {
+        const response = await request(`/users/${userId}`, {
             method: 'DELETE',
         });
         if (!response.ok) throw new Error('Failed to delete user');